@@ -2,12 +2,17 @@
 import cmd
 import sys
 import os
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from config import Config
 from services.lotto_service import LottoService
 from services.format_converter import FormatConverter
 from presentation.output_formatter import OutputFormatter
+from presentation.report_writer import ReportWriter
+from systems import (IntegralSystem, ReducedSystem, GuaranteedSystem, CoveringLibrary,
+                     SystemBacktester, SystemExporter, SystemFilters, SystemSimulator)
+from utils.timing import registry as timing_registry
 
 class LottoConsole(cmd.Cmd):
     intro = f"""\033[1m{'-'*50}
@@ -24,16 +29,22 @@ Digita 'help' o '?' per la lista dei comandi.
         # Inizializzazione dei componenti
         self.config = Config()
         self.service = LottoService(self.config)
-        self.formatter = OutputFormatter()
+        self.covering_library = CoveringLibrary(self.config.COVERING_LIBRARY_FILE)
+        self.formatter = OutputFormatter(stream=self.stdout, covering_library=self.covering_library)
         self.converter = FormatConverter(self.config)
 
+        if self.config.TIMING_DUMP_FILE:
+            timing_registry.install_exit_dump(self.config.TIMING_DUMP_FILE)
+
         # Inizializzazione del modello (skip in test mode)
         if not hasattr(self.stdout, 'getvalue'):  # Non è uno StringIO
             try:
                 print("Inizializzazione del modello in corso...", file=self.stdout)
-                self.service.initialize_predictor("decision_tree")
+                self.service.initialize_predictor(self.config.PREDICTOR_TYPE)
                 self.service.train_model()
                 print("Modello inizializzato con successo!\n", file=self.stdout)
+                if self.config.RELOAD_INTERVAL > 0:
+                    self.service.start_watching()
             except Exception as e:
                 print(f"Errore durante l'inizializzazione: {str(e)}\n", file=self.stdout)
 
@@ -63,9 +74,10 @@ Digita 'help' o '?' per la lista dei comandi.
         date, wheel = args
         try:
             service_date = self._convert_date_format(date)
+            # Versione letta prima dei dati: un ricaricamento nel mezzo rende solo l'output non riusabile
+            version = self.service.data_version
             prediction, historical_data = self.service.predict(service_date, wheel.upper())
-            output = self.formatter.format_prediction(date, wheel, prediction, historical_data)
-            print(output, file=self.stdout)
+            self.formatter.write_prediction(date, wheel, prediction, historical_data, version=version)
         except ValueError as e:
             error_msg = self.formatter.format_error(f"Errore: {str(e)}")
             print(error_msg, file=self.stdout)
@@ -85,22 +97,34 @@ Digita 'help' o '?' per la lista dei comandi.
 
     def do_stats(self, arg: str) -> None:
         """
-        Mostra le statistiche per una ruota specifica.
-        Uso: stats <ruota>
-        Esempio: stats MI
+        Mostra le statistiche per una ruota specifica, anche su una finestra temporale.
+        Con ALL calcola tutte le ruote in un solo passaggio e le mostra in un'unica tabella.
+        Uso: stats <ruota|ALL> [<data_inizio> <data_fine> | last <N>]
+        Esempi:
+            stats MI
+            stats MI 01/01/2020 31/12/2023
+            stats MI last 500
+            stats ALL
         """
-        if not arg:
+        args = arg.split()
+        if not args:
             print(self.formatter.format_error("Specifica una ruota. Esempio: stats MI"),
                   file=self.stdout)
             return
 
-        wheel = arg.upper()
+        wheel = args[0].upper()
         try:
-            current_date = datetime.now().strftime('%Y%m%d')
-            _, historical_data = self.service.predict(current_date, wheel)
+            window, label = self._parse_stats_window(wheel, args[1:])
+            if wheel == 'ALL':
+                self.formatter.write_all_statistics(self.service.stats_all(**window), label)
+                return
+
+            version = self.service.data_version
+            historical_data = self.service.get_history(wheel, **window)
             if historical_data:
-                print(self.formatter.format_statistics(historical_data, wheel), file=self.stdout)
-                print(self.formatter.format_frequency_chart(historical_data, wheel), file=self.stdout)
+                cache_window = tuple(sorted(window.items()))
+                self.formatter.write_statistics(historical_data, label, version=version, window=cache_window)
+                self.formatter.write_frequency_chart(historical_data, label, version=version, window=cache_window)
             else:
                 print(self.formatter.format_error(
                     f"Nessun dato storico trovato per la ruota {wheel}"),
@@ -108,6 +132,209 @@ Digita 'help' o '?' per la lista dei comandi.
         except ValueError as e:
             print(self.formatter.format_error(str(e)), file=self.stdout)
 
+    def _parse_stats_window(self, wheel: str, window: List[str]) -> Tuple[Dict, str]:
+        """Interpreta la finestra di stats e restituisce i parametri e l'etichetta"""
+        name = "Tutte le ruote" if wheel == 'ALL' else wheel
+        if not window:
+            return {}, name
+
+        if len(window) == 2 and window[0].lower() == 'last':
+            try:
+                count = int(window[1])
+            except ValueError:
+                raise ValueError("Il numero di estrazioni deve essere un intero")
+            return {'last': count}, f"{name} (ultime {count})"
+
+        if len(window) == 2:
+            start, end = (self._convert_date_format(date) for date in window)
+            return {'start': start, 'end': end}, f"{name} ({window[0]} - {window[1]})"
+
+        raise ValueError("Uso corretto: stats <ruota|ALL> [<data_inizio> <data_fine> | last <N>]")
+
+    def do_ultimi(self, arg: str) -> None:
+        """
+        Mostra le frequenze dei numeri nelle ultime N estrazioni di una ruota.
+        Uso: ultimi <N> <ruota>
+        Esempio: ultimi 18 MI
+        """
+        args = arg.split()
+        if len(args) != 2:
+            print(self.formatter.format_error(
+                "Uso corretto: ultimi <N> <ruota>\nEsempio: ultimi 18 MI"),
+                file=self.stdout)
+            return
+
+        if not args[0].isdigit() or int(args[0]) < 1:
+            print(self.formatter.format_error("Il numero di estrazioni deve essere un intero positivo"),
+                  file=self.stdout)
+            return
+
+        count, wheel = int(args[0]), args[1].upper()
+        try:
+            version = self.service.data_version
+            counts, draws = self.service.recent_frequencies(wheel, count)
+            if not draws:
+                print(self.formatter.format_error(
+                    f"Nessun dato storico trovato per la ruota {wheel}"),
+                    file=self.stdout)
+                return
+            self.formatter.write_frequencies(counts, draws, f"{wheel} (ultime {draws})",
+                                             version=version, window=('ultimi', count))
+        except ValueError as e:
+            print(self.formatter.format_error(str(e)), file=self.stdout)
+
+    def do_report(self, arg: str) -> None:
+        """
+        Crea il report di tutte le ruote (statistiche, grafici, ritardi e predizione) su file.
+        Uso: report <data> [--esporta <file> ...] [--ultime N] [--processi N]
+        Il formato di ogni file dipende dall'estensione: .html, .json, .md
+        Senza --esporta scrive report-<AAAAMMGG>.html nella cartella corrente.
+        Senza --processi le sezioni usano più processi solo su storici molto grandi
+        (almeno 500.000 estrazioni per processo), altrimenti si calcolano in linea.
+        Esempio: report 01/01/2024 --esporta report.html report.md --ultime 500
+        """
+        args, options = self._split_options(arg.split())
+        try:
+            if len(args) != 1:
+                raise ValueError("Uso corretto: report <data> [--esporta <file> ...] [--ultime N] [--processi N]")
+            date = self._convert_date_format(args[0])
+            files = options.get('esporta') or [f"report-{date}.html"]
+            last = self._parse_positive_option(options, 'ultime', None)
+            workers = self._parse_positive_option(options, 'processi', None)
+
+            writer = ReportWriter()
+            for path in files:
+                writer.detect_format(path)
+
+            start = time.perf_counter()
+            report = self.service.report(date, last=last, workers=workers)
+            for path in files:
+                writer.write(report, path)
+            elapsed = time.perf_counter() - start
+            mode = f"{report.workers} processi" if report.workers > 1 else "in linea"
+            print(f"\nReport di {len(report.wheels)} ruote scritto in: {', '.join(files)}"
+                  f"\nTempo totale: {elapsed:.2f}s (sezioni per ruota: {report.elapsed:.2f}s, {mode})\n",
+                  file=self.stdout)
+        except (ValueError, OSError) as e:
+            print(self.formatter.format_error(str(e)), file=self.stdout)
+
+    def do_segue(self, arg: str) -> None:
+        """
+        Mostra i numeri che più spesso escono nell'estrazione successiva a un numero.
+        Uso: segue <ruota> <numero>
+        Esempio: segue MI 90
+        """
+        args = arg.split()
+        if len(args) != 2:
+            print(self.formatter.format_error(
+                "Uso corretto: segue <ruota> <numero>\nEsempio: segue MI 90"),
+                file=self.stdout)
+            return
+
+        wheel = args[0].upper()
+        try:
+            number = int(args[1])
+        except ValueError:
+            print(self.formatter.format_error("Il numero deve essere un intero tra 1 e 90"),
+                  file=self.stdout)
+            return
+
+        try:
+            followers, occurrences = self.service.followers(wheel, number)
+            print(self.formatter.format_followers(wheel, number, occurrences, followers),
+                  file=self.stdout)
+        except ValueError as e:
+            print(self.formatter.format_error(str(e)), file=self.stdout)
+
+    def do_correlazioni(self, arg: str) -> None:
+        """
+        Mostra le coppie di numeri su ruote diverse che escono insieme più spesso del previsto.
+        Uso: correlazioni [N]
+        Esempio: correlazioni 20
+        """
+        args = arg.split()
+        if len(args) > 1:
+            print(self.formatter.format_error(
+                "Uso corretto: correlazioni [N]\nEsempio: correlazioni 20"),
+                file=self.stdout)
+            return
+
+        try:
+            top = int(args[0]) if args else 10
+        except ValueError:
+            print(self.formatter.format_error("Il numero di coppie deve essere un intero"),
+                  file=self.stdout)
+            return
+
+        try:
+            pairs = self.service.correlations(top)
+            print(self.formatter.format_correlations(pairs), file=self.stdout)
+        except ValueError as e:
+            print(self.formatter.format_error(str(e)), file=self.stdout)
+
+    def do_tune(self, arg: str) -> None:
+        """
+        Cerca gli iperparametri migliori del modello con validazione temporale.
+        Uso: tune [--fold N] [--processi N]
+        Esempio: tune --fold 5 --processi 4
+        La configurazione migliore viene salvata e usata dai successivi addestramenti.
+        """
+        args, options = self._split_options(arg.split())
+        try:
+            if args:
+                raise ValueError("Uso corretto: tune [--fold N] [--processi N]")
+            folds = self._parse_positive_option(options, 'fold', 5)
+            workers = self._parse_positive_option(options, 'processi', None)
+
+            print("\nRicerca degli iperparametri in corso...", file=self.stdout)
+            result = self.service.tune(folds, workers)
+            print(self.formatter.format_tuning(result), file=self.stdout)
+            print(f"\nConfigurazione salvata in {self.config.TUNING_FILE}\n", file=self.stdout)
+        except ValueError as e:
+            print(self.formatter.format_error(str(e)), file=self.stdout)
+
+    @staticmethod
+    def _parse_positive_option(options: Dict[str, List[str]], name: str,
+                               default: Optional[int]) -> Optional[int]:
+        """Legge un'opzione --nome N con N intero positivo"""
+        if name not in options:
+            return default
+        values = options[name]
+        if len(values) != 1 or not values[0].isdigit() or int(values[0]) < 1:
+            raise ValueError(f"L'opzione --{name} richiede un intero positivo")
+        return int(values[0])
+
+    def do_ricarica(self, arg: str) -> None:
+        """
+        Ricarica il file dati e riaddestra il modello, o gestisce il ricaricamento automatico.
+        Uso: ricarica [on|off|stato]
+        Esempio: ricarica
+        Le richieste in corso terminano sulla versione precedente dei dati.
+        """
+        action = arg.strip().lower()
+        try:
+            if action == '':
+                version = self.service.reload()
+                print(f"\nDati ricaricati: versione {version}\n", file=self.stdout)
+            elif action == 'on':
+                self.service.start_watching()
+                print(f"\nRicaricamento automatico attivo su {self.config.CSV_FILE}\n", file=self.stdout)
+            elif action == 'off':
+                self.service.stop_watching()
+                print("\nRicaricamento automatico disattivato\n", file=self.stdout)
+            elif action == 'stato':
+                state = "attivo" if self.service.watching else "disattivato"
+                print(f"\nVersione dei dati: {self.service.data_version}"
+                      f"\nRicaricamento automatico: {state}", file=self.stdout)
+                if self.service.last_reload_error:
+                    print(f"Ultimo errore: {self.service.last_reload_error}", file=self.stdout)
+                print(file=self.stdout)
+            else:
+                print(self.formatter.format_error("Uso corretto: ricarica [on|off|stato]"),
+                      file=self.stdout)
+        except ValueError as e:
+            print(self.formatter.format_error(str(e)), file=self.stdout)
+
     def do_convert(self, arg: str) -> None:
         """
         Converte il file storico nel formato utilizzato dall'applicazione.
@@ -148,19 +375,45 @@ Digita 'help' o '?' per la lista dei comandi.
         """
         Crea un sistema basato sulla predizione per una data e ruota specifiche.
 
-        Uso: sistema <data> <ruota> <tipo> [parametri]
+        Uso: sistema <data> <ruota> <tipo> [parametri] [opzioni]
 
         Tipi disponibili:
             - integrale N: Tutte le possibili combinazioni di N numeri (2-4)
             - ridotto N: Un sottoinsieme ottimizzato di combinazioni di N numeri (2-4)
             - garantito N/P: Sistema che garantisce P punti con N numeri
 
+        Opzioni:
+            --numeri 1,2,3,...  Usa questi numeri base invece della predizione
+            --esporta <file>    Esporta le combinazioni invece di stamparle
+            --formato <f>       Formato di esportazione: csv, numeri (uint8), maschera (90 bit)
+                                (default: csv per i file .csv, numeri altrimenti)
+            --storico [finestra] Verifica il sistema su tutte le estrazioni passate della ruota
+                                (finestra: <data_inizio> <data_fine> oppure last <N>)
+            --migliora [secondi] Solo per i garantiti: cerca per qualche secondo (default 10)
+                                una copertura con meno combinazioni e la salva nell'archivio
+            --simula [N]        Stima su N estrazioni casuali (default 1000000) probabilità
+                                di vincita e resa attesa per euro, con intervalli al 95%
+                                (sorte giocata: i punti garantiti, o i numeri per combinazione)
+            --processi N        Processi usati da --migliora e --simula (default: tutti i core)
+            --esatto [secondi]  Solo per i garantiti: cerca il sistema minimo con un branch and
+                                bound entro il tempo indicato (default 60) e dice se è dimostrato
+            --filtri ...        Solo per gli integrali: genera solo le combinazioni che rispettano
+                                i vincoli somma=MIN-MAX, pari=MIN-MAX (o pari=N), decina=N (al
+                                massimo N numeri per decina), decine=N (almeno N decine diverse),
+                                ambi[=N] (nessun ambo già uscito sulla ruota, nelle ultime N)
+
         Esempi:
             sistema 01/01/2024 MI integrale 2    # Tutte le combinazioni di 2 numeri
             sistema 01/01/2024 MI ridotto 3      # Sistema ridotto con terzine
             sistema 01/01/2024 MI garantito 3/2  # Sistema che garantisce ambo su 3 numeri
+            sistema 01/01/2024 MI integrale 4 --numeri 1,5,9,12,20,33,41,58 --esporta sistema.bin
+            sistema 01/01/2024 MI integrale 3 --numeri 1,5,9,12,20,33 --storico last 1000
+            sistema 01/01/2024 MI garantito 4/3 --numeri 1,5,9,12,20,33,41,58,67,80 --migliora 30
+            sistema 01/01/2024 MI garantito 3/2 --numeri 1,5,9,12,20,33,41,58 --esatto 30
+            sistema 01/01/2024 MI ridotto 2 --numeri 1,5,9,12,20,33 --simula 2000000
+            sistema 01/01/2024 MI integrale 4 --filtri somma=120-200 pari=2 decina=1 ambi=500
         """
-        args = arg.split()
+        args, options = self._split_options(arg.split())
         if len(args) < 3:
             error_msg = self.formatter.format_error(
                 "Uso corretto: sistema <data> <ruota> <tipo> [parametri]\n"
@@ -173,33 +426,36 @@ Digita 'help' o '?' per la lista dei comandi.
         params = args[3] if len(args) > 3 else None
 
         try:
-            # Ottiene la predizione
+            # Ottiene la predizione (o i numeri base indicati esplicitamente)
             service_date = self._convert_date_format(date)
-            prediction, _ = self.service.predict(service_date, wheel.upper())
-
-            # Genera il sistema in base al tipo richiesto
-            if system_type.lower() == 'integrale':
-                if not params:
-                    raise ValueError("Specificare il numero di numeri per combinazione (2-4)")
-                n = int(params)
-                output = self.formatter.format_integral_system(prediction, n)
-
-            elif system_type.lower() == 'ridotto':
-                if not params:
-                    raise ValueError("Specificare il numero di numeri per combinazione (2-4)")
-                n = int(params)
-                output = self.formatter.format_reduced_system(prediction, n)
-
-            elif system_type.lower() == 'garantito':
-                if not params or '/' not in params:
-                    raise ValueError("Specificare numeri/punti (es: 3/2)")
-                nums, win = map(int, params.split('/'))
-                output = self.formatter.format_guaranteed_system(prediction, nums, win)
-
+            if 'numeri' in options:
+                numbers = self._parse_numbers(options['numeri'])
             else:
-                raise ValueError(f"Tipo sistema '{system_type}' non valido")
-
-            print(output, file=self.stdout)
+                numbers, _ = self.service.predict(service_date, wheel.upper())
+
+            kind, size, win = self._parse_system_type(system_type, params)
+            filters = None
+            if 'filtri' in options:
+                filters = self._parse_system_filters(kind, wheel.upper(), numbers, options['filtri'])
+            if 'migliora' in options:
+                self._improve_system(kind, size, win, numbers, options)
+            if 'esatto' in options:
+                self._solve_exact_system(kind, size, win, numbers, options)
+
+            # Esportazione, verifica storica e simulazione sostituiscono la stampa delle combinazioni
+            if 'esporta' in options or 'storico' in options or 'simula' in options:
+                if 'esporta' in options:
+                    self._export_system(kind, size, win, numbers, options, filters)
+                if 'storico' in options:
+                    self._backtest_system(wheel.upper(), kind, size, win, numbers, options, filters)
+                if 'simula' in options:
+                    self._simulate_system(kind, size, win, numbers, options, filters)
+            elif kind == 'integrale':
+                self.formatter.write_integral_system(numbers, size, filters=filters)
+            elif kind == 'ridotto':
+                self.formatter.write_reduced_system(numbers, size)
+            else:
+                self.formatter.write_guaranteed_system(numbers, size, win)
 
         except ValueError as e:
             error_msg = self.formatter.format_error(f"Errore: {str(e)}")
@@ -208,6 +464,185 @@ Digita 'help' o '?' per la lista dei comandi.
             error_msg = self.formatter.format_error(f"Errore imprevisto: {str(e)}")
             print(error_msg, file=self.stdout)
 
+    @staticmethod
+    def _split_options(tokens: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Separa gli argomenti posizionali dalle opzioni --nome [valori...]"""
+        positional: List[str] = []
+        options: Dict[str, List[str]] = {}
+        current = None
+        for token in tokens:
+            if token.startswith('--'):
+                current = token[2:].lower()
+                options[current] = []
+            elif current is not None:
+                options[current].append(token)
+            else:
+                positional.append(token)
+        return positional, options
+
+    @staticmethod
+    def _parse_numbers(values: List[str]) -> List[int]:
+        """Interpreta una lista di numeri separati da virgole o spazi"""
+        try:
+            numbers = [int(value) for value in ",".join(values).split(",") if value]
+        except ValueError:
+            raise ValueError("I numeri base devono essere interi separati da virgole")
+        if not numbers or any(num < 1 or num > 90 for num in numbers):
+            raise ValueError("I numeri base devono essere tra 1 e 90")
+        if len(set(numbers)) != len(numbers):
+            raise ValueError("I numeri base non possono ripetersi")
+        return numbers
+
+    @staticmethod
+    def _parse_system_type(system_type: str, params: Optional[str]) -> Tuple[str, int, Optional[int]]:
+        """Restituisce tipo, numeri per combinazione ed eventuali punti garantiti"""
+        kind = system_type.lower()
+        if kind in ('integrale', 'ridotto'):
+            if not params:
+                raise ValueError("Specificare il numero di numeri per combinazione (2-4)")
+            return kind, int(params), None
+
+        if kind == 'garantito':
+            if not params or '/' not in params:
+                raise ValueError("Specificare numeri/punti (es: 3/2)")
+            nums, win = map(int, params.split('/'))
+            return kind, nums, win
+
+        raise ValueError(f"Tipo sistema '{system_type}' non valido")
+
+    def _parse_system_filters(self, kind: str, wheel: str, numbers: List[int],
+                              tokens: List[str]) -> SystemFilters:
+        """Filtri di un sistema integrale; 'ambi[=N]' esclude gli ambi già usciti sulla ruota"""
+        if kind != 'integrale':
+            raise ValueError("L'opzione --filtri vale solo per i sistemi integrali")
+        if not tokens:
+            raise ValueError("Specificare almeno un filtro: --filtri somma=MIN-MAX pari=N ...")
+
+        pairs = [token for token in tokens if token.lower().partition('=')[0] == 'ambi']
+        filters = SystemFilters.parse([token for token in tokens if token not in pairs])
+        if pairs:
+            _, _, last = pairs[-1].partition('=')
+            if last and (not last.isdigit() or int(last) <= 0):
+                raise ValueError("Il filtro ambi richiede un numero di estrazioni positivo")
+            history = self.service.get_history(wheel, last=int(last) if last else None)
+            filters = filters.with_drawn_pairs(numbers, history.numbers)
+        return filters
+
+    def _export_system(self, kind: str, size: int, win: Optional[int], numbers: List[int],
+                       options: Dict[str, List[str]], filters: Optional[SystemFilters] = None) -> None:
+        """Esporta il sistema su file consumando direttamente il generatore"""
+        if len(options['esporta']) != 1:
+            raise ValueError("Specificare il file di esportazione: --esporta <file>")
+        output_file = options['esporta'][0]
+
+        if options.get('formato'):
+            export_format = options['formato'][0].lower()
+        else:
+            export_format = 'csv' if output_file.lower().endswith('.csv') else 'numeri'
+
+        combinations = self._system_combinations(kind, size, win, numbers, filters)
+        count = SystemExporter().export(combinations, output_file, export_format)
+        print(f"\nEsportate {count} combinazioni in {output_file} (formato {export_format})\n",
+              file=self.stdout)
+
+    def _backtest_system(self, wheel: str, kind: str, size: int, win: Optional[int], numbers: List[int],
+                         options: Dict[str, List[str]], filters: Optional[SystemFilters] = None) -> None:
+        """Gioca il sistema su tutte le estrazioni passate della ruota (o su una finestra)"""
+        window, label = self._parse_stats_window(wheel, options['storico'])
+        history = self.service.get_history(wheel, **window)
+        if not history:
+            raise ValueError(f"Nessun dato storico trovato per la ruota {wheel}")
+
+        result = SystemBacktester().run(self._system_combinations(kind, size, win, numbers, filters),
+                                        history.numbers)
+        print(self.formatter.format_backtest(label, result), file=self.stdout)
+
+    def _simulate_system(self, kind: str, size: int, win: Optional[int], numbers: List[int],
+                         options: Dict[str, List[str]], filters: Optional[SystemFilters] = None) -> None:
+        """Stima con estrazioni casuali le probabilità di vincita e la resa del sistema"""
+        draws = self._parse_positive_option(options, 'simula', 1_000_000) if options['simula'] else 1_000_000
+        workers = self._parse_positive_option(options, 'processi', None)
+        result = SystemSimulator(draws, workers).run(self._system_combinations(kind, size, win, numbers, filters),
+                                                     sorte=win if kind == 'garantito' else None)
+        print(self.formatter.format_simulation(result), file=self.stdout)
+
+    def _improve_system(self, kind: str, size: int, win: Optional[int],
+                        numbers: List[int], options: Dict[str, List[str]]) -> None:
+        """Cerca un sistema garantito più piccolo; la stampa successiva usa quello migliore"""
+        if kind != 'garantito':
+            raise ValueError("L'opzione --migliora vale solo per i sistemi garantiti")
+        seconds = self._parse_positive_option(options, 'migliora', 10) if options['migliora'] else 10
+        workers = self._parse_positive_option(options, 'processi', None)
+
+        system = GuaranteedSystem(self.covering_library)
+        before = len(system.generate(numbers, size, win))
+        after = len(system.improve(numbers, size, win, seconds=seconds, workers=workers))
+        print(f"\nCopertura: {before} -> {after} combinazioni\n", file=self.stdout)
+
+    def _solve_exact_system(self, kind: str, size: int, win: Optional[int],
+                            numbers: List[int], options: Dict[str, List[str]]) -> None:
+        """Cerca il sistema garantito minimo; la stampa successiva usa quello trovato"""
+        if kind != 'garantito':
+            raise ValueError("L'opzione --esatto vale solo per i sistemi garantiti")
+        time_limit = self._parse_positive_option(options, 'esatto', 60) if options['esatto'] else 60
+
+        result = GuaranteedSystem(self.covering_library).solve_exact(numbers, size, win,
+                                                                     time_limit=time_limit)
+        if result.optimal:
+            outcome = "minimo dimostrato"
+        else:
+            outcome = f"tempo scaduto, il minimo è almeno {result.lower_bound}"
+        print(f"\nCopertura esatta: {len(result.blocks)} combinazioni ({outcome}, "
+              f"{result.nodes} nodi in {result.elapsed:.1f}s)\n", file=self.stdout)
+
+    def _system_combinations(self, kind: str, size: int, win: Optional[int], numbers: List[int],
+                             filters: Optional[SystemFilters] = None) -> Iterable[Tuple[int, ...]]:
+        """Combinazioni del sistema richiesto, generate in modo lazy quando possibile"""
+        if kind == 'integrale':
+            return IntegralSystem().iter_combinations(numbers, size, filters=filters)
+        if kind == 'ridotto':
+            return ReducedSystem().iter_combinations(numbers, size)
+        return GuaranteedSystem(self.covering_library).generate(numbers, size, win)
+
+    def do_output(self, arg: str) -> None:
+        """
+        Imposta la modalità di output.
+        Uso: output [rich|plain|csv|json]
+        Senza argomenti mostra la modalità corrente.
+        """
+        mode = arg.strip().lower()
+        if not mode:
+            print(f"\nModalità di output corrente: {self.formatter.mode}\n", file=self.stdout)
+            return
+
+        try:
+            self.formatter.set_mode(mode)
+            print(f"\nModalità di output impostata: {mode}\n", file=self.stdout)
+        except ValueError as e:
+            print(self.formatter.format_error(str(e)), file=self.stdout)
+
+    def do_timing(self, arg: str) -> None:
+        """
+        Gestisce la misurazione dei tempi per fase.
+        Uso: timing on|off|show|reset
+        Esempio: timing on
+        """
+        action = arg.strip().lower()
+        if action == 'on':
+            timing_registry.enable()
+            print("\nMisurazione dei tempi attivata\n", file=self.stdout)
+        elif action == 'off':
+            timing_registry.disable()
+            print("\nMisurazione dei tempi disattivata\n", file=self.stdout)
+        elif action == 'show':
+            print(self.formatter.format_timing(timing_registry.summary()), file=self.stdout)
+        elif action == 'reset':
+            timing_registry.reset()
+            print("\nTempi azzerati\n", file=self.stdout)
+        else:
+            print(self.formatter.format_error("Uso corretto: timing on|off|show|reset"),
+                  file=self.stdout)
+
     def do_clear(self, arg: str) -> None:
         """
         Pulisce lo schermo.
@@ -230,9 +665,25 @@ Digita 'help' o '?' per la lista dei comandi.
             print("     formato data: DD/MM/YYYY (es: 01/01/2024)", file=self.stdout)
             print("  sistema <data> <ruota> <tipo> [params] - Crea sistemi di gioco", file=self.stdout)
             print("     tipi: integrale N, ridotto N, garantito N/P", file=self.stdout)
-            print("  stats <ruota>          - Mostra statistiche per una ruota", file=self.stdout)
+            print("     opzioni: --numeri 1,2,... --esporta <file> [--formato csv|numeri|maschera]", file=self.stdout)
+            print("              --storico [finestra] verifica il sistema sulle estrazioni passate", file=self.stdout)
+            print("              --migliora [secondi] [--processi N] riduce un sistema garantito", file=self.stdout)
+            print("              --esatto [secondi] cerca il sistema garantito minimo", file=self.stdout)
+            print("              --simula [N] [--processi N] stima probabilità e resa su N estrazioni casuali", file=self.stdout)
+            print("              --filtri somma=MIN-MAX pari=MIN-MAX decina=N decine=N ambi[=N] (solo integrali)", file=self.stdout)
+            print("  stats <ruota|ALL> [finestra] - Mostra statistiche per una ruota o per tutte", file=self.stdout)
+            print("     finestra: <data_inizio> <data_fine> oppure last <N>", file=self.stdout)
+            print("  ultimi <N> <ruota>     - Frequenze nelle ultime N estrazioni di una ruota", file=self.stdout)
+            print("  report <data> [--esporta <file> ...] - Report di tutte le ruote in HTML, JSON o Markdown", file=self.stdout)
+            print("     opzioni: --ultime N --processi N", file=self.stdout)
+            print("  segue <ruota> <numero> - Numeri che più spesso seguono un numero", file=self.stdout)
+            print("  correlazioni [N]       - Coppie di numeri più correlate tra ruote diverse", file=self.stdout)
+            print("  tune [--fold N] [--processi N] - Ottimizza gli iperparametri del modello", file=self.stdout)
+            print("  ricarica [on|off|stato] - Ricarica i dati e riaddestra il modello", file=self.stdout)
             print("  ruote                  - Mostra le ruote disponibili", file=self.stdout)
             print("  convert                - Converte il file storico nel formato dell'app", file=self.stdout)
+            print("  output [modalità]      - Imposta l'output: rich, plain, csv, json", file=self.stdout)
+            print("  timing on|off|show     - Misura i tempi delle singole fasi", file=self.stdout)
             print("  clear                  - Pulisce lo schermo", file=self.stdout)
             print("  help                   - Mostra questo messaggio", file=self.stdout)
             print("  quit                   - Esci dal programma", file=self.stdout)
@@ -248,9 +699,14 @@ Digita 'help' o '?' per la lista dei comandi.
         Esce dal programma.
         Uso: quit
         """
+        self.service.close()
         print("\nArrivederci!\n", file=self.stdout)
         return True
 
+    def do_EOF(self, arg: str) -> bool:
+        """Esce con Ctrl-D come con quit"""
+        return self.do_quit(arg)
+
     def default(self, line: str) -> None:
         """Gestisce i comandi non riconosciuti"""
         print(self.formatter.format_error(
@@ -264,14 +720,20 @@ Digita 'help' o '?' per la lista dei comandi.
 
 def main():
     """Entry point dell'applicazione"""
+    console = None
     try:
-        LottoConsole().cmdloop()
+        console = LottoConsole()
+        console.cmdloop()
     except KeyboardInterrupt:
         print("\nArrivederci!\n")
         sys.exit(0)
     except Exception as e:
         print(f"\nErrore imprevisto: {str(e)}")
         sys.exit(1)
+    finally:
+        # Ferma il watcher e libera la memoria condivisa anche senza 'quit'
+        if console is not None:
+            console.service.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,4 +1,5 @@
-from typing import Dict
+import os
+from typing import Dict, Optional
 from dataclasses import dataclass, field
 
 @dataclass
@@ -8,7 +9,24 @@ class Config:
     HISTORICAL_OUTPUT_FILE: str = 'data/estrazioni-lotto.csv'
     DATE_FORMAT: str = "%d/%m/%Y"
     CSV_DELIMITER: str = ';'
+    # Lettura di CSV_FILE: 'fast' (parser a formato fisso su NumPy) o 'pandas' (read_csv generico)
+    CSV_BACKEND: str = 'fast'
     HISTORICAL_DELIMITER: str = '\t'
+    # Configurazione migliore trovata da 'tune' e risultati per fold già calcolati
+    TUNING_FILE: str = 'data/tuning.json'
+    TUNING_CACHE_DIR: str = 'data/tuning_cache'
+    # Albero addestrato esportato dal predittore 'compiled_tree', caricabile senza scikit-learn
+    COMPILED_TREE_FILE: str = 'data/albero.npz'
+    # Predittore di console e main: 'decision_tree', 'compiled_tree' o 'markov'
+    PREDICTOR_TYPE: str = field(
+        default_factory=lambda: os.environ.get('ORACOLO_PREDICTOR', 'decision_tree'))
+    # Coperture dei sistemi garantiti già calcolate, riusate tra le sessioni
+    COVERING_LIBRARY_FILE: str = 'data/coperture.json'
+    # Secondi tra due controlli di CSV_FILE per il ricaricamento automatico (0 lo disabilita)
+    RELOAD_INTERVAL: float = 2.0
+    # Se impostato, abilita il timing e salva il riepilogo JSON all'uscita
+    TIMING_DUMP_FILE: Optional[str] = field(
+        default_factory=lambda: os.environ.get('ORACOLO_TIMING_DUMP'))
     RUOTE: Dict[str, int] = field(default_factory=lambda: {
         'BA': 1,
         'CA': 2,
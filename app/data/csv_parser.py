@@ -0,0 +1,105 @@
+import re
+from typing import Dict, Tuple
+import numpy as np
+
+# Campi per riga: data, ruota e cinque numeri
+HEADER = ('data', 'ruota', 'n1', 'n2', 'n3', 'n4', 'n5')
+_FIELDS = len(HEADER)
+_ZERO = ord('0')
+
+def parse_lotto_csv(raw: bytes, wheels: Dict[str, int],
+                    delimiter: str = ';') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Interpreta un file nel formato fisso di estrazioni-lotto.csv.
+
+    Ogni riga è `GG/MM/AAAA;RR;n1;n2;n3;n4;n5` dopo un'intestazione. Il
+    file viene visto come array di byte: le posizioni dei separatori danno
+    l'inizio di ogni campo, da cui date, ruote e numeri si ricavano con
+    operazioni vettoriali senza creare stringhe Python.
+
+    Args:
+        raw: Contenuto del file
+        wheels: Mapping ruota -> codice numerico (Config.RUOTE); le ruote
+                sconosciute diventano 0 come nel caricamento con pandas
+
+    Returns:
+        Tuple: (date int64 AAAAMMGG, codici ruota int64, numeri uint8 (n, 5))
+    """
+    if b'\r' in raw:
+        raw = raw.replace(b'\r', b'')
+    # Le righe vuote vengono ignorate, come fa pandas.read_csv
+    raw = raw.lstrip(b'\n')
+    if b'\n\n' in raw:
+        raw = re.sub(b'\n\n+', b'\n', raw)
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty((0, 5), dtype=np.uint8))
+    header_end = raw.find(b'\n')
+    if header_end < 0:
+        return empty
+    if raw[:header_end].decode(errors='replace').split(delimiter) != list(HEADER):
+        raise ValueError(f"Formato CSV non valido: intestazione attesa {delimiter.join(HEADER)}")
+    if not raw.endswith(b'\n'):
+        raw += b'\n'
+    if len(raw) <= header_end + 1:
+        return empty
+
+    # Vista senza copie sul corpo del file, dopo l'intestazione
+    data = np.frombuffer(raw, dtype=np.uint8, offset=header_end + 1)
+    separators = np.flatnonzero((data == ord(delimiter)) | (data == ord('\n')))
+    if len(separators) % _FIELDS:
+        raise ValueError("Formato CSV non valido: ogni riga deve avere 7 campi")
+    separators = separators.reshape(-1, _FIELDS)
+    if not (data[separators[:, -1]] == ord('\n')).all():
+        raise ValueError("Formato CSV non valido: ogni riga deve avere 7 campi")
+
+    # Ogni riga inizia dopo il fine riga precedente; data e ruota hanno larghezza fissa
+    line_starts = np.empty(len(separators), dtype=np.intp)
+    line_starts[0] = 0
+    line_starts[1:] = separators[:-1, -1] + 1
+    if not (separators[:, 0] - line_starts == 10).all() or not (separators[:, 1] - separators[:, 0] == 3).all():
+        raise ValueError("Formato CSV non valido: attese date GG/MM/AAAA e ruote di due lettere")
+
+    # Cifre della data in uint8: i caratteri non numerici diventano valori > 9
+    digits = data[line_starts[:, None] + np.array([0, 1, 3, 4, 6, 7, 8, 9])] - np.uint8(_ZERO)
+    if digits.max() > 9:
+        raise ValueError("Formato CSV non valido: data non numerica")
+    digits = digits.astype(np.int32)
+    dates = ((digits[:, 4] * 1000 + digits[:, 5] * 100 + digits[:, 6] * 10 + digits[:, 7]) * 10000
+             + (digits[:, 2] * 10 + digits[:, 3]) * 100 + digits[:, 0] * 10 + digits[:, 1])
+    _check_calendar(dates)
+
+    # Codice ruota da una tabella indicizzata dalle due lettere
+    table = np.zeros(1 << 16, dtype=np.int64)
+    for wheel, code in wheels.items():
+        encoded = wheel.encode()
+        if len(encoded) == 2:
+            table[encoded[0] << 8 | encoded[1]] = code
+    wheel_start = separators[:, 0] + 1
+    codes = table[data[wheel_start].astype(np.intp) << 8 | data[wheel_start + 1]]
+
+    # Numeri di una o due cifre: l'ultima cifra precede il separatore successivo
+    widths = np.diff(separators[:, 1:], axis=1)
+    if not ((widths == 2) | (widths == 3)).all():
+        raise ValueError("Formato CSV non valido: i numeri devono avere una o due cifre")
+    first = data[separators[:, 1:-1] + 1] - np.uint8(_ZERO)
+    last = data[separators[:, 2:] - 1] - np.uint8(_ZERO)
+    if max(first.max(), last.max()) > 9:
+        raise ValueError("Formato CSV non valido: numero non intero")
+    numbers = np.where(widths == 3, first * np.uint8(10) + last, last)
+    if numbers.min() < 1 or numbers.max() > 90:
+        raise ValueError("Formato CSV non valido: i numeri devono essere tra 1 e 90")
+
+    return dates.astype(np.int64), codes, numbers
+
+def _check_calendar(dates: np.ndarray) -> None:
+    """Rifiuta le date AAAAMMGG inesistenti (es. 31/02), che datetime64 sposterebbe in avanti"""
+    months = dates // 100 % 100
+    days = dates % 100
+    if ((months < 1) | (months > 12)).any():
+        raise ValueError("Formato CSV non valido: mese inesistente")
+    # Giorni del mese: distanza tra il primo del mese e il primo del mese successivo
+    month_start = ((dates // 10000 - 1970) * 12 + months - 1).astype('datetime64[M]')
+    lengths = ((month_start + 1).astype('datetime64[D]') - month_start.astype('datetime64[D]')).astype(np.int32)
+    invalid = (days < 1) | (days > lengths)
+    if invalid.any():
+        bad = int(dates[np.argmax(invalid)])
+        raise ValueError(f"Formato CSV non valido: data inesistente {bad % 100:02d}/{bad // 100 % 100:02d}/{bad // 10000}")
@@ -1,33 +1,104 @@
-from typing import List
-import pandas as pd
+import csv
+from typing import TYPE_CHECKING, Iterator, Optional
 from datetime import datetime
+import numpy as np
+from data.csv_parser import HEADER, parse_lotto_csv
 from models.extraction import Extraction
 from config import Config
+from utils.timing import timed
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class DataLoader:
     def __init__(self, config: Config):
         self.config = config
 
-    def load_data(self) -> pd.DataFrame:
+    @timed("DataLoader.load_data")
+    def load_data(self) -> 'pd.DataFrame':
+        """
+        Legge CSV_FILE con il backend configurato.
+
+        Il backend 'fast' restituisce date (AAAAMMGG) e ruote già numeriche,
+        che preprocess_data lascia invariate; se il formato delle date non è
+        quello fisso GG/MM/AAAA si usa pandas.
+        """
+        import pandas as pd
+        if self.config.CSV_BACKEND not in ('fast', 'pandas'):
+            raise ValueError(f"Backend CSV '{self.config.CSV_BACKEND}' non valido (fast o pandas)")
+        if self.config.CSV_BACKEND == 'fast' and self.config.DATE_FORMAT == '%d/%m/%Y':
+            with open(self.config.CSV_FILE, 'rb') as handle:
+                dates, codes, numbers = parse_lotto_csv(handle.read(), self.config.RUOTE,
+                                                        self.config.CSV_DELIMITER)
+            columns = {'data': dates, 'ruota': codes}
+            columns.update({name: numbers[:, i].astype(np.int64) for i, name in enumerate(HEADER[2:])})
+            return pd.DataFrame(columns)
+
         return pd.read_csv(
             self.config.CSV_FILE,
             delimiter=self.config.CSV_DELIMITER,
             keep_default_na=False
         )
 
-    def preprocess_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def iter_extractions(self, path: Optional[str] = None,
+                         ruota: Optional[str] = None) -> Iterator[Extraction]:
+        """
+        Legge il CSV riga per riga restituendo un'estrazione alla volta.
+
+        Non usa pandas e tiene in memoria una sola riga, quindi va bene per
+        strumenti leggeri (ultime estrazioni, ricerche, importazioni) anche
+        su storici molto grandi.
+
+        Args:
+            path: File da leggere (default: config.CSV_FILE)
+            ruota: Se indicata, solo le estrazioni di questa ruota
+        """
+        path = path or self.config.CSV_FILE
+        with open(path, newline='') as handle:
+            reader = csv.reader(handle, delimiter=self.config.CSV_DELIMITER)
+            header = next(reader, None)
+            if header is None:
+                return
+            try:
+                date_index, wheel_index = header.index('data'), header.index('ruota')
+                number_indexes = [header.index(name) for name in HEADER[2:]]
+            except ValueError:
+                raise ValueError(f"Intestazione non valida in {path}: {self.config.CSV_DELIMITER.join(header)}")
+
+            # Le ruote di una stessa estrazione condividono la data: la si converte una volta sola
+            last_text, last_date = None, None
+            for line, row in enumerate(reader, start=2):
+                if not row:
+                    continue
+                if ruota is not None and row[wheel_index] != ruota:
+                    continue
+                try:
+                    if row[date_index] != last_text:
+                        last_text = row[date_index]
+                        last_date = datetime.strptime(last_text, self.config.DATE_FORMAT)
+                    numbers = [int(row[index]) for index in number_indexes]
+                except (ValueError, IndexError):
+                    raise ValueError(f"Riga {line} non valida in {path}: {self.config.CSV_DELIMITER.join(row)}")
+                yield Extraction(last_date, row[wheel_index], numbers)
+
+    @timed("DataLoader.preprocess_data")
+    def preprocess_data(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
+        import pandas as pd
         df = df.copy()  # Crea una copia per evitare warning
         df = self._convert_wheel_to_numeric(df)
-        df['data'] = pd.to_datetime(df['data'], format=self.config.DATE_FORMAT)
-        df['data'] = df['data'].dt.strftime('%Y%m%d')
+        # Le date già intere (backend 'fast') sono in formato AAAAMMGG
+        if not pd.api.types.is_integer_dtype(df['data']):
+            dates = pd.to_datetime(df['data'], format=self.config.DATE_FORMAT)
+            df['data'] = (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).astype(np.int64)
         return df
 
-    def _convert_wheel_to_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _convert_wheel_to_numeric(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
         """Converte i codici delle ruote in valori numerici"""
+        import pandas as pd
         # Se la ruota è già numerica, non fare nulla
         if pd.api.types.is_numeric_dtype(df['ruota']):
             return df
 
         # Altrimenti converti da stringa a numero
         df['ruota'] = df['ruota'].apply(lambda x: self.config.RUOTE.get(x, 0))
-        return df
\ No newline at end of file
+        return df
@@ -0,0 +1,188 @@
+import argparse
+from datetime import date
+from typing import BinaryIO, Iterator, Optional, Sequence, Tuple, Union
+import numpy as np
+from config import Config
+
+# Layout a larghezza fissa di una riga prima della compattazione:
+# data(10) + sep + ruota(2) + 5 * (sep + numero(2)) + '\n'
+_ROW_WIDTH = 10 + 1 + 2 + 5 * 3 + 1
+_PAD = 0  # Byte di riempimento rimosso prima della scrittura
+
+class SyntheticExtractionGenerator:
+    """
+    Genera storici di estrazioni sintetici ma validi per i test di carico.
+
+    Ogni data di estrazione produce una riga per ruota con 5 numeri distinti
+    tra 1 e 90. Il campionamento e la serializzazione sono vettorizzati con
+    NumPy e l'output viene scritto a blocchi, quindi la memoria resta
+    costante anche per file da decine di milioni di righe.
+    """
+
+    # Martedì, giovedì e sabato, come nel calendario reale del Lotto
+    DRAW_WEEKDAYS: Tuple[int, ...] = (1, 3, 5)
+    HISTORICAL_ROME_CODE = 'RM'
+
+    def __init__(self, config: Config, seed: Optional[int] = None,
+                 chunk_rows: int = 1_000_000):
+        self.config = config
+        self.seed = seed
+        self.chunk_rows = chunk_rows
+        # Stesso ordine del file reale: data, poi ruote in ordine alfabetico
+        self.wheels = sorted(config.RUOTE.keys())
+
+    def draw_dates(self, years: int, start: date = date(1939, 1, 7)) -> np.ndarray:
+        """
+        Calcola le date di estrazione per il numero di anni richiesto.
+
+        Returns:
+            np.ndarray: Date in formato datetime64[D], ordinate
+        """
+        if years <= 0:
+            raise ValueError("Il numero di anni deve essere positivo")
+        if start.year + years > 9999:
+            raise ValueError("L'intervallo di date supera l'anno 9999")
+
+        first = np.datetime64(start, 'D')
+        last = np.datetime64(date(start.year + years, start.month, start.day), 'D')
+        days = np.arange(first, last, dtype='datetime64[D]')
+        # 1970-01-01 era un giovedì: (giorni + 3) % 7 dà 0 = lunedì
+        weekdays = (days.astype(np.int64) + 3) % 7
+        return days[np.isin(weekdays, self.DRAW_WEEKDAYS)]
+
+    @staticmethod
+    def draw_numbers(rng: np.random.Generator, rows: int) -> np.ndarray:
+        """
+        Estrae `rows` cinquine di numeri distinti tra 1 e 90.
+
+        Usa il campionamento con rigetto: le righe con duplicati (circa il 10%)
+        vengono ri-estratte finché tutte le cinquine sono valide.
+        """
+        numbers = rng.integers(1, 91, size=(rows, 5), dtype=np.uint8)
+        invalid = np.arange(rows)
+        while invalid.size:
+            numbers[invalid] = rng.integers(1, 91, size=(invalid.size, 5), dtype=np.uint8)
+            ordered = np.sort(numbers[invalid], axis=1)
+            duplicated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            invalid = invalid[duplicated]
+        return numbers
+
+    def iter_chunks(self, years: int) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Genera lo storico a blocchi di circa `chunk_rows` righe.
+
+        Yields:
+            Tuple: (date datetime64[D], indici ruota in self.wheels, numeri uint8 (n, 5))
+        """
+        rng = np.random.default_rng(self.seed)
+        dates = self.draw_dates(years)
+        wheel_count = len(self.wheels)
+        dates_per_chunk = max(1, self.chunk_rows // wheel_count)
+
+        for begin in range(0, len(dates), dates_per_chunk):
+            chunk_dates = dates[begin:begin + dates_per_chunk]
+            rows = len(chunk_dates) * wheel_count
+            yield (
+                np.repeat(chunk_dates, wheel_count),
+                np.tile(np.arange(wheel_count, dtype=np.uint8), len(chunk_dates)),
+                self.draw_numbers(rng, rows)
+            )
+
+    def write_csv(self, output: Union[str, BinaryIO], years: int) -> int:
+        """
+        Scrive uno storico nel formato di estrazioni-lotto.csv.
+
+        Format: DD/MM/YYYY;BA;58;22;47;49;69
+
+        Returns:
+            int: Numero di righe scritte (header escluso)
+        """
+        header = ';'.join(['data', 'ruota', 'n1', 'n2', 'n3', 'n4', 'n5'])
+        return self._write(output, years, self.config.CSV_DELIMITER,
+                           date_order='dmy', date_sep='/',
+                           wheel_codes=self.wheels, header=header)
+
+    def write_historical(self, output: Union[str, BinaryIO], years: int) -> int:
+        """
+        Scrive uno storico nel formato storico.txt (senza header).
+
+        Format: YYYY/MM/DD\tBA\t58\t22\t47\t49\t69
+
+        Returns:
+            int: Numero di righe scritte
+        """
+        codes = [self.HISTORICAL_ROME_CODE if code == 'RO' else code for code in self.wheels]
+        return self._write(output, years, self.config.HISTORICAL_DELIMITER,
+                           date_order='ymd', date_sep='/',
+                           wheel_codes=codes, header=None)
+
+    def _write(self, output: Union[str, BinaryIO], years: int, delimiter: str,
+               date_order: str, date_sep: str, wheel_codes: Sequence[str],
+               header: Optional[str]) -> int:
+        """Serializza i blocchi generati e li scrive in streaming"""
+        if isinstance(output, str):
+            with open(output, 'wb') as handle:
+                return self._write(handle, years, delimiter, date_order,
+                                   date_sep, wheel_codes, header)
+
+        if header:
+            output.write((header + '\n').encode('ascii'))
+
+        sep = ord(delimiter)
+        codes = np.array([list(code.encode('ascii')) for code in wheel_codes], dtype=np.uint8)
+        total = 0
+        for dates, wheels, numbers in self.iter_chunks(years):
+            buffer = np.full((len(dates), _ROW_WIDTH), _PAD, dtype=np.uint8)
+            buffer[:, 0:10] = self._encode_dates(dates, date_order, date_sep)
+            buffer[:, 10] = sep
+            buffer[:, 11:13] = codes[wheels]
+            for i in range(5):
+                column = 13 + i * 3
+                tens = numbers[:, i] // 10
+                buffer[:, column] = sep
+                buffer[:, column + 1] = np.where(tens > 0, tens + ord('0'), _PAD)
+                buffer[:, column + 2] = numbers[:, i] % 10 + ord('0')
+            buffer[:, -1] = ord('\n')
+
+            output.write(buffer[buffer != _PAD].tobytes())
+            total += len(dates)
+
+        return total
+
+    @staticmethod
+    def _encode_dates(dates: np.ndarray, order: str, sep: str) -> np.ndarray:
+        """Converte le date in una matrice (n, 10) di caratteri ASCII"""
+        years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+        months = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        days = (dates - dates.astype('datetime64[M]')).astype(np.int64) + 1
+
+        def digits(values: np.ndarray, width: int) -> np.ndarray:
+            powers = 10 ** np.arange(width - 1, -1, -1)
+            return (values[:, None] // powers % 10 + ord('0')).astype(np.uint8)
+
+        separator = np.full((len(dates), 1), ord(sep), dtype=np.uint8)
+        if order == 'dmy':
+            parts = [digits(days, 2), separator, digits(months, 2), separator, digits(years, 4)]
+        else:
+            parts = [digits(years, 4), separator, digits(months, 2), separator, digits(days, 2)]
+        return np.hstack(parts)
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Entry point da riga di comando per generare storici sintetici"""
+    parser = argparse.ArgumentParser(description="Genera storici di estrazioni sintetici")
+    parser.add_argument('output', help="File di destinazione")
+    parser.add_argument('--anni', type=int, default=100, help="Anni di estrazioni da generare")
+    parser.add_argument('--formato', choices=['csv', 'storico'], default='csv',
+                        help="csv: estrazioni-lotto.csv, storico: storico.txt")
+    parser.add_argument('--seed', type=int, default=None, help="Seed per la riproducibilità")
+    args = parser.parse_args(argv)
+
+    generator = SyntheticExtractionGenerator(Config(), seed=args.seed)
+    if args.formato == 'csv':
+        rows = generator.write_csv(args.output, args.anni)
+    else:
+        rows = generator.write_historical(args.output, args.anni)
+    print(f"Generate {rows} righe in {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@ import sys
 from config import Config
 from services.lotto_service import LottoService
 from presentation.output_formatter import OutputFormatter
+from utils.timing import registry as timing_registry
 
 def main():
     if len(sys.argv) != 3:
@@ -15,23 +16,25 @@ def main():
 
     try:
         config = Config()
+        if config.TIMING_DUMP_FILE:
+            timing_registry.install_exit_dump(config.TIMING_DUMP_FILE)
         service = LottoService(config)
         formatter = OutputFormatter()
 
         # Inizializza e addestra il modello
-        service.initialize_predictor("decision_tree")
+        service.initialize_predictor(config.PREDICTOR_TYPE)
         service.train_model()
 
         # Effettua la predizione
         prediction, historical_data = service.predict(date, wheel)
 
         # Formatta e mostra i risultati
-        print(formatter.format_prediction(
+        formatter.write_prediction(
             date=date,
             wheel=wheel,
             numbers=prediction,
             historical_data=historical_data
-        ))
+        )
 
     except Exception as e:
         formatter = OutputFormatter()
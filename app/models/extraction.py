@@ -1,9 +1,31 @@
-from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from typing import Iterable, Iterator, Tuple
 
-@dataclass
 class Extraction:
-    data: datetime
-    ruota: str
-    numeri: List[int]
\ No newline at end of file
+    """
+    Una riga dello storico: data, ruota e i cinque numeri estratti.
+
+    Usa __slots__ e una tupla per i numeri, così milioni di record
+    occupano poca memoria e restano immutabili nell'uso comune.
+    """
+    __slots__ = ('data', 'ruota', 'numeri')
+
+    def __init__(self, data: datetime, ruota: str, numeri: Iterable[int]):
+        self.data = data
+        self.ruota = ruota
+        self.numeri: Tuple[int, ...] = tuple(numeri)
+
+    def __iter__(self) -> Iterator:
+        """Permette lo spacchettamento: data, ruota, numeri = estrazione"""
+        return iter((self.data, self.ruota, self.numeri))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Extraction):
+            return NotImplemented
+        return (self.data, self.ruota, self.numeri) == (other.data, other.ruota, other.numeri)
+
+    def __hash__(self) -> int:
+        return hash((self.data, self.ruota, self.numeri))
+
+    def __repr__(self) -> str:
+        return f"Extraction({self.data:%d/%m/%Y}, {self.ruota}, {list(self.numeri)})"
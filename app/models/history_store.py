@@ -0,0 +1,288 @@
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from models.prefix_counts import PrefixCounts
+from utils.shared_arrays import SharedArrays, SharedArraysHandle
+
+NUMBER_COLUMNS = ['n1', 'n2', 'n3', 'n4', 'n5']
+
+def yyyymmdd_to_datetime64(values: np.ndarray) -> np.ndarray:
+    """Converte interi (o stringhe) YYYYMMDD in un array datetime64[D]"""
+    values = np.asarray(values).astype(np.int64)
+    years = (values // 10000 - 1970).astype('datetime64[Y]')
+    months = years.astype('datetime64[M]') + (values // 100 % 100 - 1).astype('timedelta64[M]')
+    return months.astype('datetime64[D]') + (values % 100 - 1).astype('timedelta64[D]')
+
+class WheelHistory(Sequence):
+    """
+    Vista in sola lettura sulle estrazioni di una ruota.
+
+    Si comporta come la vecchia List[List[int]] (len, indice, iterazione)
+    ma è solo una finestra sugli array condivisi di HistoryStore.
+    """
+    __slots__ = ('numbers', 'dates')
+
+    def __init__(self, numbers: np.ndarray, dates: np.ndarray):
+        self.numbers = numbers
+        self.dates = dates
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[List[int], 'WheelHistory']:
+        if isinstance(index, slice):
+            return WheelHistory(self.numbers[index], self.dates[index])
+        return self.numbers[index].tolist()
+
+    def __iter__(self) -> Iterator[List[int]]:
+        return iter(self.numbers.tolist())
+
+    def __repr__(self) -> str:
+        return f"WheelHistory({len(self)} estrazioni)"
+
+    def between(self, start: Optional[np.datetime64] = None,
+                end: Optional[np.datetime64] = None) -> 'WheelHistory':
+        """
+        Restituisce le estrazioni con data in [start, end] (estremi inclusi).
+
+        Le date sono ordinate, quindi bastano due ricerche binarie:
+        il costo è O(log n) e il risultato è una vista senza copie.
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.dates, start, side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.dates, end, side='right'))
+        return self[lo:max(lo, hi)]
+
+    def last(self, count: int) -> 'WheelHistory':
+        """Restituisce le ultime `count` estrazioni"""
+        if count <= 0:
+            raise ValueError("Il numero di estrazioni deve essere positivo")
+        return self[max(len(self) - count, 0):]
+
+class HistoryStore(Mapping):
+    """
+    Storico compatto di tutte le ruote.
+
+    Tutte le estrazioni stanno in un unico array uint8 (N, 5) ordinato per
+    ruota e data, affiancato da un array di date datetime64[D]. Ogni ruota
+    è una fetta contigua [inizio, fine) descritta da `offsets`, quindi
+    l'accesso per ruota non copia dati.
+    """
+
+    def __init__(self, numbers: np.ndarray, dates: np.ndarray,
+                 offsets: Dict[str, Tuple[int, int]],
+                 prefix: Optional[Dict[str, PrefixCounts]] = None):
+        self.numbers = numbers
+        self.dates = dates
+        self.offsets = offsets
+        # Conteggi cumulativi per ruota, costruiti alla prima richiesta
+        self._prefix: Dict[str, PrefixCounts] = dict(prefix or {})
+
+    @classmethod
+    def empty(cls, wheels: Dict[str, int]) -> 'HistoryStore':
+        """Crea uno storico vuoto con tutte le ruote configurate"""
+        return cls(np.empty((0, 5), dtype=np.uint8),
+                   np.empty(0, dtype='datetime64[D]'),
+                   {wheel: (0, 0) for wheel in wheels})
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, wheels: Dict[str, int]) -> 'HistoryStore':
+        """
+        Costruisce lo storico da un DataFrame preprocessato.
+
+        Args:
+            df: DataFrame con 'data' (YYYYMMDD), 'ruota' (codice numerico) e n1..n5
+            wheels: Mapping ruota -> codice numerico (Config.RUOTE)
+        """
+        codes = df['ruota'].to_numpy(dtype=np.int64)
+        # Le righe con ruota sconosciuta (codice 0) non appartengono a nessuna ruota
+        keep = np.isin(codes, list(wheels.values()))
+        codes = codes[keep]
+        dates = yyyymmdd_to_datetime64(df['data'].to_numpy()[keep])
+        numbers = df[NUMBER_COLUMNS].to_numpy(dtype=np.uint8)[keep]
+
+        # Ordine stabile per ruota e poi per data: ogni ruota resta contigua
+        order = np.lexsort((dates, codes))
+        codes, dates, numbers = codes[order], dates[order], numbers[order]
+
+        offsets = {}
+        for wheel, code in wheels.items():
+            start, end = np.searchsorted(codes, [code, code + 1])
+            offsets[wheel] = (int(start), int(end))
+
+        return cls(np.ascontiguousarray(numbers), dates, offsets)
+
+    def append(self, df: pd.DataFrame, wheels: Dict[str, int]) -> 'HistoryStore':
+        """
+        Restituisce un nuovo storico con le estrazioni di `df` in coda.
+
+        Le nuove estrazioni di ogni ruota non possono precedere l'ultima già
+        presente. I conteggi cumulativi già costruiti vengono estesi con le
+        sole righe nuove; lo storico di partenza non cambia.
+
+        Args:
+            df: DataFrame preprocessato con 'data' (YYYYMMDD), 'ruota' (codice numerico) e n1..n5
+            wheels: Mapping ruota -> codice numerico (Config.RUOTE)
+        """
+        added = HistoryStore.from_dataframe(df, wheels)
+        unknown = len(df) - sum(end - start for start, end in added.offsets.values())
+        if unknown:
+            raise ValueError(f"{unknown} estrazioni hanno un codice ruota sconosciuto")
+
+        numbers, dates, offsets, prefix = [], [], {}, {}
+        position = 0
+        for wheel in wheels:
+            old, new = self.get(wheel), added[wheel]
+            if old is not None and len(old) and len(new) and new.dates[0] < old.dates[-1]:
+                raise ValueError(f"Le nuove estrazioni di {wheel} precedono l'ultima già caricata")
+            for part in (old, new):
+                if part is not None and len(part):
+                    numbers.append(part.numbers)
+                    dates.append(part.dates)
+            size = (len(old) if old is not None else 0) + len(new)
+            offsets[wheel] = (position, position + size)
+            position += size
+            if wheel in self._prefix:
+                prefix[wheel] = self._prefix[wheel].extend(new.numbers)
+
+        if not numbers:
+            return HistoryStore.empty(wheels)
+        return HistoryStore(np.concatenate(numbers), np.concatenate(dates), offsets, prefix)
+
+    def prefix_counts(self, wheel: str) -> PrefixCounts:
+        """Conteggi cumulativi della ruota: le frequenze di ogni finestra con una sottrazione"""
+        prefix = self._prefix.get(wheel)
+        if prefix is None:
+            # Due thread possono costruirli insieme: il risultato è identico
+            prefix = self._prefix[wheel] = PrefixCounts.from_numbers(self[wheel].numbers)
+        return prefix
+
+    def __getitem__(self, wheel: str) -> WheelHistory:
+        start, end = self.offsets[wheel]
+        return WheelHistory(self.numbers[start:end], self.dates[start:end])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def total_draws(self) -> int:
+        return len(self.numbers)
+
+    def wheel_indices(self) -> np.ndarray:
+        """Indice della ruota (nell'ordine di `offsets`) per ogni riga dello storico"""
+        # Le righe seguono l'ordine dei codici, non quello di `offsets`: si usano le posizioni reali
+        indices = np.empty(self.total_draws, dtype=np.intp)
+        for index, (start, end) in enumerate(self.offsets.values()):
+            indices[start:end] = index
+        return indices
+
+    def row_mask(self, start: Optional[np.datetime64] = None, end: Optional[np.datetime64] = None,
+                 last: Optional[int] = None) -> np.ndarray:
+        """
+        Seleziona le righe di tutte le ruote che cadono nella finestra richiesta.
+
+        Ogni ruota è ordinata per data, quindi la finestra di ciascuna è un
+        intervallo contiguo trovato con ricerca binaria.
+
+        Args:
+            start: Data iniziale inclusa
+            end: Data finale inclusa
+            last: Ultime N estrazioni di ciascuna ruota (dopo il filtro sulle date)
+        """
+        if last is not None and last <= 0:
+            raise ValueError("Il numero di estrazioni deve essere positivo")
+
+        mask = np.zeros(self.total_draws, dtype=bool)
+        for offset, stop in self.offsets.values():
+            dates = self.dates[offset:stop]
+            lo = 0 if start is None else int(np.searchsorted(dates, start, side='left'))
+            hi = len(dates) if end is None else int(np.searchsorted(dates, end, side='right'))
+            if last is not None:
+                lo = max(lo, hi - last)
+            if hi > lo:
+                mask[offset + lo:offset + hi] = True
+        return mask
+
+    def frequency_matrix(self, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Conta le uscite di ogni numero su tutte le ruote in un solo passaggio.
+
+        Returns:
+            Tuple: conteggi (ruote, 91) indicizzati per numero ed estrazioni per ruota
+        """
+        wheels = self.wheel_indices()
+        numbers = self.numbers
+        if mask is not None:
+            wheels, numbers = wheels[mask], numbers[mask]
+
+        keys = wheels[:, None] * 91 + numbers
+        wheel_count = len(self.offsets)
+        counts = np.bincount(keys.ravel(), minlength=wheel_count * 91).reshape(wheel_count, 91)
+        return counts, np.bincount(wheels, minlength=wheel_count)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Riporta l'occupazione in byte degli array dello storico.
+
+        Returns:
+            Dict: byte di numeri, date, totale ed estrazioni memorizzate
+        """
+        return {
+            'numbers': int(self.numbers.nbytes),
+            'dates': int(self.dates.nbytes),
+            'total': int(self.numbers.nbytes + self.dates.nbytes),
+            'draws': self.total_draws,
+        }
+
+@dataclass(frozen=True)
+class SharedHistoryHandle:
+    """Riferimento serializzabile a uno storico in memoria condivisa, da passare ai worker"""
+    arrays: SharedArraysHandle
+    offsets: Tuple[Tuple[str, int, int], ...]
+
+    def attach(self) -> Tuple[shared_memory.SharedMemory, HistoryStore]:
+        """
+        Ricostruisce lo storico come viste sulla memoria condivisa, senza copie.
+
+        Il SharedMemory restituito va tenuto vivo finché si usa lo storico.
+        """
+        block, arrays = self.arrays.attach()
+        offsets = {wheel: (start, end) for wheel, start, end in self.offsets}
+        return block, HistoryStore(arrays['numbers'], arrays['dates'], offsets)
+
+class SharedHistory:
+    """
+    Copia di un HistoryStore in memoria condivisa.
+
+    Chi la crea ne è il proprietario e la libera con close(); i processi
+    worker ricevono `handle` e vi si collegano con handle.attach(), quindi
+    la memoria occupata non cresce con il numero di worker.
+    """
+
+    def __init__(self, store: HistoryStore):
+        self._arrays = SharedArrays({'numbers': store.numbers, 'dates': store.dates})
+        self.handle = SharedHistoryHandle(
+            self._arrays.handle,
+            tuple((wheel, start, end) for wheel, (start, end) in store.offsets.items()))
+
+    @property
+    def nbytes(self) -> int:
+        return self._arrays.nbytes
+
+    @property
+    def closed(self) -> bool:
+        return self._arrays.closed
+
+    def close(self) -> None:
+        self._arrays.close()
+
+    def __enter__(self) -> 'SharedHistory':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,93 @@
+from typing import List
+import numpy as np
+
+class PrefixCounts:
+    """
+    Conteggi cumulativi delle uscite di una ruota, estrazione per estrazione.
+
+    La riga i di `cumulative` (forma (estrazioni+1, 91)) contiene le uscite
+    di ogni numero nelle prime i estrazioni, quindi le frequenze di una
+    qualsiasi finestra [lo, hi) sono cumulative[hi] - cumulative[lo].
+
+    Le righe stanno in un buffer con capacità di riserva: extend() scrive
+    oltre l'ultima riga e restituisce una nuova istanza, mentre quella di
+    partenza continua a vedere solo le proprie righe. Gli snapshot già
+    pubblicati restano quindi validi senza copie. Le chiamate a extend()
+    sullo stesso buffer vanno serializzate (LottoService lo fa con il
+    lock dei ricaricamenti).
+    """
+    __slots__ = ('_buffer', '_filled', 'length')
+    BLOCK_ROWS = 16384
+
+    def __init__(self, buffer: np.ndarray, length: int, filled: List[int]):
+        self._buffer = buffer
+        # Righe scritte nel buffer, condiviso tra le istanze che lo usano
+        self._filled = filled
+        self.length = length
+
+    @classmethod
+    def from_numbers(cls, numbers: np.ndarray) -> 'PrefixCounts':
+        """Costruisce i conteggi da un array (estrazioni, 5) di numeri 1-90"""
+        return cls(np.zeros((1, 91), dtype=np.int32), 0, [0]).extend(numbers)
+
+    @staticmethod
+    def _incidence(numbers: np.ndarray) -> np.ndarray:
+        """Matrice (estrazioni, 91) con 1 per ogni numero uscito in ciascuna estrazione"""
+        rows = np.repeat(np.arange(len(numbers)), numbers.shape[1]) * 91
+        keys = rows + numbers.ravel().astype(np.intp)
+        return np.bincount(keys, minlength=len(numbers) * 91).reshape(len(numbers), 91)
+
+    def extend(self, numbers: np.ndarray) -> 'PrefixCounts':
+        """
+        Aggiunge in coda nuove estrazioni.
+
+        Il costo è proporzionale alle sole righe nuove (più una copia
+        ammortizzata quando il buffer va ingrandito).
+
+        Returns:
+            PrefixCounts: Conteggi comprensivi delle nuove estrazioni
+        """
+        numbers = np.asarray(numbers)
+        if numbers.ndim != 2 or numbers.shape[1] != 5:
+            raise ValueError("Le estrazioni devono essere un array (N, 5)")
+        if not len(numbers):
+            return self
+        if numbers.min() < 1 or numbers.max() > 90:
+            raise ValueError("I numeri devono essere tra 1 e 90")
+
+        start, end = self.length, self.length + len(numbers)
+        buffer, filled = self._buffer, self._filled
+        # Un'altra istanza ha già scritto oltre le nostre righe: si riparte da una copia
+        if filled[0] != start or end + 1 > len(buffer):
+            capacity = max(end + 1, 2 * len(buffer)) if filled[0] == start else end + 1
+            buffer = np.empty((capacity, 91), dtype=np.int32)
+            buffer[:start + 1] = self._buffer[:start + 1]
+            filled = [start]
+
+        # A blocchi, per non materializzare l'incidenza (N, 91) di storici molto lunghi
+        for begin in range(0, len(numbers), self.BLOCK_ROWS):
+            block = numbers[begin:begin + self.BLOCK_ROWS]
+            rows = slice(start + begin + 1, start + begin + len(block) + 1)
+            np.cumsum(self._incidence(block), axis=0, out=buffer[rows])
+            buffer[rows] += buffer[start + begin]
+        filled[0] = end
+        return PrefixCounts(buffer, end, filled)
+
+    @property
+    def cumulative(self) -> np.ndarray:
+        return self._buffer[:self.length + 1]
+
+    def __len__(self) -> int:
+        return self.length
+
+    def window(self, lo: int, hi: int) -> np.ndarray:
+        """Uscite per numero (91,) nelle estrazioni [lo, hi)"""
+        if not 0 <= lo <= hi <= self.length:
+            raise ValueError(f"Finestra non valida: [{lo}, {hi}) su {self.length} estrazioni")
+        return self._buffer[hi] - self._buffer[lo]
+
+    def last(self, count: int) -> np.ndarray:
+        """Uscite per numero (91,) nelle ultime `count` estrazioni"""
+        if count <= 0:
+            raise ValueError("Il numero di estrazioni deve essere positivo")
+        return self.window(max(self.length - count, 0), self.length)
@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from models.statistics import WheelStatistics
+
+@dataclass
+class WheelReport:
+    """Sezione del report di una ruota"""
+    wheel: str
+    statistics: WheelStatistics
+    counts: List[int]                 # Uscite per numero, indice 0 inutilizzato
+    delays: List[Tuple[int, int]]     # (numero, estrazioni senza uscita), dal ritardo maggiore
+    last_date: Optional[str]          # Data dell'ultima estrazione considerata (AAAA-MM-GG)
+    prediction: Optional[List[int]] = None
+
+@dataclass
+class Report:
+    """Report di tutte le ruote calcolato su una sola versione del dataset"""
+    date: str
+    version: int
+    window: str
+    wheels: List[WheelReport] = field(default_factory=list)
+    elapsed: float = 0.0              # Secondi spesi a calcolare le sezioni
+    workers: int = 1                  # Processi usati per le sezioni (1: calcolate in linea)
@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+import numpy as np
+
+@dataclass
+class WheelStatistics:
+    """Statistiche di frequenza già calcolate per una ruota"""
+    wheel: str
+    most_common: List[Tuple[int, int]]
+    least_common: List[Tuple[int, int]]
+    total_numbers: int
+    total_draws: int
+
+@dataclass
+class CorrelatedPair:
+    """Coppia di numeri su ruote diverse con la relativa correlazione"""
+    wheel_a: str
+    number_a: int
+    wheel_b: str
+    number_b: int
+    together: int
+    expected: float
+    correlation: float
+
+def statistics_from_counts(wheel: str, counts: np.ndarray, total_draws: int,
+                           top: int = 5) -> WheelStatistics:
+    """
+    Ricava numeri frequenti e meno frequenti da un vettore di conteggi.
+
+    Args:
+        wheel: Etichetta della ruota
+        counts: Conteggi indicizzati per numero (indice 0 inutilizzato)
+        total_draws: Estrazioni su cui sono stati calcolati i conteggi
+        top: Quanti numeri riportare per ciascuna classifica
+
+    I numeri mai usciti sono esclusi; a parità di frequenza vince il numero più basso.
+    """
+    numbers = np.flatnonzero(counts)
+    numbers = numbers[numbers > 0]
+    values = counts[numbers]
+
+    most = numbers[np.argsort(-values, kind='stable')[:top]]
+    least = numbers[np.argsort(values, kind='stable')[:top]]
+    return WheelStatistics(
+        wheel=wheel,
+        most_common=[(int(num), int(counts[num])) for num in most],
+        least_common=[(int(num), int(counts[num])) for num in least],
+        total_numbers=int(counts.sum()),
+        total_draws=int(total_draws)
+    )
@@ -0,0 +1,46 @@
+from typing import List, Tuple
+import numpy as np
+
+def transition_counts(numbers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcola la matrice di transizione di una sequenza di estrazioni.
+
+    Un unico bincount sulle 25 coppie (estrazione t, estrazione t+1) di ogni
+    transizione conta quante volte il numero j è uscito nell'estrazione
+    successiva a quella del numero i.
+
+    Args:
+        numbers: Array (n, 5) di estrazioni in ordine cronologico
+
+    Returns:
+        Tuple: matrice (91, 91) con transitions[i, j] = volte in cui j segue i,
+               e vettore (91,) con le uscite di i che hanno un'estrazione successiva
+    """
+    numbers = np.asarray(numbers, dtype=np.intp)
+    if len(numbers) < 2:
+        return np.zeros((91, 91), dtype=np.int64), np.zeros(91, dtype=np.int64)
+
+    current, following = numbers[:-1], numbers[1:]
+    keys = current[:, :, None] * 91 + following[:, None, :]
+    transitions = np.bincount(keys.ravel(), minlength=91 * 91).reshape(91, 91)
+    occurrences = np.bincount(current.ravel(), minlength=91)
+    return transitions, occurrences
+
+def top_followers(transitions: np.ndarray, occurrences: np.ndarray, number: int,
+                  top: int = 10) -> List[Tuple[int, int, float]]:
+    """
+    Restituisce i numeri che più spesso seguono `number`.
+
+    Returns:
+        List: (numero, volte, frequenza relativa alle uscite di `number`)
+    """
+    if number < 1 or number > 90:
+        raise ValueError("Il numero deve essere tra 1 e 90")
+
+    row = transitions[number, 1:]
+    order = np.argsort(-row, kind='stable')[:top]
+    total = occurrences[number]
+    return [
+        (int(index + 1), int(row[index]), float(row[index] / total) if total else 0.0)
+        for index in order if row[index] > 0
+    ]
@@ -0,0 +1,39 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Chiave del DecisionTreePredictor nel file della configurazione migliore
+MODEL_KEY = 'decision_tree'
+
+@dataclass
+class CandidateScore:
+    """Punteggio di una configurazione sui fold di validazione"""
+    params: Dict[str, Any]
+    mean_score: float
+    fold_scores: List[float]
+
+@dataclass
+class TuningResult:
+    """Esito di una ricerca degli iperparametri"""
+    best_params: Dict[str, Any]
+    best_score: float
+    candidates: List[CandidateScore] = field(default_factory=list)
+    folds: int = 0
+    fitted: int = 0
+    cached: int = 0
+
+def load_best_params(path: str, model: str = MODEL_KEY) -> Optional[Dict[str, Any]]:
+    """
+    Restituisce i parametri salvati per il modello, o None se non è mai stato ottimizzato.
+
+    Legge solo il JSON: chi deve creare un predittore non importa scikit-learn.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as handle:
+            entry = json.load(handle).get(model)
+    except ValueError as e:
+        raise ValueError(f"File di configurazione {path} non valido: {str(e)}")
+    return dict(entry['params']) if entry else None
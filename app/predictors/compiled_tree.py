@@ -0,0 +1,104 @@
+from typing import Any
+import numpy as np
+
+# Valore di children_left/children_right per le foglie negli alberi di scikit-learn
+LEAF = -1
+
+class CompiledTree:
+    """
+    Albero di decisione addestrato ridotto ad array NumPy.
+
+    Per ogni nodo restano solo feature e soglia dello split, i due figli e
+    le etichette predette (una per output, già risolte dalle classi).
+    L'inferenza visita l'albero per tutte le righe insieme, un livello per
+    iterazione, e non richiede scikit-learn: un processo che deve solo
+    predire carica il file .npz e parte subito.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray,
+                 right: np.ndarray, labels: np.ndarray):
+        """
+        Args:
+            feature: Indice della feature di split per nodo (int32)
+            threshold: Soglia dello split per nodo: a sinistra se x <= soglia (float64)
+            left: Figlio sinistro per nodo, LEAF per le foglie (int32)
+            right: Figlio destro per nodo, LEAF per le foglie (int32)
+            labels: Etichette predette per nodo, forma (nodi, output)
+        """
+        if not (len(feature) == len(threshold) == len(left) == len(right) == len(labels)):
+            raise ValueError("Gli array dell'albero hanno lunghezze diverse")
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.labels = labels
+
+    @classmethod
+    def from_classifier(cls, model: Any) -> 'CompiledTree':
+        """
+        Estrae gli array da un DecisionTreeClassifier addestrato.
+
+        Le etichette di ogni nodo sono la classe più frequente per output,
+        come in DecisionTreeClassifier.predict (a parità vince la prima).
+        """
+        tree = getattr(model, 'tree_', None)
+        if tree is None:
+            raise ValueError("Il modello non è stato ancora addestrato")
+
+        classes = model.classes_ if model.n_outputs_ > 1 else [model.classes_]
+        winners = tree.value.argmax(axis=2)  # (nodi, output)
+        labels = np.column_stack([np.asarray(output_classes)[winners[:, output]]
+                                  for output, output_classes in enumerate(classes)])
+        if np.issubdtype(labels.dtype, np.integer) and labels.min() >= 0 and labels.max() <= 255:
+            labels = labels.astype(np.uint8)
+
+        return cls(feature=tree.feature.astype(np.int32),
+                   threshold=tree.threshold.astype(np.float64),
+                   left=tree.children_left.astype(np.int32),
+                   right=tree.children_right.astype(np.int32),
+                   labels=labels)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.feature)
+
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Etichette predette per ogni riga di X.
+
+        Come scikit-learn, le feature vengono convertite in float32 prima del
+        confronto con le soglie, quindi gli split coincidono anche sui valori
+        grandi (es. date YYYYMMDD) che float32 arrotonda.
+
+        Returns:
+            np.ndarray: Forma (righe, output)
+        """
+        features = np.asarray(X).astype(np.float32)
+        if features.ndim != 2:
+            raise ValueError("Le feature devono essere una matrice (righe, feature)")
+
+        nodes = np.zeros(len(features), dtype=np.intp)
+        rows = np.arange(len(features))
+        # Ogni iterazione fa scendere di un livello le righe non ancora arrivate a una foglia
+        active = rows[self.left[nodes] != LEAF]
+        while active.size:
+            current = nodes[active]
+            go_left = features[active, self.feature[current]] <= self.threshold[current]
+            nodes[active] = np.where(go_left, self.left[current], self.right[current])
+            active = active[self.left[nodes[active]] != LEAF]
+        return self.labels[nodes]
+
+    def save(self, path: str) -> None:
+        """Salva gli array in un file .npz compresso"""
+        np.savez_compressed(path, feature=self.feature, threshold=self.threshold,
+                            left=self.left, right=self.right, labels=self.labels)
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledTree':
+        """Carica un albero salvato con save()"""
+        try:
+            with np.load(path, allow_pickle=False) as arrays:
+                return cls(arrays['feature'], arrays['threshold'], arrays['left'],
+                           arrays['right'], arrays['labels'])
+        except (OSError, KeyError) as e:
+            raise ValueError(f"Albero compilato non valido: {path} ({e})")
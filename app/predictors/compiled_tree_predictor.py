@@ -0,0 +1,69 @@
+from predictors.compiled_tree import CompiledTree
+from predictors.predictor_interface import PredictorInterface
+import pandas as pd
+from typing import Any, List, Optional
+
+class CompiledTreePredictor(PredictorInterface):
+    """
+    Predittore ad albero di decisione che predice da un CompiledTree.
+
+    L'addestramento usa DecisionTreePredictor (e quindi scikit-learn), poi
+    esporta l'albero e scarta il classificatore. Un processo che deve solo
+    predire usa load() sul file .npz e non importa mai scikit-learn.
+    """
+
+    def __init__(self, model_file: Optional[str] = None, **params: Any):
+        """
+        Args:
+            model_file: File .npz in cui salvare l'albero dopo il training (opzionale)
+            params: Iperparametri del DecisionTreeClassifier (es. quelli trovati con 'tune')
+        """
+        self.model_file = model_file
+        self.params = params
+        self.tree: Optional[CompiledTree] = None
+        self.is_trained = False
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledTreePredictor':
+        """Predittore pronto all'uso da un albero esportato"""
+        predictor = cls(model_file=path)
+        predictor.tree = CompiledTree.load(path)
+        predictor.is_trained = True
+        return predictor
+
+    def train(self, X: pd.DataFrame, y: pd.DataFrame) -> None:
+        """
+        Addestra il modello sui dati forniti ed esporta l'albero.
+
+        Args:
+            X: DataFrame con le feature (data, ruota)
+            y: DataFrame con i target (n1, n2, n3, n4, n5)
+        """
+        # Import ritardato: serve solo a chi addestra
+        from predictors.decision_tree_predictor import DecisionTreePredictor
+
+        predictor = DecisionTreePredictor(**self.params)
+        predictor.train(X, y)
+        self.tree = CompiledTree.from_classifier(predictor.model)
+        if self.model_file:
+            self.tree.save(self.model_file)
+        self.is_trained = True
+
+    def predict(self, features: List) -> List[int]:
+        """
+        Predice i numeri per le feature fornite.
+
+        Args:
+            features: Lista contenente [data, codice_ruota]
+
+        Returns:
+            List[int]: Lista dei 5 numeri predetti
+        """
+        if not self.is_trained:
+            raise ValueError("Il modello non è stato ancora addestrato")
+
+        try:
+            prediction = self.tree.predict([features])[0]
+            return [int(num) for num in prediction]
+        except Exception as e:
+            raise ValueError(f"Errore durante la predizione: {str(e)}")
@@ -1,12 +1,19 @@
 from sklearn.tree import DecisionTreeClassifier
+from predictors.compiled_tree import CompiledTree
 from predictors.predictor_interface import PredictorInterface
 import pandas as pd
-from typing import List
+from typing import Any, List
 
 class DecisionTreePredictor(PredictorInterface):
-    def __init__(self):
-        """Inizializza il modello"""
-        self.model = DecisionTreeClassifier()
+    def __init__(self, **params: Any):
+        """
+        Inizializza il modello
+
+        Args:
+            params: Iperparametri del DecisionTreeClassifier (es. quelli trovati con 'tune')
+        """
+        self.params = params
+        self.model = DecisionTreeClassifier(**params)
         self.is_trained = False
 
     def train(self, X: pd.DataFrame, y: pd.DataFrame) -> None:
@@ -40,4 +47,17 @@ class DecisionTreePredictor(PredictorInterface):
             prediction = self.model.predict([features])[0]
             return [int(num) for num in prediction]  # Converte in lista di interi
         except Exception as e:
-            raise ValueError(f"Errore durante la predizione: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Errore durante la predizione: {str(e)}")
+
+    def export(self, path: str) -> CompiledTree:
+        """
+        Esporta l'albero addestrato in un file .npz per CompiledTreePredictor.load.
+
+        Returns:
+            CompiledTree: L'albero esportato
+        """
+        if not self.is_trained:
+            raise ValueError("Il modello non è stato ancora addestrato")
+        tree = CompiledTree.from_classifier(self.model)
+        tree.save(path)
+        return tree
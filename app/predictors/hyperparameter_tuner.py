@@ -0,0 +1,223 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+from models.tuning import MODEL_KEY, CandidateScore, TuningResult, load_best_params
+from utils.bitmask import numbers_to_packed
+from utils.shared_arrays import SharedArrays, SharedArraysHandle
+from utils.timing import timed
+
+DEFAULT_GRID: Dict[str, List[Any]] = {
+    'max_depth': [None, 5, 10, 20],
+    'min_samples_leaf': [1, 5, 20],
+    'criterion': ['gini', 'entropy'],
+}
+
+Split = Tuple[np.ndarray, np.ndarray]
+
+# Dati dei processi worker: viste sulla memoria condivisa e fold, impostati dall'initializer
+_worker_block: Optional[shared_memory.SharedMemory] = None
+_worker_data: Optional[Tuple[np.ndarray, np.ndarray, List[Split]]] = None
+
+def _init_worker(handle: SharedArraysHandle, folds: int) -> None:
+    global _worker_block, _worker_data
+    _worker_block, arrays = handle.attach()
+    features, targets = arrays['features'], arrays['targets']
+    # I fold si ricalcolano dalle date: costa meno che inviare gli indici a ogni processo
+    _worker_data = (features, targets, time_series_folds(features[:, 0], folds))
+
+def _fit_fold(params: Dict[str, Any], fold: int) -> float:
+    features, targets, splits = _worker_data
+    train, test = splits[fold]
+    return evaluate_fold(features, targets, train, test, params)
+
+def hit_score(predicted: np.ndarray, actual: np.ndarray) -> float:
+    """Media dei numeri indovinati per estrazione (0-5), ignorando l'ordine"""
+    if len(actual) == 0:
+        return 0.0
+    common = numbers_to_packed(predicted) & numbers_to_packed(actual)
+    return float(np.unpackbits(common, axis=1).sum(axis=1).mean())
+
+def evaluate_fold(features: np.ndarray, targets: np.ndarray, train: np.ndarray,
+                  test: np.ndarray, params: Dict[str, Any]) -> float:
+    """Addestra un albero sul fold di training e lo valuta sul fold successivo"""
+    model = DecisionTreeClassifier(random_state=0, **params)
+    model.fit(features[train], targets[train])
+    return hit_score(model.predict(features[test]), targets[test])
+
+def time_series_folds(dates: np.ndarray, folds: int) -> List[Split]:
+    """
+    Divide le righe in fold temporali a finestra crescente.
+
+    Le date distinte sono divise in `folds + 1` blocchi consecutivi: il fold i
+    si addestra sui blocchi 0..i e si valida sul blocco i + 1. Tutte le ruote
+    di una stessa data finiscono nello stesso blocco, quindi nessun fold vede
+    estrazioni successive a quelle su cui viene valutato.
+    """
+    if folds < 1:
+        raise ValueError("Il numero di fold deve essere positivo")
+    unique_dates = np.unique(dates)
+    if len(unique_dates) < folds + 1:
+        raise ValueError(f"Date insufficienti per {folds} fold: servono almeno {folds + 1} date distinte")
+
+    positions = np.searchsorted(unique_dates, dates)
+    blocks = np.array_split(np.arange(len(unique_dates)), folds + 1)
+    return [
+        (np.flatnonzero(positions < block[0]),
+         np.flatnonzero((positions >= block[0]) & (positions <= block[-1])))
+        for block in blocks[1:]
+    ]
+
+class HyperparameterTuner:
+    """
+    Ricerca a griglia degli iperparametri del DecisionTreePredictor.
+
+    Ogni coppia (configurazione, fold) è un addestramento indipendente:
+    viene eseguita in parallelo su più processi e il suo punteggio salvato
+    su disco appena calcolato, così una ricerca interrotta riprende dai
+    soli addestramenti mancanti.
+    """
+
+    def __init__(self, folds: int = 5, workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        Args:
+            folds: Numero di fold temporali
+            workers: Processi paralleli (default: numero di core)
+            cache_dir: Directory dei risultati per fold (None disabilita la cache)
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("Il numero di processi deve essere positivo")
+        self.folds = folds
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def candidates(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+        """Espande la griglia in tutte le combinazioni di parametri"""
+        names = list(grid)
+        return [dict(zip(names, values)) for values in product(*(grid[name] for name in names))]
+
+    @timed("HyperparameterTuner.search")
+    def search(self, X: pd.DataFrame, y: pd.DataFrame,
+               grid: Optional[Dict[str, Sequence[Any]]] = None) -> TuningResult:
+        """
+        Valuta tutte le configurazioni della griglia.
+
+        Args:
+            X: DataFrame con le feature (data YYYYMMDD, ruota)
+            y: DataFrame con i target (n1, n2, n3, n4, n5)
+            grid: Valori da provare per ogni parametro (default: DEFAULT_GRID)
+
+        Returns:
+            TuningResult: Configurazioni ordinate per punteggio medio decrescente
+        """
+        features = np.ascontiguousarray(X.astype(np.int64).to_numpy())
+        targets = np.ascontiguousarray(y.to_numpy(dtype=np.int64))
+        splits = time_series_folds(features[:, 0], self.folds)
+        candidates = self.candidates(grid or DEFAULT_GRID)
+        if not candidates:
+            raise ValueError("La griglia dei parametri è vuota")
+        fingerprint = self._fingerprint(features, targets)
+
+        scores: Dict[Tuple[int, int], float] = {}
+        pending: List[Tuple[int, int]] = []
+        for index, params in enumerate(candidates):
+            for fold in range(self.folds):
+                cached = self._read_cache(fingerprint, params, fold)
+                if cached is None:
+                    pending.append((index, fold))
+                else:
+                    scores[(index, fold)] = cached
+
+        for (index, fold), score in self._run(pending, candidates, features, targets, splits):
+            scores[(index, fold)] = score
+            self._write_cache(fingerprint, candidates[index], fold, score)
+
+        ranked = []
+        for index, params in enumerate(candidates):
+            fold_scores = [scores[(index, fold)] for fold in range(self.folds)]
+            ranked.append(CandidateScore(params, float(np.mean(fold_scores)), fold_scores))
+        ranked.sort(key=lambda candidate: -candidate.mean_score)
+        return TuningResult(best_params=ranked[0].params, best_score=ranked[0].mean_score,
+                            candidates=ranked, folds=self.folds,
+                            fitted=len(pending), cached=len(scores) - len(pending))
+
+    def _run(self, pending: List[Tuple[int, int]], candidates: List[Dict[str, Any]],
+             features: np.ndarray, targets: np.ndarray, splits: List[Split]):
+        """Esegue gli addestramenti mancanti restituendo i punteggi man mano che terminano"""
+        if self.workers == 1 or len(pending) <= 1:
+            for index, fold in pending:
+                train, test = splits[fold]
+                yield (index, fold), evaluate_fold(features, targets, train, test, candidates[index])
+            return
+
+        # Feature e target vengono copiati una volta in memoria condivisa, non in ogni processo
+        with SharedArrays({'features': features, 'targets': targets}) as shared, \
+                ProcessPoolExecutor(max_workers=min(self.workers, len(pending)),
+                                    initializer=_init_worker,
+                                    initargs=(shared.handle, self.folds)) as executor:
+            futures = {executor.submit(_fit_fold, candidates[index], fold): (index, fold)
+                       for index, fold in pending}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _fingerprint(self, features: np.ndarray, targets: np.ndarray) -> str:
+        """Identifica dataset e divisione in fold: cambia se cambia uno dei due"""
+        digest = hashlib.sha1(features.tobytes())
+        digest.update(targets.tobytes())
+        digest.update(f"folds={self.folds}".encode('ascii'))
+        return digest.hexdigest()[:16]
+
+    def _cache_path(self, fingerprint: str, params: Dict[str, Any], fold: int) -> str:
+        key = hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, fingerprint, f"{key}_{fold}.json")
+
+    def _read_cache(self, fingerprint: str, params: Dict[str, Any], fold: int) -> Optional[float]:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._cache_path(fingerprint, params, fold)) as handle:
+                return float(json.load(handle)['score'])
+        except (OSError, ValueError, KeyError):
+            return None  # Mancante o scritto a metà: va ricalcolato
+
+    def _write_cache(self, fingerprint: str, params: Dict[str, Any], fold: int, score: float) -> None:
+        if self.cache_dir is None:
+            return
+        path = self._cache_path(fingerprint, params, fold)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_json(path, {'params': params, 'fold': fold, 'score': score})
+
+    @staticmethod
+    def save_best(result: TuningResult, path: str, model: str = MODEL_KEY) -> None:
+        """Salva la configurazione migliore, conservando quelle degli altri modelli"""
+        try:
+            with open(path) as handle:
+                document = json.load(handle)
+        except (OSError, ValueError):
+            document = {}
+        document[model] = {'params': result.best_params, 'score': result.best_score,
+                           'folds': result.folds}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _write_json(path, document)
+
+    @staticmethod
+    def load_best(path: str, model: str = MODEL_KEY) -> Optional[Dict[str, Any]]:
+        """Restituisce i parametri salvati per il modello, o None se non è mai stato ottimizzato"""
+        return load_best_params(path, model)
+
+def _write_json(path: str, document: Dict[str, Any]) -> None:
+    """Scrittura atomica: un'interruzione non lascia mai un file a metà"""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w') as handle:
+        json.dump(document, handle)
+    os.replace(temporary, path)
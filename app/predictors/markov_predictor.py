@@ -0,0 +1,70 @@
+from predictors.predictor_interface import PredictorInterface
+from models.transitions import transition_counts
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+class MarkovPredictor(PredictorInterface):
+    """
+    Predittore basato sulle matrici di transizione per ruota.
+
+    Per ogni ruota prende l'ultima estrazione vista in training e sceglie i 5
+    numeri con la maggiore probabilità empirica di seguire i suoi numeri.
+    La data richiesta non modifica la predizione: il modello descrive
+    sempre l'estrazione successiva all'ultima nota.
+    """
+
+    def __init__(self):
+        self.transitions: Dict[int, np.ndarray] = {}
+        self.last_draws: Dict[int, np.ndarray] = {}
+        self.is_trained = False
+
+    def train(self, X: pd.DataFrame, y: pd.DataFrame) -> None:
+        """
+        Addestra il modello sui dati forniti.
+
+        Args:
+            X: DataFrame con le feature (data, ruota)
+            y: DataFrame con i target (n1, n2, n3, n4, n5)
+        """
+        try:
+            dates = X['data'].to_numpy().astype(np.int64)
+            wheels = X['ruota'].to_numpy().astype(np.int64)
+            numbers = y.to_numpy().astype(np.intp)
+        except Exception as e:
+            raise ValueError(f"Errore durante il training: {str(e)}")
+
+        order = np.lexsort((dates, wheels))
+        wheels, numbers = wheels[order], numbers[order]
+
+        self.transitions.clear()
+        self.last_draws.clear()
+        for wheel in np.unique(wheels):
+            wheel_numbers = numbers[wheels == wheel]
+            transitions, occurrences = transition_counts(wheel_numbers)
+            # Probabilità condizionata P(j nell'estrazione successiva | i uscito)
+            self.transitions[int(wheel)] = transitions / np.maximum(occurrences, 1)[:, None]
+            self.last_draws[int(wheel)] = wheel_numbers[-1]
+        self.is_trained = True
+
+    def predict(self, features: List) -> List[int]:
+        """
+        Predice i numeri per le feature fornite.
+
+        Args:
+            features: Lista contenente [data, codice_ruota]
+
+        Returns:
+            List[int]: Lista dei 5 numeri predetti
+        """
+        if not self.is_trained:
+            raise ValueError("Il modello non è stato ancora addestrato")
+
+        wheel = int(features[1])
+        if wheel not in self.transitions:
+            raise ValueError(f"Errore durante la predizione: ruota {wheel} non presente nei dati")
+
+        scores = self.transitions[wheel][self.last_draws[wheel]].sum(axis=0)
+        scores[0] = -1  # Lo 0 non è un numero valido
+        best = np.argsort(-scores, kind='stable')[:5]
+        return sorted(int(num) for num in best)
@@ -1,10 +1,27 @@
 from predictors.predictor_interface import PredictorInterface
-from predictors.decision_tree_predictor import DecisionTreePredictor
+from predictors.compiled_tree_predictor import CompiledTreePredictor
+from predictors.markov_predictor import MarkovPredictor
+from models.tuning import load_best_params
+from typing import Optional
 
 class PredictorFactory:
     @staticmethod
-    def create_predictor(predictor_type: str) -> PredictorInterface:
-        if predictor_type.lower() == "decision_tree":
-            return DecisionTreePredictor()
+    def create_predictor(predictor_type: str, tuning_file: Optional[str] = None,
+                         model_file: Optional[str] = None) -> PredictorInterface:
+        """
+        Args:
+            predictor_type: 'decision_tree', 'compiled_tree' o 'markov'
+            tuning_file: File con la configurazione migliore salvata da 'tune'
+            model_file: File .npz in cui 'compiled_tree' esporta l'albero addestrato
+        """
+        if predictor_type.lower() in ("decision_tree", "compiled_tree"):
+            params = load_best_params(tuning_file) if tuning_file else None
+            if predictor_type.lower() == "compiled_tree":
+                # scikit-learn viene importato solo in train(), da chi addestra l'albero
+                return CompiledTreePredictor(model_file, **(params or {}))
+            from predictors.decision_tree_predictor import DecisionTreePredictor
+            return DecisionTreePredictor(**(params or {}))
+        if predictor_type.lower() == "markov":
+            return MarkovPredictor()
         # Qui potremmo aggiungere altri tipi di predittori
-        raise ValueError(f"Predictor type {predictor_type} not supported")
\ No newline at end of file
+        raise ValueError(f"Predictor type {predictor_type} not supported")
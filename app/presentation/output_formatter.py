@@ -1,155 +1,226 @@
 # app/presentation/output_formatter.py
-from typing import List, Dict, Tuple
+import sys
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 from datetime import datetime
 import colorama
-from colorama import Fore, Style
-from tabulate import tabulate
-from collections import Counter
-from itertools import combinations
-from systems import IntegralSystem, ReducedSystem, GuaranteedSystem
+from colorama import Fore
+import numpy as np
+from systems import (IntegralSystem, ReducedSystem, GuaranteedSystem, BacktestResult, CoveringLibrary,
+                     SimulationResult, SystemFilters)
+from models.statistics import CorrelatedPair, WheelStatistics, statistics_from_counts
+from models.tuning import TuningResult
+from presentation.render_cache import RenderCache
+from presentation.renderer import SystemListing, create_renderer, detect_mode
+from utils.timing import timed
 
 class OutputFormatter:
-    def __init__(self):
-        colorama.init()
-        self.MAX_BARS = 50  # Lunghezza massima delle barre nel grafico
+    def __init__(self, mode: Optional[str] = None, stream: Optional[TextIO] = None,
+                 covering_library: Optional[CoveringLibrary] = None,
+                 render_cache: Optional[RenderCache] = None):
+        """
+        Args:
+            mode: 'rich', 'plain', 'csv' o 'json'. Se omesso viene scelto in base
+                  allo stream: 'rich' per i terminali, 'plain' per pipe e file
+            stream: Destinazione dei metodi write_* (default: sys.stdout)
+            covering_library: Archivio delle coperture per i sistemi garantiti
+            render_cache: Cache dei blocchi formattati (default: una nuova cache)
+        """
+        self.stream = stream or sys.stdout
+        self.covering_library = covering_library
+        self.render_cache = render_cache or RenderCache()
+        self.set_mode(mode or detect_mode(self.stream))
+
+    def set_mode(self, mode: str) -> None:
+        """Cambia la modalità di output"""
+        self.renderer = create_renderer(mode)
+        self.mode = mode
+        if mode == 'rich':
+            colorama.init()
+
+    def _write(self, chunks: Iterable[str]) -> None:
+        """Scrive i blocchi sullo stream man mano che vengono prodotti"""
+        for chunk in chunks:
+            self.stream.write(chunk + "\n")
+
+    def _cached(self, kind: str, wheel: str, version: Optional[int], window: Hashable,
+                render: Callable[[], Iterable[str]]) -> Iterable[str]:
+        """
+        Blocchi per (tipo, ruota, versione, finestra, modalità): con version
+        None (dataset non versionato) vengono sempre ricalcolati.
+        """
+        if version is None:
+            return render()
+        return self.render_cache.get((kind, wheel, window, self.mode), version, render)
 
+    @timed("OutputFormatter.format_prediction")
     def format_prediction(self, date: str, wheel: str, numbers: List[int],
-                         historical_data: List[List[int]]) -> str:
-        """Formatta la predizione completa con statistiche e visualizzazioni"""
+                          historical_data: Sequence[List[int]], version: Optional[int] = None) -> str:
+        """
+        Formatta la predizione completa con statistiche e visualizzazioni.
+
+        Args:
+            version: Versione del dataset di historical_data, per riusare l'output già formattato
+        """
+        return "\n".join(self._cached_prediction(date, wheel, numbers, historical_data, version))
+
+    @timed("OutputFormatter.write_prediction")
+    def write_prediction(self, date: str, wheel: str, numbers: List[int],
+                         historical_data: Sequence[List[int]], version: Optional[int] = None) -> None:
+        """Scrive la predizione completa direttamente sullo stream"""
+        self._write(self._cached_prediction(date, wheel, numbers, historical_data, version))
+
+    def _cached_prediction(self, date: str, wheel: str, numbers: List[int],
+                           historical_data: Sequence[List[int]], version: Optional[int]) -> Iterable[str]:
+        # Data e numeri predetti fanno parte della finestra: con la stessa versione il blocco non cambia
+        return self._cached('predizione', wheel, version, (date, tuple(numbers)),
+                            lambda: self._prediction_chunks(date, wheel, numbers, historical_data))
+
+    def _prediction_chunks(self, date: str, wheel: str, numbers: List[int],
+                           historical_data: Sequence[List[int]]) -> Iterator[str]:
         try:
             formatted_date = datetime.strptime(date, '%d/%m/%Y').strftime('%d/%m/%Y')
         except ValueError:
             formatted_date = date
 
-        output_parts = [
-            "\n" + "="*50,
-            self._format_basic_prediction(formatted_date, wheel, numbers),
-        ]
-
+        statistics, frequencies = None, None
         if historical_data:
-            output_parts.extend([
-                self.format_statistics(historical_data, wheel),
-                self.format_frequency_chart(historical_data, wheel),
-            ])
-
-        output_parts.append("="*50 + "\n")
-        return "\n".join(filter(None, output_parts))
-
-    def _format_basic_prediction(self, date: str, wheel: str,
-                               numbers: List[int]) -> str:
-        """Formatta la predizione base con data, ruota e numeri"""
-        header = [f"{Fore.CYAN}Dettagli Predizione{Style.RESET_ALL}"]
-        data = [
-            [f"{Fore.GREEN}Data:{Style.RESET_ALL} {date}"],
-            [f"{Fore.GREEN}Ruota:{Style.RESET_ALL} {wheel.upper()}"],
-            [f"{Fore.GREEN}Numeri Predetti:{Style.RESET_ALL}"]
-        ]
-
-        numbers_table = [[
-            f"{Fore.YELLOW}{num:02d}{Style.RESET_ALL}"
-            for num in sorted(numbers)
-        ]]
+            counts = self._count_array(historical_data)
+            frequencies = self._frequencies_from_counts(counts)
+            statistics = statistics_from_counts(wheel, counts, len(historical_data))
 
-        return (
-            tabulate(data, header, tablefmt="fancy_grid") + "\n" +
-            tabulate(numbers_table, tablefmt="grid")
-        )
+        return self.renderer.prediction(formatted_date, wheel, numbers, statistics, frequencies)
 
-    def format_statistics(self, historical_data: List[List[int]], wheel: str) -> str:
-        """Formatta le statistiche dei numeri estratti"""
+    @timed("OutputFormatter.format_statistics")
+    def format_statistics(self, historical_data: Sequence[List[int]], wheel: str,
+                          version: Optional[int] = None, window: Hashable = None) -> str:
+        """
+        Formatta le statistiche dei numeri estratti.
+
+        Args:
+            version: Versione del dataset di historical_data, per riusare l'output già formattato
+            window: Finestra da cui viene historical_data (parte della chiave della cache)
+        """
         if not historical_data:
             return ""
 
-        # Calcola le statistiche
-        all_numbers = [num for extract in historical_data for num in extract]
-        counter = Counter(all_numbers)
-
-        most_common = counter.most_common(5)
-        least_common = sorted(counter.items(), key=lambda x: x[1])[:5]
+        return "\n".join(self._cached('statistiche', wheel, version, window,
+                                      lambda: self._statistics_chunks(historical_data, wheel)))
 
-        # Prepara i dati per la tabella
-        header = [f"{Fore.CYAN}Statistiche - {wheel}{Style.RESET_ALL}"]
-        data = [
-            [f"{Fore.GREEN}Numeri più frequenti:{Style.RESET_ALL} " +
-             ", ".join(f"{num:02d}({count})" for num, count in most_common)],
-            [f"{Fore.GREEN}Numeri meno frequenti:{Style.RESET_ALL} " +
-             ", ".join(f"{num:02d}({count})" for num, count in least_common)],
-            [f"{Fore.GREEN}Numeri totali analizzati:{Style.RESET_ALL} {len(all_numbers)}"],
-            [f"{Fore.GREEN}Estrazioni analizzate:{Style.RESET_ALL} {len(historical_data)}"],
-        ]
+    def _statistics_chunks(self, historical_data: Sequence[List[int]], wheel: str) -> Iterator[str]:
+        statistics = statistics_from_counts(wheel, self._count_array(historical_data),
+                                            len(historical_data))
+        return self.renderer.statistics(statistics)
 
-        return "\n" + tabulate(data, header, tablefmt="fancy_grid")
-
-    def format_frequency_chart(self, historical_data: List[List[int]], wheel: str) -> str:
+    @timed("OutputFormatter.format_frequency_chart")
+    def format_frequency_chart(self, historical_data: Sequence[List[int]], wheel: str,
+                               version: Optional[int] = None, window: Hashable = None) -> str:
         """Crea un grafico ASCII delle frequenze dei numeri"""
         if not historical_data:
             return ""
 
-        # Calcola le frequenze
-        all_numbers = [num for extract in historical_data for num in extract]
-        counter = Counter(all_numbers)
+        return "\n".join(self._frequency_chart_chunks(historical_data, wheel, version, window))
 
-        if not counter:
-            return ""
+    def _frequency_chart_chunks(self, historical_data: Sequence[List[int]], wheel: str,
+                                version: Optional[int], window: Hashable) -> Iterable[str]:
+        def render() -> Iterator[str]:
+            counter = self._count_frequencies(historical_data)
+            return self.renderer.frequency_chart(wheel, counter) if counter else iter(())
+        return self._cached('grafico', wheel, version, window, render)
 
-        max_freq = max(counter.values())
-
-        # Crea l'header del grafico
-        output = [f"\n{Fore.CYAN}Grafico Frequenze - {wheel}{Style.RESET_ALL}"]
+    def write_statistics(self, historical_data: Sequence[List[int]], wheel: str,
+                         version: Optional[int] = None, window: Hashable = None) -> None:
+        """Scrive le statistiche direttamente sullo stream"""
+        if historical_data:
+            self._write([self.format_statistics(historical_data, wheel, version, window)])
 
-        # Crea le barre del grafico
-        for num in range(1, 91):  # Numeri da 1 a 90
-            if num in counter:
-                freq = counter[num]
-                bar_length = int((freq / max_freq) * self.MAX_BARS)
-                bar = "█" * bar_length
-                output.append(
-                    f"{Fore.GREEN}{num:02d}{Style.RESET_ALL} |"
-                    f"{Fore.BLUE}{bar}{Style.RESET_ALL} ({freq})"
-                )
-            else:
-                output.append(f"{Fore.GREEN}{num:02d}{Style.RESET_ALL} |")
+    def write_frequency_chart(self, historical_data: Sequence[List[int]], wheel: str,
+                              version: Optional[int] = None, window: Hashable = None) -> None:
+        """Scrive il grafico delle frequenze riga per riga sullo stream"""
+        if historical_data:
+            self._write(self._frequency_chart_chunks(historical_data, wheel, version, window))
 
-        return "\n".join(output)
+    def format_frequencies(self, counts: np.ndarray, draws: int, label: str,
+                           version: Optional[int] = None, window: Hashable = None) -> str:
+        """
+        Formatta statistiche e grafico da conteggi già calcolati (es. somme prefisse).
 
-    def format_integral_system(self, numbers: List[int], n: int) -> str:
+        Args:
+            counts: Uscite per numero (91,), indice 0 inutilizzato
+            draws: Estrazioni su cui sono stati calcolati i conteggi
+        """
+        return "\n".join(self._frequencies_chunks(counts, draws, label, version, window))
+
+    def write_frequencies(self, counts: np.ndarray, draws: int, label: str,
+                          version: Optional[int] = None, window: Hashable = None) -> None:
+        """Scrive statistiche e grafico dei conteggi sullo stream"""
+        self._write(self._frequencies_chunks(counts, draws, label, version, window))
+
+    def _frequencies_chunks(self, counts: np.ndarray, draws: int, label: str,
+                            version: Optional[int], window: Hashable) -> Iterable[str]:
+        def render() -> Iterator[str]:
+            yield from self.renderer.statistics(statistics_from_counts(label, counts, draws))
+            frequencies = self._frequencies_from_counts(counts)
+            if frequencies:
+                yield from self.renderer.frequency_chart(label, frequencies)
+        return self._cached('frequenze', label, version, window, render)
+
+    @timed("OutputFormatter.format_all_statistics")
+    def format_all_statistics(self, statistics: Dict[str, WheelStatistics], label: str = "Tutte le ruote") -> str:
+        """Formatta in un'unica tabella le statistiche di tutte le ruote"""
+        return "\n".join(self.renderer.all_statistics(label, statistics))
+
+    def write_all_statistics(self, statistics: Dict[str, WheelStatistics], label: str = "Tutte le ruote") -> None:
+        """Scrive la tabella combinata delle statistiche sullo stream"""
+        self._write([self.format_all_statistics(statistics, label)])
+
+    def format_followers(self, wheel: str, number: int, occurrences: int,
+                         followers: List[Tuple[int, int, float]]) -> str:
+        """Formatta i numeri che più spesso seguono un numero dato"""
+        return "\n".join(self.renderer.followers(wheel, number, occurrences, followers))
+
+    def format_correlations(self, pairs: List[CorrelatedPair]) -> str:
+        """Formatta le coppie di numeri più correlate tra ruote diverse"""
+        return "\n".join(self.renderer.correlations(pairs))
+
+    def format_tuning(self, result: TuningResult) -> str:
+        """Formatta l'esito della ricerca degli iperparametri"""
+        return "\n".join(self.renderer.tuning(result))
+
+    @staticmethod
+    def _count_frequencies(historical_data: Sequence[List[int]]) -> Dict[int, int]:
+        """Conta le uscite di ogni numero nello storico (solo numeri usciti)"""
+        return OutputFormatter._frequencies_from_counts(OutputFormatter._count_array(historical_data))
+
+    @staticmethod
+    def _frequencies_from_counts(counts: np.ndarray) -> Dict[int, int]:
+        return {int(num): int(counts[num]) for num in np.flatnonzero(counts)}
+
+    @staticmethod
+    def _count_array(historical_data: Sequence[List[int]]) -> np.ndarray:
+        """Conta le uscite di ogni numero con un unico bincount"""
+        # Le viste di HistoryStore espongono direttamente l'array dei numeri
+        numbers = getattr(historical_data, 'numbers', None)
+        if numbers is None:
+            numbers = np.asarray(list(historical_data), dtype=np.int64)
+        return np.bincount(numbers.ravel(), minlength=91)
+
+    @timed("OutputFormatter.format_integral_system")
+    def format_integral_system(self, numbers: List[int], n: int,
+                               filters: Optional[SystemFilters] = None) -> str:
         """
         Formatta un sistema integrale.
 
         Args:
             numbers: Lista dei numeri base
             n: Numero di numeri per combinazione
+            filters: Vincoli sulle combinazioni (default: tutte)
 
         Returns:
             str: Output formattato del sistema
         """
-        try:
-            system = IntegralSystem()
-            combinations = system.generate_combinations(numbers, n)
-
-            output = [
-                "\n" + "="*50,
-                f"SISTEMA INTEGRALE {n} NUMERI",
-                "="*50,
-                f"\nNumeri base: {', '.join(map(str, sorted(numbers)))}"
-                f"\nCombinazioni di {n} numeri:",
-                "-"*50
-            ]
-
-            for i, comb in enumerate(combinations, 1):
-                output.append(f"{i:2d}) {' - '.join(map(str, comb))}")
-
-            output.extend([
-                "-"*50,
-                f"Totale combinazioni: {len(combinations)}",
-                "="*50 + "\n"
-            ])
-
-            return '\n'.join(output)
-
-        except ValueError as e:
-            return self.format_error(str(e))
+        return self._format_system(self._integral_listing, numbers, n, filters)
 
+    @timed("OutputFormatter.format_reduced_system")
     def format_reduced_system(self, numbers: List[int], n: int) -> str:
         """
         Formatta un sistema ridotto.
@@ -161,33 +232,9 @@ class OutputFormatter:
         Returns:
             str: Output formattato del sistema
         """
-        try:
-            system = ReducedSystem()
-            combinations = system.generate_combinations(numbers, n)
-
-            output = [
-                "\n" + "="*50,
-                f"SISTEMA RIDOTTO {n} NUMERI",
-                "="*50,
-                f"\nNumeri base: {', '.join(map(str, sorted(numbers)))}"
-                f"\nCombinazioni ridotte di {n} numeri:",
-                "-"*50
-            ]
-
-            for i, comb in enumerate(combinations, 1):
-                output.append(f"{i:2d}) {' - '.join(map(str, comb))}")
-
-            output.extend([
-                "-"*50,
-                f"Totale combinazioni: {len(combinations)}",
-                "="*50 + "\n"
-            ])
-
-            return '\n'.join(output)
-
-        except ValueError as e:
-            return self.format_error(str(e))
+        return self._format_system(self._reduced_listing, numbers, n)
 
+    @timed("OutputFormatter.format_guaranteed_system")
     def format_guaranteed_system(self, numbers: List[int], nums: int, win: int) -> str:
         """
         Formatta un sistema garantito.
@@ -200,42 +247,91 @@ class OutputFormatter:
         Returns:
             str: Output formattato del sistema
         """
-        try:
-            system = GuaranteedSystem()
-            combinations = system.find_minimum_guaranteed_combinations(numbers, nums, win)
-            optimized_combs = system.optimize_combinations(combinations, win)
-
-            output = [
-                "\n" + "="*50,
-                f"SISTEMA GARANTITO {nums}/{win}",
-                "="*50,
-                f"\nNumeri base: {', '.join(map(str, sorted(numbers)))}"
-                f"\nCombinazioni che garantiscono {win} punti con {nums} numeri:",
-                "-"*50
-            ]
-
-            for i, comb in enumerate(optimized_combs, 1):
-                output.append(f"{i:2d}) {' - '.join(map(str, comb))}")
-
-            output.extend([
-                "-"*50,
-                f"Totale combinazioni: {len(optimized_combs)}",
-                f"Vincita garantita: {win} punti",
-                "="*50 + "\n"
-            ])
-
-            return '\n'.join(output)
+        return self._format_system(self._guaranteed_listing, numbers, nums, win)
+
+    @timed("OutputFormatter.write_integral_system")
+    def write_integral_system(self, numbers: List[int], n: int,
+                              filters: Optional[SystemFilters] = None) -> None:
+        """Scrive un sistema integrale direttamente sullo stream"""
+        self._write_system(self._integral_listing, numbers, n, filters)
+
+    @timed("OutputFormatter.write_reduced_system")
+    def write_reduced_system(self, numbers: List[int], n: int) -> None:
+        """Scrive un sistema ridotto direttamente sullo stream"""
+        self._write_system(self._reduced_listing, numbers, n)
 
+    @timed("OutputFormatter.write_guaranteed_system")
+    def write_guaranteed_system(self, numbers: List[int], nums: int, win: int) -> None:
+        """Scrive un sistema garantito direttamente sullo stream"""
+        self._write_system(self._guaranteed_listing, numbers, nums, win)
+
+    def _format_system(self, build_listing: Callable[..., SystemListing], *args) -> str:
+        try:
+            listing = build_listing(*args)
         except ValueError as e:
             return self.format_error(str(e))
+        return "\n".join(self.renderer.system(listing))
+
+    def _write_system(self, build_listing: Callable[..., SystemListing], *args) -> None:
+        try:
+            listing = build_listing(*args)
+        except ValueError as e:
+            self._write([self.format_error(str(e))])
+            return
+        self._write(self.renderer.system(listing))
+
+    def _integral_listing(self, numbers: List[int], n: int,
+                          filters: Optional[SystemFilters] = None) -> SystemListing:
+        description = f"Combinazioni di {n} numeri:"
+        if filters is not None:
+            description = f"Combinazioni di {n} numeri (filtri: {filters.describe()}):"
+        return SystemListing(
+            kind='integrale',
+            title=f"SISTEMA INTEGRALE {n} NUMERI",
+            description=description,
+            numbers=numbers,
+            combinations=IntegralSystem().generate_combinations(numbers, n, filters=filters)
+        )
+
+    def _reduced_listing(self, numbers: List[int], n: int) -> SystemListing:
+        return SystemListing(
+            kind='ridotto',
+            title=f"SISTEMA RIDOTTO {n} NUMERI",
+            description=f"Combinazioni ridotte di {n} numeri:",
+            numbers=numbers,
+            combinations=ReducedSystem().generate_combinations(numbers, n)
+        )
+
+    def _guaranteed_listing(self, numbers: List[int], nums: int, win: int) -> SystemListing:
+        combinations = GuaranteedSystem(self.covering_library).generate(numbers, nums, win)
+        return SystemListing(
+            kind='garantito',
+            title=f"SISTEMA GARANTITO {nums}/{win}",
+            description=f"Combinazioni che garantiscono {win} punti con {nums} numeri:",
+            numbers=numbers,
+            combinations=combinations,
+            guaranteed=win
+        )
+
+    def format_backtest(self, label: str, result: BacktestResult) -> str:
+        """Formatta la distribuzione dei punti di un sistema sullo storico"""
+        return "\n".join(self.renderer.backtest(label, result))
+
+    def format_simulation(self, result: SimulationResult) -> str:
+        """Formatta probabilità e resa attesa stimate con la simulazione"""
+        return "\n".join(self.renderer.simulation(result))
+
+    def format_timing(self, summary: Dict[str, Dict[str, float]]) -> str:
+        """Formatta il riepilogo dei tempi per fase (in millisecondi)"""
+        return "\n".join(self.renderer.timing(summary))
 
     def format_error(self, message: str) -> str:
         """Formatta i messaggi di errore"""
-        return f"\n{Fore.RED}Errore: {message}{Style.RESET_ALL}\n"
+        return self.renderer.error(message)
 
     def format_training_info(self, total_records: int) -> str:
         """Formatta le informazioni sull'addestramento"""
         return (
-            f"\n{Fore.BLUE}Info Addestramento:{Style.RESET_ALL}\n"
+            f"\n{self.renderer.paint('Info Addestramento:', Fore.BLUE)}\n"
             f"Record utilizzati: {total_records}\n"
-        )
\ No newline at end of file
+        )
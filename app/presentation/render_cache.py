@@ -0,0 +1,59 @@
+# app/presentation/render_cache.py
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+
+class RenderCache:
+    """
+    Blocchi di output già formattati, validi per una versione del dataset.
+
+    Statistiche e grafici cambiano solo quando cambia lo storico: la chiave
+    (tipo di blocco, ruota, finestra, modalità) viene completata dalla
+    versione e, appena arriva una versione più recente, tutte le voci delle
+    versioni precedenti vengono scartate. Le voci meno usate escono quando
+    si supera `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        if max_entries < 1:
+            raise ValueError("La cache deve contenere almeno una voce")
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Tuple[str, ...]]' = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int, render: Callable[[], Iterable[str]]) -> Tuple[str, ...]:
+        """
+        Restituisce i blocchi in cache o li produce con `render` e li memorizza.
+
+        Le richieste su una versione più vecchia dell'ultima vista (es. uno
+        snapshot letto prima di un ricaricamento) non entrano in cache.
+        """
+        with self._lock:
+            if self._version is None or version > self._version:
+                self._entries.clear()
+                self._version = version
+            cached = self._entries.get(key) if version == self._version else None
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        chunks = tuple(render())
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = chunks
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return chunks
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,457 @@
+# app/presentation/renderer.py
+import csv
+import io
+import json
+from itertools import islice
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from colorama import Fore, Style
+from tabulate import tabulate
+from models.statistics import CorrelatedPair, WheelStatistics
+from models.tuning import TuningResult
+from systems.system_backtest import HIT_NAMES, BacktestResult
+from systems.system_simulator import SimulationResult
+
+OUTPUT_MODES = ('rich', 'plain', 'csv', 'json')
+
+@dataclass
+class SystemListing:
+    """Descrizione di un sistema da stampare"""
+    kind: str
+    title: str
+    description: str
+    numbers: List[int]
+    combinations: Iterable[Tuple[int, ...]]
+    guaranteed: Optional[int] = None
+
+def detect_mode(stream) -> str:
+    """Sceglie 'rich' per i terminali e 'plain' per pipe e file"""
+    isatty = getattr(stream, 'isatty', None)
+    try:
+        return 'rich' if isatty is not None and isatty() else 'plain'
+    except ValueError:  # Stream già chiuso
+        return 'plain'
+
+def create_renderer(mode: str) -> 'Renderer':
+    """Crea il renderer per la modalità richiesta"""
+    if mode == 'rich':
+        return TextRenderer(color=True)
+    if mode == 'plain':
+        return TextRenderer(color=False)
+    if mode == 'csv':
+        return CsvRenderer()
+    if mode == 'json':
+        return JsonRenderer()
+    raise ValueError(f"Modalità di output '{mode}' non valida. Modalità valide: {', '.join(OUTPUT_MODES)}")
+
+class Renderer(ABC):
+    """
+    Strategia di rendering dell'output.
+
+    Ogni metodo restituisce un iteratore di blocchi di testo: chi lo consuma
+    può unirli con '\\n' in una stringa o scriverli uno alla volta su uno stream.
+    """
+
+    def paint(self, text: str, color: str) -> str:
+        """Applica un colore al testo (le modalità senza colori lo restituiscono invariato)"""
+        return text
+
+    @abstractmethod
+    def prediction(self, date: str, wheel: str, numbers: List[int],
+                   statistics: Optional[WheelStatistics],
+                   frequencies: Optional[Dict[int, int]]) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def statistics(self, statistics: WheelStatistics) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def all_statistics(self, label: str, statistics: Dict[str, WheelStatistics]) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def frequency_chart(self, wheel: str, frequencies: Dict[int, int]) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def followers(self, wheel: str, number: int, occurrences: int,
+                  followers: List[Tuple[int, int, float]]) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def correlations(self, pairs: List[CorrelatedPair]) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def tuning(self, result: TuningResult) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def system(self, listing: SystemListing) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def backtest(self, label: str, result: BacktestResult) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def simulation(self, result: SimulationResult) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def timing(self, summary: Dict[str, Dict[str, float]]) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def error(self, message: str) -> str:
+        pass
+
+class TextRenderer(Renderer):
+    """Output leggibile: con colori e box per i terminali, senza per pipe e file"""
+
+    MAX_BARS = 50  # Lunghezza massima delle barre nel grafico
+    MAX_TUNING_ROWS = 10  # Configurazioni mostrate dopo una ricerca
+
+    def __init__(self, color: bool = True):
+        self.color = color
+        self.boxed_format = "fancy_grid" if color else "simple"
+        self.grid_format = "grid" if color else "plain"
+
+    def paint(self, text: str, color: str) -> str:
+        """Applica il colore solo se la modalità lo prevede"""
+        return f"{color}{text}{Style.RESET_ALL}" if self.color else text
+
+    def prediction(self, date: str, wheel: str, numbers: List[int],
+                   statistics: Optional[WheelStatistics],
+                   frequencies: Optional[Dict[int, int]]) -> Iterator[str]:
+        yield "\n" + "="*50
+
+        header = [self.paint("Dettagli Predizione", Fore.CYAN)]
+        data = [
+            [f"{self.paint('Data:', Fore.GREEN)} {date}"],
+            [f"{self.paint('Ruota:', Fore.GREEN)} {wheel.upper()}"],
+            [self.paint("Numeri Predetti:", Fore.GREEN)]
+        ]
+        numbers_table = [[self.paint(f"{num:02d}", Fore.YELLOW) for num in sorted(numbers)]]
+        yield (
+            tabulate(data, header, tablefmt=self.boxed_format) + "\n" +
+            tabulate(numbers_table, tablefmt=self.grid_format)
+        )
+
+        if statistics is not None:
+            yield from self.statistics(statistics)
+        if frequencies:
+            yield from self.frequency_chart(wheel, frequencies)
+
+        yield "="*50 + "\n"
+
+    def statistics(self, statistics: WheelStatistics) -> Iterator[str]:
+        header = [self.paint(f"Statistiche - {statistics.wheel}", Fore.CYAN)]
+        data = [
+            [f"{self.paint('Numeri più frequenti:', Fore.GREEN)} " +
+             ", ".join(f"{num:02d}({count})" for num, count in statistics.most_common)],
+            [f"{self.paint('Numeri meno frequenti:', Fore.GREEN)} " +
+             ", ".join(f"{num:02d}({count})" for num, count in statistics.least_common)],
+            [f"{self.paint('Numeri totali analizzati:', Fore.GREEN)} {statistics.total_numbers}"],
+            [f"{self.paint('Estrazioni analizzate:', Fore.GREEN)} {statistics.total_draws}"],
+        ]
+        yield "\n" + tabulate(data, header, tablefmt=self.boxed_format)
+
+    def all_statistics(self, label: str, statistics: Dict[str, WheelStatistics]) -> Iterator[str]:
+        header = [self.paint(f"Statistiche - {label}", Fore.CYAN), "Estrazioni",
+                  "Più frequenti", "Meno frequenti"]
+        data = [
+            [self.paint(wheel, Fore.GREEN), stats.total_draws,
+             ", ".join(f"{num:02d}({count})" for num, count in stats.most_common),
+             ", ".join(f"{num:02d}({count})" for num, count in stats.least_common)]
+            for wheel, stats in statistics.items()
+        ]
+        yield "\n" + tabulate(data, header, tablefmt=self.boxed_format)
+
+    def frequency_chart(self, wheel: str, frequencies: Dict[int, int]) -> Iterator[str]:
+        max_freq = max(frequencies.values())
+        yield "\n" + self.paint(f"Grafico Frequenze - {wheel}", Fore.CYAN)
+
+        for num in range(1, 91):  # Numeri da 1 a 90
+            label = self.paint(f"{num:02d}", Fore.GREEN)
+            if num in frequencies:
+                freq = frequencies[num]
+                bar = "█" * int((freq / max_freq) * self.MAX_BARS)
+                yield f"{label} |{self.paint(bar, Fore.BLUE)} ({freq})"
+            else:
+                yield f"{label} |"
+
+    def followers(self, wheel: str, number: int, occurrences: int,
+                  followers: List[Tuple[int, int, float]]) -> Iterator[str]:
+        header = [self.paint(f"Dopo il {number:02d} su {wheel} ({occurrences} uscite)", Fore.CYAN),
+                  "Volte", "Frequenza"]
+        data = [[self.paint(f"{num:02d}", Fore.GREEN), count, f"{ratio:.1%}"]
+                for num, count, ratio in followers]
+        yield "\n" + tabulate(data, header, tablefmt=self.boxed_format)
+
+    def correlations(self, pairs: List[CorrelatedPair]) -> Iterator[str]:
+        header = [self.paint("Coppie tra ruote", Fore.CYAN), "Insieme", "Attese", "Correlazione"]
+        data = [[f"{self.paint(pair.wheel_a, Fore.GREEN)} {pair.number_a:02d} - "
+                 f"{self.paint(pair.wheel_b, Fore.GREEN)} {pair.number_b:02d}",
+                 pair.together, f"{pair.expected:.1f}", f"{pair.correlation:.4f}"]
+                for pair in pairs]
+        yield "\n" + tabulate(data, header, tablefmt=self.boxed_format)
+
+    def tuning(self, result: TuningResult) -> Iterator[str]:
+        header = [self.paint("Configurazione", Fore.CYAN), "Numeri indovinati (media)",
+                  *(f"Fold {fold}" for fold in range(1, result.folds + 1))]
+        data = [[self._params_label(candidate.params), f"{candidate.mean_score:.4f}",
+                 *(f"{score:.4f}" for score in candidate.fold_scores)]
+                for candidate in result.candidates[:self.MAX_TUNING_ROWS]]
+        yield "\n" + tabulate(data, header, tablefmt=self.boxed_format)
+        yield (f"{self.paint('Migliore:', Fore.GREEN)} {self._params_label(result.best_params)}"
+               f" ({result.fitted} addestramenti eseguiti, {result.cached} dalla cache)")
+
+    @staticmethod
+    def _params_label(params: Dict) -> str:
+        return ", ".join(f"{name}={value}" for name, value in params.items())
+
+    def system(self, listing: SystemListing) -> Iterator[str]:
+        yield "\n" + "="*50
+        yield listing.title
+        yield "="*50
+        yield (f"\nNumeri base: {', '.join(map(str, sorted(listing.numbers)))}"
+               f"\n{listing.description}")
+        yield "-"*50
+
+        total = 0
+        for total, comb in enumerate(listing.combinations, 1):
+            yield f"{total:2d}) {' - '.join(map(str, comb))}"
+
+        yield "-"*50
+        yield f"Totale combinazioni: {total}"
+        if listing.guaranteed is not None:
+            yield f"Vincita garantita: {listing.guaranteed} punti"
+        yield "="*50 + "\n"
+
+    def backtest(self, label: str, result: BacktestResult) -> Iterator[str]:
+        header = [self.paint(f"Verifica storica - {label}", Fore.CYAN),
+                  "Combinazioni x estrazioni", "Estrazioni vincenti"]
+        data = [[self.paint(HIT_NAMES[hits], Fore.GREEN), result.hit_counts[hits],
+                 result.winning_draws(hits) if hits else "-"]
+                for hits in range(len(result.hit_counts))]
+        yield "\n" + tabulate(data, header, tablefmt=self.boxed_format)
+        yield (f"{result.combinations} combinazioni di {result.combination_size} numeri "
+               f"su {result.draws} estrazioni\n")
+
+    def simulation(self, result: SimulationResult) -> Iterator[str]:
+        header = [self.paint(f"Simulazione - {result.draws} estrazioni", Fore.CYAN),
+                  "Probabilità", "Intervallo 95%", "Una volta ogni"]
+        data = []
+        for hits in range(1, len(result.best_counts)):
+            probability = result.hit_probability(hits)
+            low, high = result.hit_interval(hits)
+            data.append([self.paint(HIT_NAMES[hits], Fore.GREEN), f"{probability:.4%}",
+                         f"{low:.4%} - {high:.4%}",
+                         f"{1 / probability:,.0f}" if probability else "-"])
+        yield "\n" + tabulate(data, header, tablefmt=self.boxed_format)
+        low, high = result.return_interval()
+        yield (f"Costo: {result.cost:.2f} euro per estrazione ({result.combinations} combinazioni "
+               f"di {result.combination_size} numeri sulla sorte {HIT_NAMES[result.sorte]})\n"
+               f"Resa attesa: {result.expected_return:.3f} euro per euro giocato "
+               f"(intervallo 95%: {low:.3f} - {high:.3f})\n")
+
+    def timing(self, summary: Dict[str, Dict[str, float]]) -> Iterator[str]:
+        if not summary:
+            yield "\n" + self.paint("Nessun tempo registrato", Fore.YELLOW) + "\n"
+            return
+
+        header = [self.paint("Fase", Fore.CYAN), "Chiamate", "Totale ms",
+                  "Media ms", "p50 ms", "p95 ms", "p99 ms"]
+        data = [
+            [name, stats['count'], f"{stats['total'] * 1000:.2f}",
+             f"{stats['mean'] * 1000:.2f}", f"{stats['p50'] * 1000:.2f}",
+             f"{stats['p95'] * 1000:.2f}", f"{stats['p99'] * 1000:.2f}"]
+            for name, stats in sorted(summary.items(), key=lambda x: -x[1]['total'])
+        ]
+        yield "\n" + tabulate(data, header, tablefmt=self.boxed_format)
+
+    def error(self, message: str) -> str:
+        return "\n" + self.paint(f"Errore: {message}", Fore.RED) + "\n"
+
+class CsvRenderer(Renderer):
+    """Output CSV (separatore ';' come estrazioni-lotto.csv) per l'uso da script"""
+
+    DELIMITER = ';'
+
+    def _row(self, values: Sequence) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=self.DELIMITER, lineterminator='').writerow(values)
+        return buffer.getvalue()
+
+    def prediction(self, date: str, wheel: str, numbers: List[int],
+                   statistics: Optional[WheelStatistics],
+                   frequencies: Optional[Dict[int, int]]) -> Iterator[str]:
+        yield self._row(['data', 'ruota', 'n1', 'n2', 'n3', 'n4', 'n5'])
+        yield self._row([date, wheel.upper(), *sorted(numbers)])
+
+    def statistics(self, statistics: WheelStatistics) -> Iterator[str]:
+        yield self._row(['ruota', 'tipo', 'numero', 'frequenza'])
+        for kind, values in (('piu_frequente', statistics.most_common),
+                             ('meno_frequente', statistics.least_common)):
+            for num, count in values:
+                yield self._row([statistics.wheel, kind, num, count])
+
+    def all_statistics(self, label: str, statistics: Dict[str, WheelStatistics]) -> Iterator[str]:
+        yield self._row(['ruota', 'tipo', 'numero', 'frequenza'])
+        for stats in statistics.values():
+            for line in islice(self.statistics(stats), 1, None):
+                yield line
+
+    def frequency_chart(self, wheel: str, frequencies: Dict[int, int]) -> Iterator[str]:
+        yield self._row(['ruota', 'numero', 'frequenza'])
+        for num in range(1, 91):
+            yield self._row([wheel, num, frequencies.get(num, 0)])
+
+    def followers(self, wheel: str, number: int, occurrences: int,
+                  followers: List[Tuple[int, int, float]]) -> Iterator[str]:
+        yield self._row(['ruota', 'numero', 'segue', 'volte', 'frequenza'])
+        for num, count, ratio in followers:
+            yield self._row([wheel, number, num, count, f"{ratio:.4f}"])
+
+    def correlations(self, pairs: List[CorrelatedPair]) -> Iterator[str]:
+        yield self._row(['ruota_a', 'numero_a', 'ruota_b', 'numero_b', 'insieme', 'attese', 'correlazione'])
+        for pair in pairs:
+            yield self._row([pair.wheel_a, pair.number_a, pair.wheel_b, pair.number_b,
+                             pair.together, f"{pair.expected:.4f}", f"{pair.correlation:.6f}"])
+
+    def tuning(self, result: TuningResult) -> Iterator[str]:
+        names = list(result.best_params)
+        yield self._row([*names, 'media', *(f"fold_{fold}" for fold in range(1, result.folds + 1))])
+        for candidate in result.candidates:
+            yield self._row([*(candidate.params[name] for name in names),
+                             f"{candidate.mean_score:.6f}",
+                             *(f"{score:.6f}" for score in candidate.fold_scores)])
+
+    def system(self, listing: SystemListing) -> Iterator[str]:
+        for comb in listing.combinations:
+            yield self._row(comb)
+
+    def backtest(self, label: str, result: BacktestResult) -> Iterator[str]:
+        yield self._row(['punti', 'vincita', 'combinazioni_x_estrazioni', 'estrazioni_vincenti'])
+        for hits, count in enumerate(result.hit_counts):
+            yield self._row([hits, HIT_NAMES[hits], count, result.winning_draws(hits) if hits else ''])
+
+    def simulation(self, result: SimulationResult) -> Iterator[str]:
+        yield self._row(['punti', 'vincita', 'probabilita', 'minimo_95', 'massimo_95'])
+        for hits in range(1, len(result.best_counts)):
+            yield self._row([hits, HIT_NAMES[hits], result.hit_probability(hits), *result.hit_interval(hits)])
+        yield self._row(['resa', 'euro_per_euro', result.expected_return, *result.return_interval()])
+
+    def timing(self, summary: Dict[str, Dict[str, float]]) -> Iterator[str]:
+        columns = ['count', 'total', 'mean', 'p50', 'p95', 'p99', 'max']
+        yield self._row(['fase', *columns])
+        for name, stats in sorted(summary.items()):
+            yield self._row([name, *(stats[column] for column in columns)])
+
+    def error(self, message: str) -> str:
+        return f"Errore: {message}"
+
+class JsonRenderer(Renderer):
+    """Output JSON, un documento per comando"""
+
+    def prediction(self, date: str, wheel: str, numbers: List[int],
+                   statistics: Optional[WheelStatistics],
+                   frequencies: Optional[Dict[int, int]]) -> Iterator[str]:
+        document = {'data': date, 'ruota': wheel.upper(), 'numeri': sorted(numbers)}
+        if statistics is not None:
+            document['statistiche'] = self._statistics_document(statistics)
+        if frequencies:
+            document['frequenze'] = {str(num): count for num, count in sorted(frequencies.items())}
+        yield json.dumps(document)
+
+    def statistics(self, statistics: WheelStatistics) -> Iterator[str]:
+        yield json.dumps(self._statistics_document(statistics))
+
+    def all_statistics(self, label: str, statistics: Dict[str, WheelStatistics]) -> Iterator[str]:
+        yield json.dumps({wheel: self._statistics_document(stats)
+                          for wheel, stats in statistics.items()})
+
+    def frequency_chart(self, wheel: str, frequencies: Dict[int, int]) -> Iterator[str]:
+        yield json.dumps({
+            'ruota': wheel,
+            'frequenze': {str(num): frequencies.get(num, 0) for num in range(1, 91)}
+        })
+
+    def followers(self, wheel: str, number: int, occurrences: int,
+                  followers: List[Tuple[int, int, float]]) -> Iterator[str]:
+        yield json.dumps({
+            'ruota': wheel, 'numero': number, 'uscite': occurrences,
+            'seguono': [{'numero': num, 'volte': count, 'frequenza': ratio}
+                        for num, count, ratio in followers]
+        })
+
+    def correlations(self, pairs: List[CorrelatedPair]) -> Iterator[str]:
+        yield json.dumps([
+            {'ruota_a': pair.wheel_a, 'numero_a': pair.number_a,
+             'ruota_b': pair.wheel_b, 'numero_b': pair.number_b,
+             'insieme': pair.together, 'attese': pair.expected,
+             'correlazione': pair.correlation}
+            for pair in pairs
+        ])
+
+    def tuning(self, result: TuningResult) -> Iterator[str]:
+        yield json.dumps({
+            'migliore': result.best_params, 'punteggio': result.best_score,
+            'fold': result.folds, 'addestramenti': result.fitted, 'dalla_cache': result.cached,
+            'configurazioni': [{'parametri': candidate.params, 'media': candidate.mean_score,
+                                'fold': candidate.fold_scores}
+                               for candidate in result.candidates]
+        })
+
+    def system(self, listing: SystemListing) -> Iterator[str]:
+        # Le combinazioni vengono scritte una per riga senza costruire la lista completa
+        header = {'tipo': listing.kind, 'numeri_base': sorted(listing.numbers)}
+        if listing.guaranteed is not None:
+            header['punti_garantiti'] = listing.guaranteed
+        yield json.dumps(header)[:-1] + ', "combinazioni": ['
+
+        separator = ""
+        for comb in listing.combinations:
+            yield separator + json.dumps(list(comb))
+            separator = ","
+        yield "]}"
+
+    def backtest(self, label: str, result: BacktestResult) -> Iterator[str]:
+        yield json.dumps({
+            'ruota': label, 'combinazioni': result.combinations, 'estrazioni': result.draws,
+            'numeri_per_combinazione': result.combination_size,
+            'punti': {HIT_NAMES[hits]: count for hits, count in enumerate(result.hit_counts)},
+            'estrazioni_vincenti': {HIT_NAMES[hits]: result.winning_draws(hits)
+                                    for hits in range(1, len(result.hit_counts))},
+        })
+
+    def simulation(self, result: SimulationResult) -> Iterator[str]:
+        yield json.dumps({
+            'estrazioni': result.draws, 'combinazioni': result.combinations,
+            'numeri_per_combinazione': result.combination_size, 'sorte': HIT_NAMES[result.sorte],
+            'costo': result.cost,
+            'probabilita': {HIT_NAMES[hits]: {'stima': result.hit_probability(hits),
+                                              'intervallo_95': list(result.hit_interval(hits))}
+                            for hits in range(1, len(result.best_counts))},
+            'resa_per_euro': {'stima': result.expected_return,
+                              'intervallo_95': list(result.return_interval())},
+        })
+
+    def timing(self, summary: Dict[str, Dict[str, float]]) -> Iterator[str]:
+        yield json.dumps(summary)
+
+    def error(self, message: str) -> str:
+        return json.dumps({'errore': message})
+
+    @staticmethod
+    def _statistics_document(statistics: WheelStatistics) -> Dict:
+        return {
+            'ruota': statistics.wheel,
+            'piu_frequenti': [[num, count] for num, count in statistics.most_common],
+            'meno_frequenti': [[num, count] for num, count in statistics.least_common],
+            'numeri_analizzati': statistics.total_numbers,
+            'estrazioni_analizzate': statistics.total_draws,
+        }
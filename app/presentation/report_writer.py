@@ -0,0 +1,134 @@
+# app/presentation/report_writer.py
+import html
+import json
+import os
+from typing import Any, Dict, Iterator, Optional
+from models.report import Report, WheelReport
+
+REPORT_FORMATS = ('html', 'json', 'markdown')
+EXTENSIONS = {'.html': 'html', '.htm': 'html', '.json': 'json', '.md': 'markdown', '.markdown': 'markdown'}
+
+HTML_STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin-bottom: 1em; }
+td, th { border: 1px solid #ccc; padding: 0.2em 0.6em; text-align: left; }
+.chart td { border: none; padding: 0 0.4em; }
+.bar { background: #3a7bd5; height: 0.8em; }
+"""
+
+class ReportWriter:
+    """Scrive un Report su file in HTML, JSON o Markdown"""
+
+    CHART_WIDTH = 40  # Caratteri della barra più lunga nel Markdown
+
+    def write(self, report: Report, path: str, report_format: Optional[str] = None) -> str:
+        """
+        Scrive il report.
+
+        Args:
+            path: File di destinazione
+            report_format: 'html', 'json' o 'markdown' (default: dall'estensione del file)
+
+        Returns:
+            str: Formato usato
+        """
+        report_format = report_format or self.detect_format(path)
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Formato del report '{report_format}' non valido. "
+                             f"Formati validi: {', '.join(REPORT_FORMATS)}")
+
+        with open(path, 'w', encoding='utf-8') as f:
+            if report_format == 'json':
+                json.dump(self.to_dict(report), f, ensure_ascii=False, indent=2)
+            else:
+                lines = self.html(report) if report_format == 'html' else self.markdown(report)
+                for line in lines:
+                    f.write(line + "\n")
+        return report_format
+
+    @staticmethod
+    def detect_format(path: str) -> str:
+        """Formato del report in base all'estensione del file"""
+        report_format = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if report_format is None:
+            raise ValueError(f"Estensione del report non riconosciuta per '{path}': usa .html, .json o .md")
+        return report_format
+
+    @staticmethod
+    def to_dict(report: Report) -> Dict[str, Any]:
+        return {
+            'data': report.date,
+            'versione': report.version,
+            'finestra': report.window,
+            'secondi': round(report.elapsed, 4),
+            'ruote': [{
+                'ruota': section.wheel,
+                'estrazioni': section.statistics.total_draws,
+                'ultima_estrazione': section.last_date,
+                'predizione': section.prediction,
+                'piu_frequenti': [list(item) for item in section.statistics.most_common],
+                'meno_frequenti': [list(item) for item in section.statistics.least_common],
+                'ritardi': [list(item) for item in section.delays],
+                'frequenze': {str(num): count for num, count in enumerate(section.counts) if num},
+            } for section in report.wheels]
+        }
+
+    @staticmethod
+    def _numbers(pairs) -> str:
+        return ", ".join(f"{num:02d}({value})" for num, value in pairs)
+
+    def markdown(self, report: Report) -> Iterator[str]:
+        yield f"# Report Lotto - {report.date}"
+        yield ""
+        yield f"{report.window}, versione dei dati {report.version}."
+        for section in report.wheels:
+            yield ""
+            yield f"## {section.wheel}"
+            yield ""
+            yield "| | |"
+            yield "|---|---|"
+            for label, value in self._summary(section):
+                yield f"| {label} | {value} |"
+            peak = max(section.counts[1:]) or 1
+            yield ""
+            yield "```"
+            for num in range(1, 91):
+                count = section.counts[num]
+                yield f"{num:02d} |{'█' * int(count / peak * self.CHART_WIDTH)} ({count})"
+            yield "```"
+
+    def html(self, report: Report) -> Iterator[str]:
+        title = html.escape(f"Report Lotto - {report.date}")
+        yield "<!DOCTYPE html>"
+        yield f"<html lang=\"it\"><head><meta charset=\"utf-8\"><title>{title}</title>"
+        yield f"<style>{HTML_STYLE}</style></head><body>"
+        yield f"<h1>{title}</h1>"
+        yield f"<p>{html.escape(report.window)}, versione dei dati {report.version}.</p>"
+        for section in report.wheels:
+            yield f"<h2>{html.escape(section.wheel)}</h2>"
+            yield "<table>"
+            for label, value in self._summary(section):
+                yield f"<tr><th>{html.escape(label)}</th><td>{html.escape(str(value))}</td></tr>"
+            yield "</table>"
+            peak = max(section.counts[1:]) or 1
+            yield "<table class=\"chart\">"
+            for num in range(1, 91):
+                count = section.counts[num]
+                width = count / peak * 100
+                yield (f"<tr><td>{num:02d}</td><td style=\"width:20em\">"
+                       f"<div class=\"bar\" style=\"width:{width:.1f}%\"></div></td><td>{count}</td></tr>")
+            yield "</table>"
+        yield "</body></html>"
+
+    def _summary(self, section: WheelReport):
+        statistics = section.statistics
+        prediction = ("-" if section.prediction is None
+                      else " ".join(f"{num:02d}" for num in section.prediction))
+        return [
+            ("Predizione", prediction),
+            ("Estrazioni analizzate", statistics.total_draws),
+            ("Ultima estrazione", section.last_date or "-"),
+            ("Numeri più frequenti", self._numbers(statistics.most_common)),
+            ("Numeri meno frequenti", self._numbers(statistics.least_common)),
+            ("Ritardi maggiori", self._numbers(section.delays)),
+        ]
@@ -0,0 +1,132 @@
+from typing import List, Optional, Tuple
+import numpy as np
+from models.history_store import HistoryStore
+from models.statistics import CorrelatedPair
+from utils.bitmask import MASK_BYTES, numbers_to_packed, unpack_presence
+from utils.timing import timed
+
+class CrossWheelAnalyzer:
+    """
+    Analisi delle relazioni tra numeri di ruote diverse nella stessa data.
+
+    Le ruote vengono allineate per data in un tensore di presenza
+    (date, ruote, 90) memorizzato come bit impacchettati (12 byte per
+    ruota e data). Co-occorrenze e correlazioni sono calcolate con prodotti
+    matriciali su blocchi di date, quindi la memoria resta limitata anche
+    su storici molto lunghi.
+    """
+
+    def __init__(self, store: HistoryStore, chunk_dates: int = 8192):
+        self.wheels = list(store)
+        self.chunk_dates = chunk_dates
+        self.dates, self.presence, self.drawn = self._build_presence(store)
+        self._co_occurrence: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._correlation: Optional[np.ndarray] = None
+
+    @timed("CrossWheelAnalyzer.build_presence")
+    def _build_presence(self, store: HistoryStore) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Allinea le estrazioni per data.
+
+        Returns:
+            Tuple: date ordinate (D,), presenza impacchettata (D, ruote, 12) uint8
+                   e ruote estratte per data (D, ruote) bool
+        """
+        dates = np.unique(store.dates)
+        rows = np.searchsorted(dates, store.dates)
+        wheels = store.wheel_indices()
+
+        presence = np.zeros((len(dates), len(self.wheels), MASK_BYTES), dtype=np.uint8)
+        drawn = np.zeros((len(dates), len(self.wheels)), dtype=bool)
+        for begin in range(0, store.total_draws, self.chunk_dates * len(self.wheels)):
+            chunk = slice(begin, begin + self.chunk_dates * len(self.wheels))
+            presence[rows[chunk], wheels[chunk]] = numbers_to_packed(store.numbers[chunk])
+        drawn[rows, wheels] = True
+        return dates, presence, drawn
+
+    @property
+    def size(self) -> int:
+        """Numero di coppie (ruota, numero): righe e colonne delle matrici"""
+        return len(self.wheels) * 90
+
+    def _iter_presence(self):
+        """Espande il tensore a blocchi di date in matrici (date, ruote * 90)"""
+        for begin in range(0, len(self.dates), self.chunk_dates):
+            block = unpack_presence(self.presence[begin:begin + self.chunk_dates])
+            yield (block.reshape(len(block), self.size).astype(np.float32),
+                   self.drawn[begin:begin + self.chunk_dates].astype(np.float32))
+
+    @timed("CrossWheelAnalyzer.co_occurrence")
+    def co_occurrence(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Conta le uscite congiunte di ogni coppia (ruota, numero).
+
+        Returns:
+            Tuple: co-occorrenze (K, K), uscite di ogni (ruota, numero) nelle date
+                   in cui ciascuna ruota è stata estratta (K, ruote), e date in comune
+                   per ogni coppia di ruote (ruote, ruote). K = ruote * 90
+        """
+        if self._co_occurrence is None:
+            wheel_count = len(self.wheels)
+            counts = np.zeros((self.size, self.size), dtype=np.float64)
+            margins = np.zeros((self.size, wheel_count), dtype=np.float64)
+            shared = np.zeros((wheel_count, wheel_count), dtype=np.float64)
+            # I blocchi float32 restano esatti: ogni somma parziale è < 2^24
+            for block, drawn in self._iter_presence():
+                counts += block.T @ block
+                margins += block.T @ drawn
+                shared += drawn.T @ drawn
+            self._co_occurrence = (counts.astype(np.int64), margins.astype(np.int64),
+                                   shared.astype(np.int64))
+        return self._co_occurrence
+
+    @timed("CrossWheelAnalyzer.correlation")
+    def correlation(self) -> np.ndarray:
+        """
+        Coefficiente phi tra ogni coppia di (ruota, numero).
+
+        Ogni coppia è valutata solo sulle date in cui entrambe le ruote
+        sono state estratte.
+        """
+        if self._correlation is None:
+            counts, margins, shared = self.co_occurrence()
+            wheel_of = np.repeat(np.arange(len(self.wheels)), 90)
+
+            total = shared[wheel_of[:, None], wheel_of[None, :]].astype(np.float64)
+            first = margins[:, wheel_of].astype(np.float64)
+            second = first.T
+            numerator = total * counts - first * second
+            denominator = np.sqrt(first * (total - first) * second * (total - second))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                phi = np.where(denominator > 0, numerator / denominator, 0.0)
+            self._correlation = phi
+        return self._correlation
+
+    def strongest_pairs(self, top: int = 10) -> List[CorrelatedPair]:
+        """Restituisce le coppie di ruote diverse con la correlazione più alta"""
+        if top <= 0:
+            raise ValueError("Il numero di coppie deve essere positivo")
+
+        counts, margins, shared = self.co_occurrence()
+        phi = self.correlation()
+        wheel_of = np.repeat(np.arange(len(self.wheels)), 90)
+
+        # Solo coppie tra ruote diverse, ognuna una sola volta
+        candidates = np.where(wheel_of[:, None] < wheel_of[None, :], phi, -np.inf).ravel()
+        top = min(top, int(np.isfinite(candidates).sum()))
+        best = np.argpartition(-candidates, top - 1)[:top] if top else np.array([], dtype=np.intp)
+        best = best[np.argsort(-candidates[best], kind='stable')]
+
+        pairs = []
+        for flat in best:
+            first, second = divmod(int(flat), self.size)
+            wheel_a, wheel_b = wheel_of[first], wheel_of[second]
+            total = shared[wheel_a, wheel_b]
+            expected = margins[first, wheel_b] * margins[second, wheel_a] / total if total else 0.0
+            pairs.append(CorrelatedPair(
+                wheel_a=self.wheels[wheel_a], number_a=first % 90 + 1,
+                wheel_b=self.wheels[wheel_b], number_b=second % 90 + 1,
+                together=int(counts[first, second]), expected=float(expected),
+                correlation=float(phi[first, second])
+            ))
+        return pairs
@@ -0,0 +1,67 @@
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+class FileWatcher:
+    """
+    Controlla periodicamente un file e invoca una callback quando cambia.
+
+    Il controllo confronta data di modifica (in nanosecondi) e dimensione,
+    quindi costa una sola stat per intervallo. La callback viene eseguita nel
+    thread del watcher: finché non termina, il file non viene ricontrollato.
+    """
+
+    def __init__(self, path: str, callback: Callable[[], None], interval: float = 2.0):
+        if interval <= 0:
+            raise ValueError("L'intervallo di controllo deve essere positivo")
+        self.path = path
+        self.callback = callback
+        self.interval = interval
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None  # File assente o in fase di sostituzione
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self) -> bool:
+        """
+        Confronta il file con l'ultimo stato visto e invoca la callback se è cambiato.
+
+        Returns:
+            bool: True se il file è cambiato
+        """
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        self.callback()
+        return True
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Avvia il controllo in un thread daemon"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"FileWatcher({self.path})",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Ferma il controllo attendendo la fine dell'eventuale callback in corso"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
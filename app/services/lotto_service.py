@@ -1,67 +1,477 @@
-from typing import List, Tuple, Dict
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple, Dict, Optional
+import numpy as np
 import pandas as pd
 from config import Config
 from data.data_loader import DataLoader
+from models.history_store import (HistoryStore, SharedHistory, SharedHistoryHandle, WheelHistory,
+                                  yyyymmdd_to_datetime64)
+from models.report import Report
+from models.statistics import CorrelatedPair, WheelStatistics, statistics_from_counts
+from models.tuning import TuningResult
+from services.cross_wheel_analyzer import CrossWheelAnalyzer
+from services.file_watcher import FileWatcher
+from services.report_builder import ReportBuilder
+from services.transition_analyzer import TransitionAnalyzer
+from predictors.compiled_tree_predictor import CompiledTreePredictor
 from predictors.predictor_interface import PredictorInterface
 from predictors.predictor_factory import PredictorFactory
+from utils.rwlock import ReadWriteLock
+from utils.timing import timed, timer
+
+@dataclass(frozen=True)
+class ServiceSnapshot:
+    """
+    Stato coerente del servizio: storico, predittore e versione.
+
+    Ogni richiesta legge lo snapshot una sola volta e lavora solo su quello,
+    quindi un ricaricamento concorrente non può mescolare dati di versioni diverse.
+    """
+    version: int
+    history: HistoryStore
+    predictor: Optional[PredictorInterface]
 
 class LottoService:
+    """
+    Servizio di predizione e statistiche condivisibile tra thread.
+
+    Le letture usano lo snapshot corrente senza lock: ogni richiesta lo legge
+    una volta sola. Ricaricamenti e riaddestramenti preparano il nuovo
+    snapshot fuori da ogni lock, uno alla volta, e lo pubblicano con il lock
+    in scrittura; chi ha bisogno che la versione non cambi per un gruppo di
+    richieste usa pinned(), che tiene il lock in lettura.
+    """
+
     def __init__(self, config: Config):
         self.config = config
         self.data_loader = DataLoader(config)
-        self.predictor: PredictorInterface = None
-        self.historical_data: Dict = {}
+        # Versione incrementata a ogni ricaricamento dello storico: invalida le cache derivate
+        self._snapshot = ServiceSnapshot(0, HistoryStore.empty(config.RUOTE), None)
+        self._predictor_type: Optional[str] = None
+        # Predittore caricato da un albero esportato: i ricaricamenti non riaddestrano
+        self._inference_only = False
+        # Predittore creato da initialize_predictor(), usato dal primo addestramento
+        self._initialized: Optional[PredictorInterface] = None
+        # Lettori: pinned(); scrittori: pubblicazione di un nuovo snapshot
+        self._lock = ReadWriteLock()
+        # Serializza le ricostruzioni (ricarica, riaddestramento, tuning)
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[FileWatcher] = None
+        self.last_reload_error: Optional[str] = None
+        self.transition_analyzer = TransitionAnalyzer()
+        self._cross_wheel: Optional[Tuple[int, CrossWheelAnalyzer]] = None
+        # Storici in memoria condivisa per versione: [copia, utilizzatori attivi]
+        self._shared: Dict[int, List] = {}
+        self._shared_lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> ServiceSnapshot:
+        """Stato corrente (la lettura è atomica: lo scambio è un'unica assegnazione)"""
+        return self._snapshot
+
+    @property
+    def predictor(self) -> Optional[PredictorInterface]:
+        return self._snapshot.predictor
+
+    @property
+    def historical_data(self) -> HistoryStore:
+        return self._snapshot.history
+
+    @property
+    def data_version(self) -> int:
+        return self._snapshot.version
 
     def initialize_predictor(self, predictor_type: str) -> None:
-        self.predictor = PredictorFactory.create_predictor(predictor_type)
+        """
+        Crea il predittore; il primo train_model() o reload() addestra proprio
+        questo, i successivi ne creano uno nuovo per non toccare quello pubblicato.
 
-    def prepare_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        Con 'compiled_tree', se Config.COMPILED_TREE_FILE esiste già, l'albero
+        esportato viene caricato pronto all'uso: il servizio resta di sola
+        inferenza, non importa scikit-learn e a ogni ricaricamento rilegge il
+        file invece di riaddestrare.
+        """
+        self._inference_only = (predictor_type.lower() == "compiled_tree"
+                                and os.path.exists(self.config.COMPILED_TREE_FILE))
+        if self._inference_only:
+            predictor = CompiledTreePredictor.load(self.config.COMPILED_TREE_FILE)
+        else:
+            predictor = PredictorFactory.create_predictor(predictor_type, self.config.TUNING_FILE,
+                                                         self.config.COMPILED_TREE_FILE)
+        self._predictor_type = predictor_type
+        self._initialized = predictor
+        with self._lock.write():
+            current = self._snapshot
+            self._snapshot = ServiceSnapshot(current.version, current.history, predictor)
+
+    def _publish(self, history: HistoryStore, predictor: Optional[PredictorInterface]) -> int:
+        """Sostituisce atomicamente lo snapshot con una nuova versione"""
+        with self._lock.write():
+            version = self._snapshot.version + 1
+            self._snapshot = ServiceSnapshot(version, history, predictor)
+        self._release_shared()
+        return version
+
+    @contextmanager
+    def shared_history(self, snapshot: Optional[ServiceSnapshot] = None) -> Iterator[SharedHistoryHandle]:
+        """
+        Storico in memoria condivisa per i processi worker.
+
+        La copia viene creata alla prima richiesta per una versione e riusata
+        dalle successive; resta disponibile finché il blocco è aperto e viene
+        liberata quando la versione non è più quella corrente e nessuno la usa.
+        I worker si collegano con handle.attach() senza copiare i dati.
+
+        Args:
+            snapshot: Versione da condividere (default: quella corrente)
+        """
+        snapshot = snapshot or self._snapshot
+        with self._shared_lock:
+            entry = self._shared.get(snapshot.version)
+            if entry is None:
+                entry = self._shared[snapshot.version] = [SharedHistory(snapshot.history), 0]
+            entry[1] += 1
+        try:
+            yield entry[0].handle
+        finally:
+            with self._shared_lock:
+                entry[1] -= 1
+            self._release_shared()
+
+    def _release_shared(self, everything: bool = False) -> None:
+        """Libera le copie condivise delle versioni superate non più in uso"""
+        current = self._snapshot.version
+        with self._shared_lock:
+            for version, (shared, users) in list(self._shared.items()):
+                if users == 0 and (everything or version != current):
+                    shared.close()
+                    del self._shared[version]
+
+    def close(self) -> None:
+        """Ferma il controllo del file dati e libera la memoria condivisa non in uso"""
+        self.stop_watching()
+        self._release_shared(everything=True)
+
+    @timed("LottoService.load_frame")
+    def _load_frame(self) -> Tuple[HistoryStore, pd.DataFrame, pd.DataFrame]:
+        """Legge il CSV e costruisce storico, feature e target senza pubblicarli"""
         df = self.data_loader.load_data()
         df = self.data_loader.preprocess_data(df)
-
-        # Salva i dati storici per ruota
-        self._prepare_historical_data(df)
+        history = self._build_history(df)
 
         X = df.drop(columns=['n1','n2','n3','n4','n5'])
         y = df.drop(columns=['data', 'ruota'])
 
+        return history, X, y
+
+    @contextmanager
+    def pinned(self) -> Iterator[ServiceSnapshot]:
+        """
+        Blocca la pubblicazione di nuove versioni finché il blocco è aperto.
+
+        I ricaricamenti continuano a prepararsi in background e pubblicano
+        appena l'ultimo lettore esce; nel frattempo i nuovi pinned() attendono
+        lo scrittore, che quindi non resta mai bloccato a lungo. Il lock non è
+        rientrante: dentro il blocco non vanno annidati altri pinned() né reload().
+        """
+        with self._lock.read():
+            yield self._snapshot
+
+    @timed("LottoService.prepare_data")
+    def prepare_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Feature e target letti dal CSV, senza pubblicare nulla.
+
+        Lo snapshot cambia solo con reload() e append_extractions(), che
+        pubblicano storico e modello insieme.
+        """
+        _, X, y = self._load_frame()
         return X, y
 
-    def _prepare_historical_data(self, df: pd.DataFrame) -> None:
+    @timed("LottoService.prepare_historical_data")
+    def _build_history(self, df: pd.DataFrame) -> HistoryStore:
         """Prepara i dati storici organizzati per ruota"""
-        for wheel_name, ruota_code in self.config.RUOTE.items():
-            ruota_data = df[df['ruota'] == ruota_code]
-            self.historical_data[wheel_name] = [
-                [row['n1'], row['n2'], row['n3'], row['n4'], row['n5']]
-                for _, row in ruota_data.iterrows()
-            ]
+        return HistoryStore.from_dataframe(df, self.config.RUOTE)
 
     def train_model(self) -> None:
         if not self.predictor:
             raise ValueError("Predictor not initialized")
 
+        self.reload()
+
+    def reload(self) -> int:
+        """
+        Ricarica il CSV, riaddestra un nuovo predittore e pubblica entrambi insieme.
+
+        In sola inferenza il predittore viene ricaricato dall'ultimo albero
+        esportato, senza addestramento.
+
+        Le richieste in corso terminano sulla versione precedente; le nuove
+        vedono la nuova versione appena viene pubblicata, senza attese.
+
+        Returns:
+            int: Versione pubblicata
+        """
+        if self._predictor_type is None:
+            raise ValueError("Predictor not initialized")
+
+        with self._reload_lock:
+            history, X, y = self._load_frame()
+            predictor, self._initialized = self._initialized, None
+            if self._inference_only:
+                predictor = predictor or CompiledTreePredictor.load(self.config.COMPILED_TREE_FILE)
+                return self._publish(history, predictor)
+            predictor = predictor or PredictorFactory.create_predictor(
+                self._predictor_type, self.config.TUNING_FILE, self.config.COMPILED_TREE_FILE)
+            with timer("Predictor.train"):
+                predictor.train(X, y)
+            return self._publish(history, predictor)
+
+    @timed("LottoService.append_extractions")
+    def append_extractions(self, df: pd.DataFrame) -> int:
+        """
+        Aggiunge nuove estrazioni allo storico senza rileggere il CSV.
+
+        Lo storico corrente viene esteso in coda, compresi i conteggi
+        cumulativi già costruiti; il modello resta quello in uso fino al
+        prossimo ricaricamento.
+
+        Args:
+            df: Estrazioni nel formato del CSV (data, ruota, n1..n5)
+
+        Returns:
+            int: Versione pubblicata
+        """
+        df = self.data_loader.preprocess_data(df)
+        with self._reload_lock:
+            current = self._snapshot
+            return self._publish(current.history.append(df, self.config.RUOTE), current.predictor)
+
+    def start_watching(self, interval: Optional[float] = None) -> None:
+        """
+        Avvia il controllo di Config.CSV_FILE: a ogni modifica il dataset viene
+        ricaricato e il modello riaddestrato in un thread in background.
+        """
+        if self._watcher is None:
+            self._watcher = FileWatcher(self.config.CSV_FILE, self._background_reload,
+                                        interval or self.config.RELOAD_INTERVAL)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Ferma il controllo del file dati"""
+        if self._watcher is not None:
+            self._watcher.stop()
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None and self._watcher.running
+
+    def _background_reload(self) -> None:
+        """Ricaricamento dal watcher: in caso di errore resta in uso la versione precedente"""
+        try:
+            self.reload()
+            self.last_reload_error = None
+        except Exception as e:
+            # Es. file letto mentre viene riscritto: la prossima modifica riprova
+            self.last_reload_error = str(e)
+
+    def tune(self, folds: int = 5, workers: Optional[int] = None,
+             grid: Optional[Dict[str, List]] = None) -> TuningResult:
+        """
+        Cerca gli iperparametri migliori del DecisionTreePredictor e li salva.
+
+        La configurazione viene scritta in Config.TUNING_FILE e usata da
+        PredictorFactory alla successiva inizializzazione del predittore.
+
+        Args:
+            folds: Numero di fold temporali
+            workers: Processi paralleli (default: numero di core)
+            grid: Valori da provare per ogni parametro (default: DEFAULT_GRID)
+        """
+        from predictors.hyperparameter_tuner import HyperparameterTuner
+
         X, y = self.prepare_data()
-        self.predictor.train(X, y)
+        tuner = HyperparameterTuner(folds, workers, self.config.TUNING_CACHE_DIR)
+        result = tuner.search(X, y, grid)
+        tuner.save_best(result, self.config.TUNING_FILE)
+        return result
 
-    def predict(self, date: str, wheel: str) -> Tuple[List[int], Dict]:
+    def predict(self, date: str, wheel: str,
+                snapshot: Optional[ServiceSnapshot] = None) -> Tuple[List[int], WheelHistory]:
         """
         Effettua una predizione per una data e ruota specifiche
 
         Args:
             date: Data in formato YYYYMMDD
             wheel: Codice della ruota (es. 'MI', 'RO', etc.)
+            snapshot: Versione da usare (default: quella corrente)
 
         Returns:
-            Tuple[List[int], Dict]: Lista dei numeri predetti e dati storici della ruota
+            Tuple[List[int], WheelHistory]: Lista dei numeri predetti e dati storici della ruota
         """
-        if not self.predictor:
+        snapshot = snapshot or self._snapshot
+        if not snapshot.predictor:
             raise ValueError("Predictor not initialized")
 
+        wheel_upper = self._normalize_wheel(wheel)
+        wheel_code = self.config.RUOTE[wheel_upper]
+        with timer("Predictor.predict"):
+            prediction = snapshot.predictor.predict([date, wheel_code])
+
+        return prediction, snapshot.history[wheel_upper]
+
+    def get_history(self, wheel: str, start: Optional[str] = None, end: Optional[str] = None,
+                    last: Optional[int] = None,
+                    snapshot: Optional[ServiceSnapshot] = None) -> WheelHistory:
+        """
+        Restituisce lo storico di una ruota, eventualmente limitato a una finestra.
+
+        Args:
+            wheel: Codice della ruota (es. 'MI', 'RO', etc.)
+            start: Data iniziale inclusa in formato YYYYMMDD
+            end: Data finale inclusa in formato YYYYMMDD
+            last: Numero di estrazioni più recenti da considerare
+            snapshot: Versione da usare (default: quella corrente)
+
+        Returns:
+            WheelHistory: Vista sulle estrazioni della finestra richiesta
+        """
+        history = (snapshot or self._snapshot).history[self._normalize_wheel(wheel)]
+
+        if start is not None or end is not None:
+            history = history.between(*self._parse_window(start, end))
+
+        if last is not None:
+            history = history.last(last)
+
+        return history
+
+    @timed("LottoService.stats_all")
+    def stats_all(self, start: Optional[str] = None, end: Optional[str] = None,
+                  last: Optional[int] = None,
+                  snapshot: Optional[ServiceSnapshot] = None) -> Dict[str, WheelStatistics]:
+        """
+        Calcola le statistiche di tutte le ruote in un unico passaggio vettorizzato.
+
+        Args:
+            start: Data iniziale inclusa in formato YYYYMMDD
+            end: Data finale inclusa in formato YYYYMMDD
+            last: Numero di estrazioni più recenti da considerare per ruota
+            snapshot: Versione da usare (default: quella corrente)
+
+        Returns:
+            Dict[str, WheelStatistics]: Statistiche per ruota, nell'ordine di Config.RUOTE
+        """
+        store = (snapshot or self._snapshot).history
+        mask = None
+        if start is not None or end is not None or last is not None:
+            mask = store.row_mask(*self._parse_window(start, end), last=last)
+
+        counts, draws = store.frequency_matrix(mask)
+        return {
+            wheel: statistics_from_counts(wheel, counts[index], draws[index])
+            for index, wheel in enumerate(store)
+        }
+
+    def recent_frequencies(self, wheel: str, last: int,
+                           snapshot: Optional[ServiceSnapshot] = None) -> Tuple[np.ndarray, int]:
+        """
+        Frequenze dei numeri nelle ultime `last` estrazioni di una ruota.
+
+        Usa i conteggi cumulativi dello storico: dopo la prima richiesta per
+        la ruota ogni finestra costa una sottrazione di due righe.
+
+        Args:
+            wheel: Codice della ruota (es. 'MI', 'RO', etc.)
+            last: Numero di estrazioni più recenti da considerare
+            snapshot: Versione da usare (default: quella corrente)
+
+        Returns:
+            Tuple: uscite per numero (91,) ed estrazioni effettivamente considerate
+        """
+        prefix = (snapshot or self._snapshot).history.prefix_counts(self._normalize_wheel(wheel))
+        return prefix.last(last), min(last, len(prefix))
+
+    def report(self, date: str, last: Optional[int] = None, workers: Optional[int] = None,
+               snapshot: Optional[ServiceSnapshot] = None) -> Report:
+        """
+        Report di tutte le ruote: statistiche, frequenze, ritardi e predizione.
+
+        Le sezioni per ruota vengono calcolate in parallelo su più processi,
+        tutte sulla stessa versione del dataset.
+
+        Args:
+            date: Data della predizione in formato YYYYMMDD
+            last: Considera solo le ultime N estrazioni di ogni ruota
+            workers: Processi paralleli (default: numero di core)
+            snapshot: Versione da usare (default: quella corrente)
+        """
+        snapshot = snapshot or self._snapshot
+        predictions: Dict[str, List[int]] = {}
+        if snapshot.predictor:
+            for wheel in snapshot.history:
+                try:
+                    predictions[wheel] = self.predict(date, wheel, snapshot)[0]
+                except ValueError:
+                    # Es. ruota senza estrazioni per il predittore Markov: sezione senza predizione
+                    pass
+        builder = ReportBuilder(workers)
+        if builder.workers_for(snapshot.history) == 1:
+            return builder.build(snapshot.history, date, snapshot.version, predictions, last)
+        with self.shared_history(snapshot) as shared:
+            return builder.build(snapshot.history, date, snapshot.version, predictions, last, shared)
+
+    def followers(self, wheel: str, number: int, top: int = 10) -> Tuple[List[Tuple[int, int, float]], int]:
+        """
+        Restituisce i numeri che più spesso escono nell'estrazione successiva a `number`.
+
+        Args:
+            wheel: Codice della ruota (es. 'MI', 'RO', etc.)
+            number: Numero di partenza (1-90)
+            top: Quanti numeri restituire
+
+        Returns:
+            Tuple: lista di (numero, volte, frequenza) e uscite di `number` considerate
+        """
+        transitions, occurrences = self.transition_matrix(wheel)
+        return (TransitionAnalyzer.followers(transitions, occurrences, number, top),
+                int(occurrences[number]) if 1 <= number <= 90 else 0)
+
+    def transition_matrix(self, wheel: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Matrice di transizione (91, 91) della ruota, in cache per versione del dataset"""
+        wheel_upper = self._normalize_wheel(wheel)
+        snapshot = self._snapshot
+        return self.transition_analyzer.matrix(
+            snapshot.history[wheel_upper].numbers, wheel_upper, snapshot.version)
+
+    def correlations(self, top: int = 10) -> List[CorrelatedPair]:
+        """
+        Restituisce le coppie di numeri su ruote diverse più correlate.
+
+        L'analizzatore viene ricostruito solo quando cambia la versione del dataset.
+        """
+        snapshot = self._snapshot
+        cached = self._cross_wheel
+        if cached is None or cached[0] != snapshot.version:
+            cached = (snapshot.version, CrossWheelAnalyzer(snapshot.history))
+            self._cross_wheel = cached
+        return cached[1].strongest_pairs(top)
+
+    @staticmethod
+    def _parse_window(start: Optional[str], end: Optional[str]) -> Tuple[Optional[np.datetime64], Optional[np.datetime64]]:
+        """Converte gli estremi YYYYMMDD in date e ne verifica l'ordine"""
+        start_date = yyyymmdd_to_datetime64([start])[0] if start else None
+        end_date = yyyymmdd_to_datetime64([end])[0] if end else None
+        if start_date is not None and end_date is not None and start_date > end_date:
+            raise ValueError("La data iniziale deve precedere la data finale")
+        return start_date, end_date
+
+    def _normalize_wheel(self, wheel: str) -> str:
+        """Valida il codice ruota e lo normalizza (RM -> RO)"""
         wheel_upper = wheel.upper().replace('RM', 'RO')
         if wheel_upper not in self.config.RUOTE:
             raise ValueError(f"Ruota non valida: {wheel}. Ruote valide: {', '.join(self.config.RUOTE.keys())}")
-
-        wheel_code = self.config.RUOTE[wheel_upper]
-        prediction = self.predictor.predict([date, wheel_code])
-
-        return prediction, self.historical_data.get(wheel_upper, [])
\ No newline at end of file
+        return wheel_upper
\ No newline at end of file
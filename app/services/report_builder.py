@@ -0,0 +1,123 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+import numpy as np
+from models.history_store import HistoryStore, SharedHistory, SharedHistoryHandle
+from models.report import Report, WheelReport
+from models.statistics import statistics_from_counts
+from utils.timing import timed
+
+# Storico dei processi worker: viste sulla memoria condivisa, collegate dall'initializer
+_worker_block: Optional[shared_memory.SharedMemory] = None
+_worker_history: Optional[HistoryStore] = None
+
+def _init_worker(handle: SharedHistoryHandle) -> None:
+    global _worker_block, _worker_history
+    _worker_block, _worker_history = handle.attach()
+
+def _build_worker_section(wheel: str, last: Optional[int], top: int) -> WheelReport:
+    return wheel_section(_worker_history, wheel, last, top)
+
+def number_delays(numbers: np.ndarray) -> np.ndarray:
+    """
+    Ritardo di ogni numero: estrazioni consecutive, a partire dall'ultima,
+    in cui non è uscito (len(numbers) se non è mai uscito).
+
+    Returns:
+        np.ndarray: Ritardi (91,) indicizzati per numero
+    """
+    last_seen = np.full(91, -1, dtype=np.int64)
+    rows = np.repeat(np.arange(len(numbers), dtype=np.int64), numbers.shape[1])
+    np.maximum.at(last_seen, numbers.ravel().astype(np.intp), rows)
+    return len(numbers) - 1 - last_seen
+
+def wheel_section(history: HistoryStore, wheel: str, last: Optional[int] = None,
+                  top: int = 10) -> WheelReport:
+    """Statistiche, frequenze e ritardi di una ruota (ultime `last` estrazioni)"""
+    view = history[wheel] if last is None else history[wheel].last(last)
+    counts = np.bincount(view.numbers.ravel(), minlength=91)
+    delays = number_delays(view.numbers)
+    # Ritardi maggiori per primi, a parità il numero più basso
+    order = np.argsort(-delays[1:], kind='stable')[:top] + 1
+    return WheelReport(
+        wheel=wheel,
+        statistics=statistics_from_counts(wheel, counts, len(view)),
+        counts=counts.tolist(),
+        delays=[(int(num), int(delays[num])) for num in order],
+        last_date=str(view.dates[-1]) if len(view) else None
+    )
+
+class ReportBuilder:
+    """
+    Calcola le sezioni per ruota del report su più processi.
+
+    I processi si collegano allo storico in memoria condivisa tramite
+    l'initializer del pool; ogni richiesta porta solo il nome della ruota.
+    Avviare un processo costa più di una sezione su uno storico piccolo:
+    se il numero di processi non è indicato, ogni processo deve avere almeno
+    `min_draws_per_worker` estrazioni da analizzare, altrimenti le sezioni si
+    calcolano in linea. Un numero di processi esplicito viene sempre rispettato.
+    """
+
+    def __init__(self, workers: Optional[int] = None, top: int = 10,
+                 min_draws_per_worker: int = 500_000):
+        """
+        Args:
+            workers: Processi paralleli (default: numero di core, solo su storici grandi)
+            top: Numeri riportati nella classifica dei ritardi
+            min_draws_per_worker: Estrazioni minime per processo quando workers non è indicato
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("Il numero di processi deve essere positivo")
+        self.workers = workers or os.cpu_count() or 1
+        self.explicit_workers = workers is not None
+        self.top = top
+        self.min_draws_per_worker = min_draws_per_worker
+
+    def workers_for(self, history: HistoryStore) -> int:
+        """Processi che build() userebbe per lo storico (1: sezioni calcolate in linea)"""
+        if self.explicit_workers:
+            return max(1, min(self.workers, len(history)))
+        return max(1, min(self.workers, len(history),
+                          history.total_draws // max(self.min_draws_per_worker, 1)))
+
+    @timed("ReportBuilder.build")
+    def build(self, history: HistoryStore, date: str, version: int,
+              predictions: Optional[Dict[str, List[int]]] = None,
+              last: Optional[int] = None, shared: Optional[SharedHistoryHandle] = None) -> Report:
+        """
+        Costruisce il report di tutte le ruote dello storico.
+
+        Args:
+            history: Storico da analizzare
+            date: Data del report (come mostrata all'utente)
+            version: Versione del dataset da cui viene lo storico
+            predictions: Predizione per ruota, se disponibile
+            last: Considera solo le ultime N estrazioni di ogni ruota
+            shared: Copia di `history` già in memoria condivisa (default: ne
+                    crea una temporanea se servono processi)
+        """
+        if last is not None and last <= 0:
+            raise ValueError("Il numero di estrazioni deve essere positivo")
+
+        start = time.perf_counter()
+        wheels = list(history)
+        workers = self.workers_for(history)
+        if workers <= 1:
+            sections = [wheel_section(history, wheel, last, self.top) for wheel in wheels]
+        else:
+            with (nullcontext(None) if shared else SharedHistory(history)) as owned:
+                handle = shared or owned.handle
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(handle,)) as executor:
+                    sections = list(executor.map(_build_worker_section, wheels,
+                                                 [last] * len(wheels), [self.top] * len(wheels)))
+
+        for section in sections:
+            section.prediction = (predictions or {}).get(section.wheel)
+        return Report(date=date, version=version,
+                      window="Tutte le estrazioni" if last is None else f"Ultime {last} estrazioni",
+                      wheels=sections, elapsed=time.perf_counter() - start, workers=workers)
@@ -0,0 +1,68 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.history_store import WheelHistory
+from models.statistics import WheelStatistics
+from services.lotto_service import LottoService
+
+class ServiceExecutor:
+    """
+    Esegue predizioni e statistiche di un LottoService su un pool di thread.
+
+    Le richieste singole usano la versione corrente al momento in cui
+    partono; i metodi *_many fissano una sola versione per tutto il gruppo,
+    così i risultati restano confrontabili anche se nel frattempo arriva un
+    ricaricamento.
+    """
+
+    def __init__(self, service: LottoService, workers: Optional[int] = None):
+        """
+        Args:
+            service: Servizio condiviso tra i thread
+            workers: Thread del pool (default: quello di ThreadPoolExecutor)
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("Il numero di thread deve essere positivo")
+        self.service = service
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="LottoService")
+
+    def submit_predict(self, date: str, wheel: str) -> 'Future[Tuple[List[int], WheelHistory]]':
+        """Predizione in background per una data (YYYYMMDD) e una ruota"""
+        return self._pool.submit(self.service.predict, date, wheel)
+
+    def submit_stats_all(self, start: Optional[str] = None, end: Optional[str] = None,
+                         last: Optional[int] = None) -> 'Future[Dict[str, WheelStatistics]]':
+        """Statistiche di tutte le ruote in background"""
+        return self._pool.submit(self.service.stats_all, start, end, last)
+
+    def predict_many(self, requests: Iterable[Tuple[str, str]]) -> Tuple[int, List[Tuple[List[int], WheelHistory]]]:
+        """
+        Predizioni in parallelo per più coppie (data, ruota) sulla stessa versione.
+
+        Returns:
+            Tuple: versione usata e risultati nell'ordine delle richieste
+        """
+        with self.service.pinned() as snapshot:
+            futures = [self._pool.submit(self.service.predict, date, wheel, snapshot)
+                       for date, wheel in requests]
+            return snapshot.version, [future.result() for future in futures]
+
+    def stats_many(self, windows: Iterable[Dict[str, Optional[object]]]) -> Tuple[int, List[Dict[str, WheelStatistics]]]:
+        """
+        Statistiche in parallelo per più finestre (start/end/last) sulla stessa versione.
+
+        Returns:
+            Tuple: versione usata e risultati nell'ordine delle finestre
+        """
+        with self.service.pinned() as snapshot:
+            futures = [self._pool.submit(self.service.stats_all, snapshot=snapshot, **window)
+                       for window in windows]
+            return snapshot.version, [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self) -> 'ServiceExecutor':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
@@ -0,0 +1,52 @@
+import threading
+from typing import Dict, List, Tuple
+import numpy as np
+from models.transitions import top_followers, transition_counts
+from utils.timing import timed
+
+class TransitionAnalyzer:
+    """
+    Analisi "cosa esce dopo X": per una sequenza di estrazioni conta quante
+    volte il numero j è uscito nell'estrazione successiva a quella del numero i.
+
+    Il conteggio vive in models.transitions, usato anche dal MarkovPredictor;
+    qui le matrici vengono memorizzate per versione del dataset.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._cache: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    @timed("TransitionAnalyzer.compute")
+    def compute(numbers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Matrice di transizione di una sequenza di estrazioni (vedi transition_counts)"""
+        return transition_counts(numbers)
+
+    def matrix(self, numbers: np.ndarray, key: str, version: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Restituisce la matrice per `key`, ricalcolandola solo se il dataset è cambiato.
+
+        Il calcolo avviene fuori dal lock; il risultato entra in cache solo se
+        nel frattempo nessun thread è passato a un'altra versione.
+        """
+        with self._lock:
+            if version == self._version and key in self._cache:
+                return self._cache[key]
+
+        result = self.compute(numbers)
+        with self._lock:
+            # Le richieste su uno snapshot più vecchio non sovrascrivono la cache più recente
+            if self._version is None or version > self._version:
+                self._cache = {}
+                self._version = version
+            if version == self._version:
+                self._cache.setdefault(key, result)
+        return result
+
+    @staticmethod
+    def followers(transitions: np.ndarray, occurrences: np.ndarray, number: int,
+                  top: int = 10) -> List[Tuple[int, int, float]]:
+        """Numeri che più spesso seguono `number`: (numero, volte, frequenza)"""
+        return top_followers(transitions, occurrences, number, top)
@@ -2,5 +2,15 @@ from .system_interface import SystemInterface
 from .integral_system import IntegralSystem
 from .reduced_system import ReducedSystem
 from .guaranteed_system import GuaranteedSystem
+from .system_export import SystemExporter
+from .system_backtest import BacktestResult, SystemBacktester
+from .covering_library import CoveringLibrary
+from .cover_search import CoverSearch
+from .exact_cover import ExactCoverResult, ExactCoverSolver
+from .system_simulator import SimulationResult, SystemSimulator
+from .system_filters import SystemFilters
 
-__all__ = ['SystemInterface', 'IntegralSystem', 'ReducedSystem', 'GuaranteedSystem']
\ No newline at end of file
+__all__ = ['SystemInterface', 'IntegralSystem', 'ReducedSystem', 'GuaranteedSystem', 'SystemExporter',
+           'SystemBacktester', 'BacktestResult', 'CoveringLibrary', 'CoverSearch',
+           'ExactCoverSolver', 'ExactCoverResult', 'SystemSimulator', 'SimulationResult',
+           'SystemFilters']
\ No newline at end of file
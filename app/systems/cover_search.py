@@ -0,0 +1,145 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import numpy as np
+from utils.timing import timed
+from .covering_library import is_covering, subset_matrix
+
+class _AnnealingState:
+    """
+    Stato della ricerca locale per un numero fissato di combinazioni.
+
+    Per ogni gruppo di `condition` numeri tiene quante combinazioni lo
+    coprono: il costo da portare a zero è il numero di gruppi scoperti.
+    """
+
+    def __init__(self, targets: np.ndarray, blocks: np.ndarray, t: int):
+        self.targets = targets
+        self.t = t
+        self.blocks = [np.asarray(block, dtype=np.intp) for block in blocks]
+        self.hits = np.array([self._hits(block) for block in self.blocks]).reshape(len(self.blocks), -1)
+        self.coverage = self.hits.sum(axis=0, dtype=np.int32)
+
+    def _hits(self, block: np.ndarray) -> np.ndarray:
+        return self.targets[:, block].sum(axis=1) >= self.t
+
+    @property
+    def uncovered(self) -> int:
+        return int((self.coverage == 0).sum())
+
+    def remove_weakest(self, rng: np.random.Generator) -> None:
+        """Toglie la combinazione che copre da sola meno gruppi"""
+        unique = (self.hits & (self.coverage == 1)).sum(axis=1)
+        candidates = np.flatnonzero(unique == unique.min())
+        index = int(rng.choice(candidates))
+        self.coverage -= self.hits[index]
+        self.hits = np.delete(self.hits, index, axis=0)
+        del self.blocks[index]
+
+    def propose(self, rng: np.random.Generator):
+        """
+        Mossa: sceglie un gruppo scoperto e avvicina una combinazione a caso,
+        scambiando un suo numero con uno del gruppo.
+        """
+        target = np.flatnonzero(self.targets[int(rng.choice(np.flatnonzero(self.coverage == 0)))])
+        index = int(rng.integers(len(self.blocks)))
+        block = self.blocks[index]
+        outgoing = np.setdiff1d(block, target)
+        incoming = np.setdiff1d(target, block)
+        if outgoing.size == 0 or incoming.size == 0:
+            return None
+        new_block = np.sort(np.append(block[block != rng.choice(outgoing)], rng.choice(incoming)))
+        new_hits = self._hits(new_block)
+        old_hits = self.hits[index]
+        # Gruppi che restano scoperti perdendo l'unica copertura, meno quelli coperti ora
+        delta = int((old_hits & ~new_hits & (self.coverage == 1)).sum()
+                    - (new_hits & ~old_hits & (self.coverage == 0)).sum())
+        return index, new_block, new_hits, delta
+
+    def apply(self, index: int, block: np.ndarray, hits: np.ndarray) -> None:
+        self.coverage += hits.astype(np.int32) - self.hits[index]
+        self.hits[index] = hits
+        self.blocks[index] = block
+
+def anneal(v: int, k: int, t: int, condition: int, initial: np.ndarray, seconds: float,
+           seed: Optional[int] = None, temperature: float = 1.0, cooling: float = 0.999) -> np.ndarray:
+    """
+    Riduce una copertura valida con ricottura simulata fino allo scadere del tempo.
+
+    Ogni volta che la copertura torna valida viene salvata e si toglie la
+    combinazione meno utile; la ricerca prosegue con una combinazione in meno.
+
+    Returns:
+        np.ndarray: Copertura più piccola trovata, come indici (b, k)
+    """
+    rng = np.random.default_rng(seed)
+    deadline = time.monotonic() + seconds
+    state = _AnnealingState(subset_matrix(v, condition), initial, t)
+    best = np.array(initial, dtype=np.uint8).reshape(-1, k)
+    current_temperature = temperature
+
+    while time.monotonic() < deadline:
+        if state.uncovered == 0:
+            best = np.array(state.blocks, dtype=np.uint8).reshape(-1, k)
+            if len(state.blocks) == 1:
+                break
+            state.remove_weakest(rng)
+            current_temperature = temperature
+            continue
+
+        move = state.propose(rng)
+        if move is None:
+            continue
+        index, block, hits, delta = move
+        if delta <= 0 or rng.random() < math.exp(-delta / current_temperature):
+            state.apply(index, block, hits)
+        current_temperature = max(current_temperature * cooling, 0.05)
+
+    return best
+
+def _anneal_worker(v: int, k: int, t: int, condition: int, initial: np.ndarray,
+                   seconds: float, seed: int) -> np.ndarray:
+    return anneal(v, k, t, condition, initial, seconds, seed)
+
+class CoverSearch:
+    """
+    Ricerca randomizzata di coperture più piccole su più processi.
+
+    Ogni processo esegue la ricottura simulata con un seed diverso per lo
+    stesso tempo; alla fine viene tenuta la copertura valida più piccola.
+    """
+
+    def __init__(self, seconds: float = 10.0, workers: Optional[int] = None,
+                 seed: Optional[int] = None):
+        if seconds <= 0:
+            raise ValueError("Il tempo di ricerca deve essere positivo")
+        if workers is not None and workers < 1:
+            raise ValueError("Il numero di processi deve essere positivo")
+        self.seconds = seconds
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+
+    @timed("CoverSearch.improve")
+    def improve(self, v: int, k: int, t: int, condition: int, initial: np.ndarray) -> np.ndarray:
+        """
+        Cerca una copertura con meno combinazioni di `initial`.
+
+        Returns:
+            np.ndarray: La copertura più piccola tra quella iniziale e quelle trovate
+        """
+        seeds = np.random.SeedSequence(self.seed).generate_state(self.workers)
+        if self.workers == 1:
+            results = [anneal(v, k, t, condition, initial, self.seconds, int(seeds[0]))]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(_anneal_worker, v, k, t, condition, initial,
+                                           self.seconds, int(seed)) for seed in seeds]
+                results = [future.result() for future in futures]
+
+        best = np.asarray(initial, dtype=np.uint8).reshape(-1, k)
+        for blocks in results:
+            if len(blocks) < len(best) and is_covering(blocks, v, t, condition):
+                best = blocks
+        return best
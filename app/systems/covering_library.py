@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import threading
+from itertools import combinations
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+CoverKey = Tuple[int, int, int, int]
+
+def subset_matrix(v: int, size: int) -> np.ndarray:
+    """Tutti i sottoinsiemi di `size` indici tra 0 e v-1 come matrice di incidenza (n, v) uint8"""
+    subsets = np.array(list(combinations(range(v), size)), dtype=np.intp).reshape(-1, size)
+    matrix = np.zeros((len(subsets), v), dtype=np.uint8)
+    matrix[np.arange(len(subsets))[:, None], subsets] = 1
+    return matrix
+
+def is_covering(blocks: np.ndarray, v: int, t: int, condition: int, chunk_rows: int = 65536) -> bool:
+    """
+    Verifica che le combinazioni garantiscano `t` punti.
+
+    Per ogni possibile gruppo di `condition` numeri estratti tra i v numeri
+    base, almeno una combinazione deve contenerne `t`.
+
+    Args:
+        blocks: Combinazioni come indici (b, k) tra 0 e v-1
+    """
+    blocks = np.asarray(blocks, dtype=np.intp)
+    if blocks.size == 0:
+        return False
+    incidence = np.zeros((len(blocks), v), dtype=np.int32)
+    incidence[np.arange(len(blocks))[:, None], blocks] = 1
+
+    subsets = np.array(list(combinations(range(v), condition)), dtype=np.intp)
+    for begin in range(0, len(subsets), chunk_rows):
+        # Numeri in comune tra ogni gruppo estratto e ogni combinazione
+        common = incidence[:, subsets[begin:begin + chunk_rows]].sum(axis=2)
+        if not (common >= t).any(axis=0).all():
+            return False
+    return True
+
+def greedy_cover(v: int, k: int, t: int, condition: int) -> np.ndarray:
+    """
+    Copertura greedy: scorre le combinazioni in ordine lessicografico e tiene
+    quelle che coprono almeno un gruppo di `condition` numeri ancora scoperto.
+
+    Returns:
+        np.ndarray: Combinazioni come indici (b, k) tra 0 e v-1
+    """
+    targets = subset_matrix(v, condition)
+    uncovered = np.arange(len(targets))
+    blocks = []
+    for block in combinations(range(v), k):
+        hits = targets[uncovered][:, block].sum(axis=1) >= t
+        if hits.any():
+            blocks.append(block)
+            uncovered = uncovered[~hits]
+            if uncovered.size == 0:
+                break
+    return np.array(blocks, dtype=np.uint8).reshape(-1, k)
+
+class CoveringLibrary:
+    """
+    Archivio su disco delle migliori coperture note.
+
+    Ogni copertura è salvata come schema di indici (0..v-1) per la chiave
+    (v numeri base, k numeri per combinazione, t punti garantiti, condizione)
+    e viene applicata ai numeri base reali al momento della richiesta. Una
+    copertura viene sostituita solo da una con meno combinazioni, o da una
+    con le stesse combinazioni dimostrata minima dalla ricerca esatta.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._covers: Dict[str, Dict] = {}
+        self._loaded_signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(v: int, k: int, t: int, condition: int) -> str:
+        return f"{v}-{k}-{t}-{condition}"
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path) as handle:
+                return json.load(handle).get('covers', {})
+        except OSError:
+            return {}
+        except ValueError as e:
+            raise ValueError(f"Archivio delle coperture {self.path} non valido: {str(e)}")
+
+    def _refresh(self) -> None:
+        """Rilegge il file solo se è cambiato dall'ultima lettura"""
+        signature = self._signature()
+        if signature != self._loaded_signature:
+            self._covers = self._read()
+            self._loaded_signature = signature
+
+    def lookup(self, v: int, k: int, t: int, condition: int) -> Optional[np.ndarray]:
+        """Restituisce la copertura salvata come indici (b, k), o None se manca"""
+        with self._lock:
+            self._refresh()
+            entry = self._covers.get(self.key(v, k, t, condition))
+        if entry is None:
+            return None
+        return np.array(entry['blocks'], dtype=np.uint8).reshape(-1, k)
+
+    def source(self, v: int, k: int, t: int, condition: int) -> Optional[str]:
+        """Origine della copertura salvata ('greedy', 'annealing', 'exact'...), o None se manca"""
+        with self._lock:
+            self._refresh()
+            entry = self._covers.get(self.key(v, k, t, condition))
+        return None if entry is None else entry.get('source', '')
+
+    def store(self, v: int, k: int, t: int, condition: int, blocks: np.ndarray,
+              source: str = 'greedy') -> bool:
+        """
+        Salva la copertura se migliora quella nota.
+
+        Returns:
+            bool: True se l'archivio è stato aggiornato
+        """
+        blocks = np.asarray(blocks, dtype=np.uint8).reshape(-1, k)
+        key = self.key(v, k, t, condition)
+        with self._lock:
+            # Rilegge il file: un altro processo potrebbe averlo migliorato nel frattempo
+            self._covers = self._read()
+            current = self._covers.get(key)
+            if current is not None and len(current['blocks']) <= len(blocks):
+                # A parità di combinazioni conta solo la dimostrazione di minimalità
+                proven = source == 'exact' and current.get('source') != 'exact'
+                if len(current['blocks']) < len(blocks) or not proven:
+                    return False
+            if not is_covering(blocks, v, t, condition):
+                raise ValueError(f"Le combinazioni non garantiscono {t} punti su {v} numeri")
+
+            self._covers[key] = {'blocks': blocks.tolist(), 'source': source}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary, 'w') as handle:
+                json.dump({'covers': self._covers}, handle)
+            os.replace(temporary, self.path)
+            self._loaded_signature = self._signature()
+            return True
+
+    def entries(self) -> Iterator[Tuple[CoverKey, int, str]]:
+        """Chiavi salvate con numero di combinazioni e origine"""
+        with self._lock:
+            self._refresh()
+            covers = dict(self._covers)
+        for key, entry in sorted(covers.items(), key=lambda item: tuple(map(int, item[0].split('-')))):
+            yield tuple(map(int, key.split('-'))), len(entry['blocks']), entry.get('source', '')
+
+    @staticmethod
+    def apply(blocks: np.ndarray, numbers: Sequence[int]) -> List[Tuple[int, ...]]:
+        """Applica lo schema di indici ai numeri base (in ordine crescente)"""
+        base = np.array(sorted(numbers))
+        return [tuple(int(num) for num in row) for row in base[np.asarray(blocks, dtype=np.intp)]]
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Precalcola le coperture greedy per i sistemi più richiesti"""
+    parser = argparse.ArgumentParser(description="Precalcola l'archivio delle coperture")
+    parser.add_argument('archivio', help="File dell'archivio (es. data/coperture.json)")
+    parser.add_argument('--fino-a', type=int, default=15, help="Numero massimo di numeri base")
+    args = parser.parse_args(argv)
+
+    library = CoveringLibrary(args.archivio)
+    for v in range(3, args.fino_a + 1):
+        for k in range(2, min(v, 5) + 1):
+            for t in range(2, min(k, 4) + 1):
+                if library.lookup(v, k, t, t) is None:
+                    library.store(v, k, t, t, greedy_cover(v, k, t, t))
+    print(f"Archivio {args.archivio}: {sum(1 for _ in library.entries())} coperture")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+import math
+import time
+from dataclasses import dataclass
+from itertools import combinations
+from typing import List, Optional, Tuple
+import numpy as np
+from utils.timing import timed
+from .covering_library import is_covering, subset_matrix
+
+@dataclass
+class ExactCoverResult:
+    """Esito della ricerca esatta della copertura minima"""
+    blocks: np.ndarray   # Copertura migliore trovata, come indici (b, k)
+    optimal: bool        # True se la ricerca è terminata: nessuna copertura è più piccola
+    lower_bound: int     # Combinazioni minime dimostrate
+    nodes: int           # Nodi dell'albero di ricerca visitati
+    elapsed: float       # Secondi impiegati
+
+class _TimeLimit(Exception):
+    pass
+
+def schonheim_bound(v: int, k: int, t: int) -> int:
+    """Limite inferiore di Schönheim per coprire tutti i gruppi di t numeri su v con combinazioni da k"""
+    bound = 1
+    for i in range(t - 1, -1, -1):
+        bound = math.ceil((v - i) / (k - i) * bound)
+    return bound
+
+class ExactCoverSolver:
+    """
+    Branch and bound per la copertura minima su pochi numeri base.
+
+    Ogni combinazione candidata è una maschera di bit sui gruppi di
+    `condition` numeri che copre. Si parte dalla copertura nota come limite
+    superiore; a ogni nodo si sceglie il gruppo scoperto con meno candidate
+    e si prova ciascuna, escludendo dai rami successivi quelle già provate.
+    Il primo ramo è ridotto per simmetria: basta una combinazione per ogni
+    numero di elementi in comune con il primo gruppo. Un ramo viene scartato
+    quando le combinazioni scelte più il limite inferiore sui gruppi scoperti
+    non migliorano la copertura migliore.
+    """
+
+    # Coppie (combinazione candidata, gruppo da coprire) oltre le quali la ricerca esatta non parte
+    MAX_PAIRS = 20_000_000
+    # Combinazioni candidate per blocco durante la costruzione delle maschere
+    SETUP_CHUNK = 4096
+
+    def __init__(self, time_limit: float = 60.0, check_every: int = 1):
+        """
+        Args:
+            time_limit: Secondi oltre i quali si restituisce la migliore copertura trovata
+            check_every: Nodi tra un controllo del tempo e l'altro (ogni nodo
+                         costa una scansione di tutte le candidate, quindi pochi)
+        """
+        if time_limit <= 0:
+            raise ValueError("Il limite di tempo deve essere positivo")
+        self.time_limit = time_limit
+        self.check_every = check_every
+
+    @timed("ExactCoverSolver.solve")
+    def solve(self, v: int, k: int, t: int, condition: int,
+              initial: Optional[np.ndarray] = None) -> ExactCoverResult:
+        """
+        Cerca la copertura con meno combinazioni.
+
+        Args:
+            initial: Copertura valida da cui partire (limite superiore)
+
+        Returns:
+            ExactCoverResult: Migliore copertura, con optimal=True se dimostrata minima
+        """
+        self.check_size(v, k, condition)
+        started = time.monotonic()
+        self._deadline = started + self.time_limit
+        self._nodes = 0
+
+        self._blocks = list(combinations(range(v), k))
+        if initial is None:
+            initial = np.array(self._blocks, dtype=np.uint8)
+        self._best = [tuple(int(num) for num in block) for block in np.asarray(initial).reshape(-1, k)]
+        lower_bound = schonheim_bound(v, k, t) if condition == t else 1
+
+        optimal = True
+        try:
+            n_targets = self._build_masks(v, k, t, condition)
+            lower_bound = max(lower_bound, self._bound((1 << n_targets) - 1, 0))
+            if len(self._best) > lower_bound:
+                self._root(condition, v, k, t, n_targets)
+        except _TimeLimit:
+            optimal = False
+        if optimal:
+            lower_bound = len(self._best)
+
+        blocks = np.array(self._best, dtype=np.uint8).reshape(-1, k)
+        if not is_covering(blocks, v, t, condition):
+            raise ValueError(f"Le combinazioni non garantiscono {t} punti su {v} numeri")
+        return ExactCoverResult(blocks, optimal, lower_bound, self._nodes, time.monotonic() - started)
+
+    @classmethod
+    def check_size(cls, v: int, k: int, condition: int) -> None:
+        """Rifiuta i sistemi con troppe candidate per una ricerca esatta"""
+        pairs = math.comb(v, k) * math.comb(v, condition)
+        if pairs > cls.MAX_PAIRS:
+            raise ValueError(f"Sistema troppo grande per la ricerca esatta: {math.comb(v, k)} combinazioni "
+                             f"candidate su {v} numeri (usa --migliora)")
+
+    def _build_masks(self, v: int, k: int, t: int, condition: int) -> int:
+        """
+        Maschere dei gruppi coperti da ogni candidata, a blocchi di righe
+        con il controllo del tempo tra un blocco e l'altro.
+
+        Returns:
+            int: Numero di gruppi da coprire
+        """
+        blocks = subset_matrix(v, k).astype(np.float32)
+        targets = subset_matrix(v, condition).astype(np.float32)
+        self._block_matrix = blocks
+        self._masks = []
+        covering = []
+        for begin in range(0, len(blocks), self.SETUP_CHUNK):
+            if time.monotonic() > self._deadline:
+                raise _TimeLimit()
+            # Numeri in comune tra ogni candidata del blocco e ogni gruppo
+            covers = blocks[begin:begin + self.SETUP_CHUNK] @ targets.T >= t
+            packed = np.packbits(covers, axis=1, bitorder='little')
+            self._masks.extend(int.from_bytes(row.tobytes(), 'little') for row in packed)
+            covering.append(covers)
+        covers = np.concatenate(covering)
+        self._covering = [np.flatnonzero(column).tolist() for column in covers.T]
+        return len(targets)
+
+    def _root(self, c: int, v: int, k: int, t: int, n_targets: int) -> None:
+        """
+        Primo livello: il gruppo {0..c-1} è coperto da una combinazione con j
+        numeri in comune; a meno di permutazioni basta {0..j-1} ∪ {c..c+k-j-1}.
+        """
+        index = {block: b for b, block in enumerate(self._blocks)}
+        in_first = self._block_matrix[:, :c].sum(axis=1)
+        uncovered = (1 << n_targets) - 1
+        forbidden = 0
+        for common in range(min(k, c), max(t, k - (v - c)) - 1, -1):
+            block = tuple(range(common)) + tuple(range(c, c + k - common))
+            b = index[block]
+            self._search(uncovered & ~self._masks[b], [b], forbidden)
+            # I rami successivi non usano combinazioni con lo stesso numero di elementi in comune
+            same = np.packbits(in_first == common, bitorder='little')
+            forbidden |= int.from_bytes(same.tobytes(), 'little')
+
+    def _search(self, uncovered: int, chosen: List[int], forbidden: int) -> None:
+        self._nodes += 1
+        if self._nodes % self.check_every == 0 and time.monotonic() > self._deadline:
+            raise _TimeLimit()
+
+        if not uncovered:
+            if len(chosen) < len(self._best):
+                self._best = [self._blocks[b] for b in chosen]
+            return
+        if len(chosen) + self._bound(uncovered, forbidden) >= len(self._best):
+            return
+
+        # Gruppo scoperto con meno combinazioni ancora utilizzabili
+        options = None
+        remaining = uncovered
+        while remaining:
+            low = remaining & -remaining
+            candidates = [b for b in self._covering[low.bit_length() - 1] if not forbidden >> b & 1]
+            if options is None or len(candidates) < len(options):
+                options = candidates
+                if len(options) <= 1:
+                    break
+            remaining ^= low
+
+        for b in options:
+            self._search(uncovered & ~self._masks[b], chosen + [b], forbidden)
+            forbidden |= 1 << b
+
+    def _bound(self, uncovered: int, forbidden: int) -> int:
+        """Gruppi scoperti diviso il massimo che una sola combinazione può ancora coprire"""
+        best = max(((mask & uncovered).bit_count() for b, mask in enumerate(self._masks)
+                    if not forbidden >> b & 1), default=0)
+        if best == 0:
+            return len(self._best)
+        return -(-uncovered.bit_count() // best)
@@ -1,8 +1,111 @@
 from itertools import combinations as iter_combinations
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
+from utils.timing import timed
 from .system_interface import SystemInterface
+from .covering_library import CoveringLibrary, greedy_cover
+from .cover_search import CoverSearch
+from .exact_cover import ExactCoverResult, ExactCoverSolver
 
 class GuaranteedSystem:
+    def __init__(self, library: Optional[CoveringLibrary] = None):
+        """
+        Args:
+            library: Archivio delle coperture già calcolate (None per ricalcolarle sempre)
+        """
+        self.library = library
+
+    @timed("GuaranteedSystem.generate")
+    def generate(self, numbers: List[int], system_size: int, win_size: int,
+                 condition: Optional[int] = None) -> List[Tuple[int, ...]]:
+        """
+        Restituisce le combinazioni che garantiscono la vincita.
+
+        La copertura dipende solo da quanti sono i numeri base, quindi viene
+        cercata nell'archivio come schema di indici e applicata ai numeri
+        richiesti; se manca viene calcolata e salvata per le richieste successive.
+
+        Args:
+            numbers: Lista dei numeri base
+            system_size: Numeri per combinazione
+            win_size: Punti garantiti
+            condition: Numeri base che devono uscire perché la garanzia valga
+                       (default: win_size)
+        """
+        condition = win_size if condition is None else condition
+        self._validate(numbers, system_size, win_size)
+        return CoveringLibrary.apply(self._cover(len(numbers), system_size, win_size, condition), numbers)
+
+    @timed("GuaranteedSystem.improve")
+    def improve(self, numbers: List[int], system_size: int, win_size: int,
+                condition: Optional[int] = None, seconds: float = 10.0,
+                workers: Optional[int] = None, seed: Optional[int] = None) -> List[Tuple[int, ...]]:
+        """
+        Cerca un sistema con meno combinazioni partendo dalla copertura nota.
+
+        La ricerca gira su più processi per `seconds` secondi; se trova una
+        copertura più piccola la salva nell'archivio.
+
+        Returns:
+            List[Tuple[int, ...]]: Il sistema più piccolo disponibile
+        """
+        condition = win_size if condition is None else condition
+        self._validate(numbers, system_size, win_size)
+        v = len(numbers)
+        initial = self._cover(v, system_size, win_size, condition)
+
+        blocks = CoverSearch(seconds, workers, seed).improve(v, system_size, win_size, condition, initial)
+        if len(blocks) < len(initial) and self.library is not None:
+            self.library.store(v, system_size, win_size, condition, blocks, source='annealing')
+        return CoveringLibrary.apply(blocks, numbers)
+
+    @timed("GuaranteedSystem.solve_exact")
+    def solve_exact(self, numbers: List[int], system_size: int, win_size: int,
+                    condition: Optional[int] = None, time_limit: float = 60.0) -> ExactCoverResult:
+        """
+        Cerca il sistema con il minimo numero di combinazioni (branch and bound).
+
+        Allo scadere di `time_limit` restituisce la copertura migliore trovata
+        con optimal=False. Le coperture dimostrate minime sono salvate
+        nell'archivio con origine 'exact' e non vengono ricalcolate. I sistemi
+        con troppe combinazioni candidate sono rifiutati con ValueError.
+
+        Returns:
+            ExactCoverResult: Copertura come indici sui numeri base ordinati
+        """
+        condition = win_size if condition is None else condition
+        self._validate(numbers, system_size, win_size)
+        v = len(numbers)
+        ExactCoverSolver.check_size(v, system_size, condition)
+        initial = self._cover(v, system_size, win_size, condition)
+        if self.library is not None and self.library.source(v, system_size, win_size, condition) == 'exact':
+            return ExactCoverResult(initial, True, len(initial), 0, 0.0)
+
+        result = ExactCoverSolver(time_limit).solve(v, system_size, win_size, condition, initial)
+        if self.library is not None and (result.optimal or len(result.blocks) < len(initial)):
+            self.library.store(v, system_size, win_size, condition, result.blocks,
+                               source='exact' if result.optimal else 'branch-and-bound')
+        return result
+
+    def _cover(self, v: int, system_size: int, win_size: int, condition: int):
+        """Copertura dall'archivio o, se manca, calcolata con il greedy e salvata"""
+        if condition < win_size or condition > min(5, v):
+            raise ValueError(f"La condizione deve essere tra {win_size} e {min(5, v)} numeri estratti")
+        blocks = self.library.lookup(v, system_size, win_size, condition) if self.library else None
+        if blocks is None:
+            blocks = greedy_cover(v, system_size, win_size, condition)
+            if self.library is not None:
+                self.library.store(v, system_size, win_size, condition, blocks, source='greedy')
+        return blocks
+
+    @staticmethod
+    def _validate(numbers: List[int], system_size: int, win_size: int) -> None:
+        if system_size < win_size:
+            raise ValueError(f"Impossibile garantire {win_size} punti con {system_size} numeri")
+        if win_size < 2 or win_size > 4:
+            raise ValueError("I punti garantiti devono essere tra 2 e 4")
+        if len(numbers) < system_size:
+            raise ValueError(f"Servono almeno {system_size} numeri per creare il sistema")
+
     @staticmethod
     def verify_guarantee(combination: Tuple[int, ...], win_size: int) -> bool:
         """
@@ -13,18 +116,14 @@ class GuaranteedSystem:
         return len(winning_combs) > 0
 
     @staticmethod
+    @timed("GuaranteedSystem.find_minimum_guaranteed_combinations")
     def find_minimum_guaranteed_combinations(numbers: List[int],
                                           system_size: int,
                                           win_size: int) -> List[Tuple[int, ...]]:
         """
         Trova il minimo insieme di combinazioni che garantisce la vincita.
         """
-        if system_size < win_size:
-            raise ValueError(f"Impossibile garantire {win_size} punti con {system_size} numeri")
-        if win_size < 2 or win_size > 4:
-            raise ValueError("I punti garantiti devono essere tra 2 e 4")
-        if len(numbers) < system_size:
-            raise ValueError(f"Servono almeno {system_size} numeri per creare il sistema")
+        GuaranteedSystem._validate(numbers, system_size, win_size)
 
         # Usa iter_combinations invece di combinations
         all_combinations = list(iter_combinations(sorted(numbers), system_size))
@@ -42,6 +141,7 @@ class GuaranteedSystem:
         return guaranteed_combs
 
     @staticmethod
+    @timed("GuaranteedSystem.optimize_combinations")
     def optimize_combinations(combinations: List[Tuple[int, ...]],
                             win_size: int) -> List[Tuple[int, ...]]:
         """
@@ -1,10 +1,12 @@
 from itertools import combinations
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
+from utils.timing import timed
 from .system_interface import SystemInterface
 
 class IntegralSystem(SystemInterface):
     """Implementa un sistema integrale che genera tutte le possibili combinazioni"""
 
+    @timed("IntegralSystem.generate_combinations")
     def generate_combinations(self, numbers: List[int], combination_size: int, **kwargs) -> List[Tuple[int, ...]]:
         """
         Genera tutte le possibili combinazioni dei numeri dati.
@@ -12,6 +14,7 @@ class IntegralSystem(SystemInterface):
         Args:
             numbers: Lista dei numeri base
             combination_size: Dimensione delle combinazioni da generare
+            filters: SystemFilters opzionali applicati durante l'enumerazione
 
         Returns:
             List[Tuple[int, ...]]: Lista di tutte le combinazioni possibili
@@ -19,10 +22,22 @@ class IntegralSystem(SystemInterface):
         Raises:
             ValueError: Se i parametri non sono validi
         """
+        return list(self.iter_combinations(numbers, combination_size, **kwargs))
+
+    def iter_combinations(self, numbers: List[int], combination_size: int, **kwargs) -> Iterator[Tuple[int, ...]]:
+        """
+        Genera le combinazioni in ordine lessicografico senza materializzarle.
+
+        Con `filters` (SystemFilters) vengono generate solo le combinazioni
+        che rispettano i vincoli, scartando i rami durante l'enumerazione.
+        """
         if combination_size < 2 or combination_size > 4:
             raise ValueError("Il numero di elementi deve essere tra 2 e 4")
 
         if len(numbers) < combination_size:
             raise ValueError(f"Servono almeno {combination_size} numeri per creare combinazioni")
 
-        return list(combinations(sorted(numbers), combination_size))
\ No newline at end of file
+        filters = kwargs.get('filters')
+        if filters is not None:
+            return filters.enumerate(numbers, combination_size)
+        return combinations(sorted(numbers), combination_size)
\ No newline at end of file
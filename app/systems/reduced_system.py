@@ -1,10 +1,12 @@
-from itertools import combinations
-from typing import List, Tuple
+from itertools import combinations, islice
+from typing import Iterator, List, Tuple
+from utils.timing import timed
 from .system_interface import SystemInterface
 
 class ReducedSystem(SystemInterface):
     """Implementa un sistema ridotto che genera un sottoinsieme ottimizzato di combinazioni"""
 
+    @timed("ReducedSystem.generate_combinations")
     def generate_combinations(self, numbers: List[int], combination_size: int, **kwargs) -> List[Tuple[int, ...]]:
         """
         Genera un sottoinsieme ottimizzato di combinazioni.
@@ -19,20 +21,21 @@ class ReducedSystem(SystemInterface):
         Raises:
             ValueError: Se i parametri non sono validi
         """
+        reduced_combinations = list(self.iter_combinations(numbers, combination_size))
+
+        if not reduced_combinations:
+            raise ValueError("Nessuna combinazione generata")
+
+        return reduced_combinations
+
+    def iter_combinations(self, numbers: List[int], combination_size: int, **kwargs) -> Iterator[Tuple[int, ...]]:
+        """Genera il sottoinsieme ridotto senza materializzare tutte le combinazioni"""
         if combination_size < 2 or combination_size > 4:
             raise ValueError("Il numero di elementi deve essere tra 2 e 4")
 
         if len(numbers) < combination_size:
             raise ValueError(f"Servono almeno {combination_size} numeri per creare combinazioni")
 
-        # Genera tutte le combinazioni e seleziona un sottoinsieme ottimizzato
-        all_combinations = list(combinations(sorted(numbers), combination_size))
-
         # Per ora selezioniamo una ogni due combinazioni
         # In futuro si può implementare un algoritmo più sofisticato
-        reduced_combinations = all_combinations[::2]
-
-        if not reduced_combinations:
-            raise ValueError("Nessuna combinazione generata")
-
-        return reduced_combinations
\ No newline at end of file
+        return islice(combinations(sorted(numbers), combination_size), 0, None, 2)
\ No newline at end of file
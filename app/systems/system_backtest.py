@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, List, Tuple
+import numpy as np
+from utils.bitmask import MASK_BYTES, numbers_to_packed
+from utils.timing import timed
+
+# Nomi delle vincite per numero di punti (indice = numeri indovinati)
+HIT_NAMES = ('nessuno', 'estratto', 'ambo', 'terno', 'quaterna', 'cinquina')
+
+# Bit a 1 di ogni valore a 16 bit: la maschera da 12 byte sono 6 parole
+_POPCOUNT16 = np.unpackbits(np.arange(1 << 16, dtype='<u2').view(np.uint8).reshape(-1, 2),
+                            axis=1).sum(axis=1).astype(np.uint8)
+
+@dataclass
+class BacktestResult:
+    """Esito di un sistema giocato su tutte le estrazioni di uno storico"""
+    combinations: int
+    draws: int
+    combination_size: int
+    hit_counts: List[int]     # Coppie (combinazione, estrazione) per punti esatti
+    best_per_draw: List[int]  # Estrazioni per punteggio migliore tra le combinazioni
+
+    def winning_draws(self, hits: int) -> int:
+        """Estrazioni in cui almeno una combinazione ha fatto almeno `hits` punti"""
+        return sum(self.best_per_draw[hits:])
+
+class SystemBacktester:
+    """
+    Verifica come avrebbe reso un sistema su ogni estrazione passata.
+
+    Combinazioni ed estrazioni diventano maschere di 90 bit: i punti di ogni
+    coppia (combinazione, estrazione) sono il numero di bit a 1 dell'AND
+    delle due maschere, calcolato con una tabella a 16 bit su blocchi di
+    combinazioni per tenere limitata la memoria intermedia.
+    """
+
+    def __init__(self, chunk_cells: int = 1 << 19):
+        """
+        Args:
+            chunk_cells: Coppie (combinazione, estrazione) elaborate per blocco
+        """
+        self.chunk_cells = chunk_cells
+
+    @staticmethod
+    def hits(combination_masks: np.ndarray, draw_masks: np.ndarray) -> np.ndarray:
+        """
+        Punti di ogni combinazione su ogni estrazione.
+
+        Args:
+            combination_masks: Maschere (n, 12) uint8
+            draw_masks: Maschere (m, 12) uint8
+
+        Returns:
+            np.ndarray: Matrice (n, m) uint8 di numeri indovinati
+        """
+        combinations = np.ascontiguousarray(combination_masks).view('<u2')
+        words = np.ascontiguousarray(np.ascontiguousarray(draw_masks).view('<u2').T)
+        hits = np.zeros((len(combinations), words.shape[1]), dtype=np.uint8)
+        # Una parola alla volta: niente array intermedio (n, m, 6), e le parole
+        # a zero in tutte le combinazioni del blocco non contribuiscono
+        for word in np.flatnonzero(combinations.any(axis=0)):
+            hits += _POPCOUNT16[combinations[:, word, None] & words[word]]
+        return hits
+
+    @timed("SystemBacktester.run")
+    def run(self, combinations: Iterable[Tuple[int, ...]], draws: np.ndarray) -> BacktestResult:
+        """
+        Gioca tutte le combinazioni su tutte le estrazioni.
+
+        Args:
+            combinations: Combinazioni del sistema (anche un generatore)
+            draws: Estrazioni (m, 5) della ruota
+
+        Returns:
+            BacktestResult: Distribuzione dei punti
+        """
+        draws = np.asarray(draws)
+        draw_masks = numbers_to_packed(draws) if len(draws) else np.empty((0, MASK_BYTES), np.uint8)
+        chunk_rows = max(1, self.chunk_cells // max(len(draws), 1))
+
+        hit_counts = np.zeros(6, dtype=np.int64)
+        best = np.zeros(len(draws), dtype=np.uint8)
+        total, combination_size = 0, 0
+        iterator = iter(combinations)
+        while True:
+            chunk = np.array(list(islice(iterator, chunk_rows)), dtype=np.int64)
+            if chunk.size == 0:
+                break
+            if chunk.min() < 1 or chunk.max() > 90:
+                raise ValueError("I numeri delle combinazioni devono essere tra 1 e 90")
+            combination_size = chunk.shape[1]
+            scores = self.hits(numbers_to_packed(chunk), draw_masks)
+            hit_counts += np.bincount(scores.ravel(), minlength=6)[:6]
+            if len(draws):
+                np.maximum(best, scores.max(axis=0), out=best)
+            total += len(chunk)
+
+        if total == 0:
+            raise ValueError("Il sistema non contiene combinazioni")
+
+        levels = min(combination_size, 5) + 1
+        return BacktestResult(
+            combinations=total,
+            draws=len(draws),
+            combination_size=combination_size,
+            hit_counts=hit_counts[:levels].tolist(),
+            best_per_draw=np.bincount(best, minlength=levels)[:levels].tolist()
+        )
@@ -0,0 +1,156 @@
+import struct
+from dataclasses import dataclass
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, Tuple
+import numpy as np
+from utils.bitmask import MASK_BYTES, numbers_to_packed, packed_to_numbers
+
+MAGIC = b'ORSY'
+FORMAT_VERSION = 1
+# magic, versione, codifica, numeri per combinazione, riservato, numero combinazioni
+HEADER = struct.Struct('<4sBBBBQ')
+
+ENCODING_NUMBERS = 0  # Un uint8 per numero: k byte per combinazione
+ENCODING_MASK = 1     # Maschera di 90 bit (12 byte) per combinazione
+EXPORT_FORMATS = ('csv', 'numeri', 'maschera')
+
+@dataclass
+class SystemFileHeader:
+    """Intestazione di un file di sistema binario"""
+    encoding: int
+    combination_size: int
+    count: int
+
+class SystemExporter:
+    """
+    Esporta e rilegge sistemi di gioco in formato CSV o binario compatto.
+
+    Le combinazioni vengono consumate a blocchi direttamente dai generatori
+    dei sistemi, quindi anche sistemi con centinaia di migliaia di
+    combinazioni non passano mai da una rappresentazione testuale in memoria.
+    """
+
+    def __init__(self, chunk_size: int = 65536, csv_delimiter: str = ';'):
+        self.chunk_size = chunk_size
+        self.csv_delimiter = csv_delimiter
+
+    def export(self, combinations: Iterable[Tuple[int, ...]], output_file: str,
+               export_format: str) -> int:
+        """
+        Esporta le combinazioni nel formato richiesto.
+
+        Args:
+            combinations: Combinazioni da esportare (anche un generatore)
+            output_file: Path del file di destinazione
+            export_format: 'csv', 'numeri' (uint8 per numero) o 'maschera' (90 bit)
+
+        Returns:
+            int: Numero di combinazioni scritte
+        """
+        if export_format == 'csv':
+            return self.write_csv(combinations, output_file)
+        if export_format == 'numeri':
+            return self.write_binary(combinations, output_file, ENCODING_NUMBERS)
+        if export_format == 'maschera':
+            return self.write_binary(combinations, output_file, ENCODING_MASK)
+        raise ValueError(f"Formato di esportazione '{export_format}' non valido. "
+                         f"Formati validi: {', '.join(EXPORT_FORMATS)}")
+
+    def write_csv(self, combinations: Iterable[Tuple[int, ...]], output_file: str) -> int:
+        """Scrive una combinazione per riga, numeri separati da csv_delimiter"""
+        count = 0
+        with open(output_file, 'w') as handle:
+            for chunk in self._iter_chunks(combinations):
+                handle.write("\n".join(self.csv_delimiter.join(map(str, row))
+                                       for row in chunk.tolist()) + "\n")
+                count += len(chunk)
+        return count
+
+    def write_binary(self, combinations: Iterable[Tuple[int, ...]], output_file: str,
+                     encoding: int = ENCODING_NUMBERS) -> int:
+        """
+        Scrive le combinazioni in formato binario con intestazione.
+
+        Il numero di combinazioni nell'intestazione viene aggiornato a fine
+        scrittura, così il generatore può essere consumato in streaming.
+        """
+        count = 0
+        combination_size = 0
+        with open(output_file, 'wb') as handle:
+            handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, encoding, 0, 0, 0))
+            for chunk in self._iter_chunks(combinations):
+                combination_size = chunk.shape[1]
+                handle.write(self._encode(chunk, encoding).tobytes())
+                count += len(chunk)
+            handle.seek(0)
+            handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, encoding, combination_size, 0, count))
+        return count
+
+    @staticmethod
+    def read_header(handle: BinaryIO) -> SystemFileHeader:
+        """Legge e valida l'intestazione di un file binario"""
+        raw = handle.read(HEADER.size)
+        if len(raw) < HEADER.size:
+            raise ValueError("File di sistema troncato")
+        magic, version, encoding, combination_size, _, count = HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ValueError("Il file non è un sistema esportato da Oracolo")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Versione del formato non supportata: {version}")
+        return SystemFileHeader(encoding, combination_size, count)
+
+    def read(self, input_file: str) -> np.ndarray:
+        """
+        Rilegge un sistema esportato (CSV con il separatore dell'esportatore o binario).
+
+        Returns:
+            np.ndarray: Combinazioni come array uint8 (n, k). CSV e 'numeri'
+                        mantengono i numeri nell'ordine scritto; 'maschera' li
+                        restituisce ordinati per riga
+        """
+        with open(input_file, 'rb') as handle:
+            is_binary = handle.read(len(MAGIC)) == MAGIC
+
+        if not is_binary:
+            data = np.loadtxt(input_file, delimiter=self.csv_delimiter, dtype=np.uint8, ndmin=2)
+            return data
+
+        with open(input_file, 'rb') as handle:
+            header = self.read_header(handle)
+            if header.encoding == ENCODING_NUMBERS:
+                data = np.fromfile(handle, dtype=np.uint8, count=header.count * header.combination_size)
+                return data.reshape(header.count, header.combination_size)
+            if header.encoding == ENCODING_MASK:
+                masks = np.fromfile(handle, dtype=np.uint8, count=header.count * MASK_BYTES)
+                return self.masks_to_numbers(masks.reshape(header.count, MASK_BYTES),
+                                            header.combination_size)
+        raise ValueError(f"Codifica non supportata: {header.encoding}")
+
+    @staticmethod
+    def numbers_to_masks(numbers: np.ndarray) -> np.ndarray:
+        """Converte combinazioni (n, k) di numeri 1-90 in maschere di bit (n, 12)"""
+        return numbers_to_packed(numbers)
+
+    @staticmethod
+    def masks_to_numbers(masks: np.ndarray, combination_size: int) -> np.ndarray:
+        """Converte maschere di bit (n, 12) in combinazioni (n, k) ordinate"""
+        return packed_to_numbers(masks, combination_size)
+
+    def _iter_chunks(self, combinations: Iterable[Tuple[int, ...]]) -> Iterator[np.ndarray]:
+        """Raggruppa le combinazioni in blocchi uint8 validati"""
+        iterator = iter(combinations)
+        while True:
+            chunk = np.array(list(islice(iterator, self.chunk_size)), dtype=np.int64)
+            if chunk.size == 0:
+                return
+            if chunk.min() < 1 or chunk.max() > 90:
+                raise ValueError("I numeri esportabili devono essere tra 1 e 90")
+            yield chunk.astype(np.uint8)
+
+    @staticmethod
+    def _encode(chunk: np.ndarray, encoding: int) -> np.ndarray:
+        if encoding == ENCODING_NUMBERS:
+            return chunk
+        if encoding == ENCODING_MASK:
+            return SystemExporter.numbers_to_masks(chunk)
+        raise ValueError(f"Codifica non supportata: {encoding}")
@@ -0,0 +1,217 @@
+from dataclasses import dataclass, field
+from typing import FrozenSet, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Decina di un numero: 1-10 -> 0, 11-20 -> 1, ..., 81-90 -> 8
+DECADES = 9
+
+def decade(number: int) -> int:
+    return (number - 1) // 10
+
+@dataclass
+class SystemFilters:
+    """
+    Vincoli sulle combinazioni di un sistema integrale.
+
+    I vincoli vengono applicati durante l'enumerazione: una combinazione
+    parziale viene scartata appena nessun suo completamento può rispettarli,
+    quindi il lavoro cresce con le combinazioni accettate e non con C(n, k).
+    """
+    sum_min: Optional[int] = None
+    sum_max: Optional[int] = None
+    even_min: Optional[int] = None
+    even_max: Optional[int] = None
+    max_per_decade: Optional[int] = None   # Numeri al massimo nella stessa decina
+    min_decades: Optional[int] = None      # Decine diverse almeno
+    excluded_pairs: FrozenSet[Tuple[int, int]] = field(default_factory=frozenset)  # Ambi (a < b) da evitare
+
+    @classmethod
+    def parse(cls, tokens: Sequence[str]) -> 'SystemFilters':
+        """
+        Interpreta i filtri nella forma nome=valore.
+
+        Filtri: somma=MIN-MAX, pari=MIN-MAX (o pari=N), decina=N (massimo per
+        decina), decine=N (decine diverse almeno). Un intervallo può lasciare
+        aperto un estremo (somma=100- o somma=-150). I filtri 'ambi' (ambi
+        già usciti) richiedono lo storico e vengono gestiti dal chiamante.
+        """
+        values = {}
+        for token in tokens:
+            name, _, value = token.partition('=')
+            name = name.lower()
+            if name == 'somma':
+                values['sum_min'], values['sum_max'] = cls._parse_range(name, value)
+            elif name == 'pari':
+                values['even_min'], values['even_max'] = cls._parse_range(name, value)
+            elif name == 'decina':
+                values['max_per_decade'] = cls._parse_int(name, value)
+            elif name == 'decine':
+                values['min_decades'] = cls._parse_int(name, value)
+            else:
+                raise ValueError(f"Filtro '{token}' non valido. Filtri validi: "
+                                 "somma=MIN-MAX, pari=MIN-MAX, decina=N, decine=N, ambi[=N]")
+        return cls(**values)
+
+    @staticmethod
+    def _parse_int(name: str, value: str) -> int:
+        if not value.isdigit():
+            raise ValueError(f"Il filtro {name} richiede un intero non negativo")
+        return int(value)
+
+    @classmethod
+    def _parse_range(cls, name: str, value: str) -> Tuple[Optional[int], Optional[int]]:
+        if '-' not in value:
+            number = cls._parse_int(name, value)
+            return number, number
+        low, high = value.split('-', 1)
+        bounds = (cls._parse_int(name, low) if low else None,
+                  cls._parse_int(name, high) if high else None)
+        if bounds[0] is not None and bounds[1] is not None and bounds[0] > bounds[1]:
+            raise ValueError(f"Intervallo del filtro {name} non valido: {value}")
+        return bounds
+
+    def with_drawn_pairs(self, numbers: Sequence[int], draws: np.ndarray) -> 'SystemFilters':
+        """
+        Aggiunge agli ambi esclusi quelli tra `numbers` già usciti in `draws`.
+
+        Args:
+            numbers: Numeri base del sistema
+            draws: Estrazioni (N, 5)
+        """
+        base = np.array(sorted(numbers), dtype=np.intp)
+        position = np.full(91, -1, dtype=np.intp)
+        position[base] = np.arange(len(base))
+        # Incidenza estrazione x numero base: il prodotto conta le estrazioni con entrambi i numeri
+        incidence = np.zeros((len(draws), len(base)), dtype=np.int32)
+        rows, columns = np.nonzero(position[np.asarray(draws, dtype=np.intp)] >= 0)
+        incidence[rows, position[np.asarray(draws, dtype=np.intp)[rows, columns]]] = 1
+        together = incidence.T @ incidence
+        first, second = np.nonzero(np.triu(together, k=1))
+        drawn = {(int(base[a]), int(base[b])) for a, b in zip(first, second)}
+        return SystemFilters(self.sum_min, self.sum_max, self.even_min, self.even_max,
+                             self.max_per_decade, self.min_decades,
+                             frozenset(self.excluded_pairs | drawn))
+
+    def describe(self) -> str:
+        """Descrizione breve dei filtri attivi (es. 'somma 60-120, pari 2')"""
+        parts = []
+        for label, low, high in (('somma', self.sum_min, self.sum_max),
+                                 ('pari', self.even_min, self.even_max)):
+            if low is not None and low == high:
+                parts.append(f"{label} {low}")
+            elif low is not None or high is not None:
+                parts.append(f"{label} {'' if low is None else low}-{'' if high is None else high}")
+        if self.max_per_decade is not None:
+            parts.append(f"al massimo {self.max_per_decade} per decina")
+        if self.min_decades is not None:
+            parts.append(f"almeno {self.min_decades} decine")
+        if self.excluded_pairs:
+            parts.append(f"{len(self.excluded_pairs)} ambi esclusi")
+        return ", ".join(parts) or "nessuno"
+
+    def accepts(self, combination: Sequence[int]) -> bool:
+        """Verifica una combinazione completa (riferimento per l'enumerazione)"""
+        total = sum(combination)
+        evens = sum(1 for num in combination if num % 2 == 0)
+        decades = [decade(num) for num in combination]
+        ordered = sorted(combination)
+        return ((self.sum_min is None or total >= self.sum_min)
+                and (self.sum_max is None or total <= self.sum_max)
+                and (self.even_min is None or evens >= self.even_min)
+                and (self.even_max is None or evens <= self.even_max)
+                and (self.max_per_decade is None
+                     or max(decades.count(d) for d in set(decades)) <= self.max_per_decade)
+                and (self.min_decades is None or len(set(decades)) >= self.min_decades)
+                and not any((a, b) in self.excluded_pairs
+                            for i, a in enumerate(ordered) for b in ordered[i + 1:]))
+
+    def enumerate(self, numbers: Sequence[int], size: int) -> Iterator[Tuple[int, ...]]:
+        """
+        Combinazioni di `size` numeri che rispettano i filtri, in ordine lessicografico.
+
+        Ricerca in profondità sui numeri ordinati. Per ogni posizione i
+        limiti su somma e pari vengono dai numeri ancora disponibili
+        (somme prefisse dei più piccoli e dei più grandi, pari rimasti),
+        le decine piene e gli ambi esclusi eliminano i candidati prima di
+        scendere, e poiché i numeri crescono, superare la somma massima
+        chiude l'intero ramo.
+        """
+        values = sorted(numbers)
+        n = len(values)
+        sum_min = self.sum_min if self.sum_min is not None else -1
+        sum_max = self.sum_max if self.sum_max is not None else 90 * size
+        even_min = self.even_min or 0
+        even_max = self.even_max if self.even_max is not None else size
+        per_decade = self.max_per_decade if self.max_per_decade is not None else size
+        min_decades = self.min_decades or 0
+
+        # smallest[i][r] / largest[i][r]: somma minima / massima di r numeri scelti da values[i:]
+        smallest = [[0] * (size + 1) for _ in range(n + 1)]
+        largest = [[0] * (size + 1) for _ in range(n + 1)]
+        for i in range(n - 1, -1, -1):
+            for r in range(1, size + 1):
+                if n - i < r:
+                    smallest[i][r] = largest[i][r] = None
+                    continue
+                smallest[i][r] = values[i] + smallest[i + 1][r - 1]
+                largest[i][r] = values[n - r] + (largest[n - r + 1][r - 1] if r > 1 else 0)
+        evens_left = [0] * (n + 1)
+        decades_left = [0] * (n + 1)
+        seen = set()
+        for i in range(n - 1, -1, -1):
+            evens_left[i] = evens_left[i + 1] + (values[i] % 2 == 0)
+            seen.add(decade(values[i]))
+            decades_left[i] = len(seen)
+        # conflicts[i]: bitmask degli indici che formano con i un ambo escluso
+        conflicts = [0] * n
+        index = {value: i for i, value in enumerate(values)}
+        for a, b in self.excluded_pairs:
+            if a in index and b in index:
+                conflicts[index[a]] |= 1 << index[b]
+                conflicts[index[b]] |= 1 << index[a]
+
+        chosen: List[int] = []
+        decade_counts = [0] * DECADES
+
+        def extend(start: int, total: int, evens: int, blocked: int, distinct: int) -> Iterator[Tuple[int, ...]]:
+            remaining = size - len(chosen)
+            if remaining == 0:
+                if total >= sum_min and distinct >= min_decades:
+                    yield tuple(chosen)
+                return
+            for i in range(start, n - remaining + 1):
+                # Numeri crescenti: se il minimo da qui supera la somma massima, anche i successivi
+                if total + smallest[i][remaining] > sum_max:
+                    return
+                if total + largest[i][remaining] < sum_min:
+                    return
+                if evens + min(remaining, evens_left[i]) < even_min:
+                    return
+                # Dispari necessari se i pari sono limitati da even_max
+                if (n - i) - evens_left[i] < remaining - (even_max - evens):
+                    return
+                value = values[i]
+                is_even = value % 2 == 0
+                if (blocked >> i) & 1 or evens + is_even > even_max:
+                    continue
+                # Pari e dispari ancora da trovare dopo questo numero
+                if evens + is_even + min(remaining - 1, evens_left[i + 1]) < even_min:
+                    continue
+                if ((n - i - 1) - evens_left[i + 1]
+                        < (remaining - 1) - (even_max - evens - is_even)):
+                    continue
+                if total + value + largest[i + 1][remaining - 1] < sum_min:
+                    continue
+                d = decade(value)
+                if decade_counts[d] >= per_decade:
+                    continue
+                new_distinct = distinct + (decade_counts[d] == 0)
+                if new_distinct + min(remaining - 1, decades_left[i + 1]) < min_decades:
+                    continue
+                chosen.append(value)
+                decade_counts[d] += 1
+                yield from extend(i + 1, total + value, evens + is_even, blocked | conflicts[i], new_distinct)
+                decade_counts[d] -= 1
+                chosen.pop()
+
+        return extend(0, 0, 0, 0, 0)
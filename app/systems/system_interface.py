@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 
 class SystemInterface(ABC):
     """Interfaccia base per tutti i sistemi di gioco"""
@@ -20,4 +20,13 @@ class SystemInterface(ABC):
         Raises:
             ValueError: Se i parametri non sono validi
         """
-        pass
\ No newline at end of file
+        pass
+
+    def iter_combinations(self, numbers: List[int], combination_size: int, **kwargs) -> Iterator[Tuple[int, ...]]:
+        """
+        Restituisce le combinazioni una alla volta, senza costruire la lista completa.
+
+        I parametri vengono validati subito; le implementazioni che possono generare
+        le combinazioni in modo lazy ridefiniscono questo metodo.
+        """
+        return iter(self.generate_combinations(numbers, combination_size, **kwargs))
\ No newline at end of file
@@ -0,0 +1,191 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+from utils.bitmask import numbers_to_packed
+from utils.timing import timed
+from .system_backtest import SystemBacktester
+
+# Premi lordi del Lotto per 1 euro giocato su una ruota, per sorte (punti)
+PRIZES = {1: 11.23, 2: 250.0, 3: 4500.0, 4: 120000.0, 5: 6000000.0}
+
+@dataclass
+class SimulationResult:
+    """Esito della simulazione di un sistema su estrazioni casuali"""
+    combinations: int
+    combination_size: int
+    draws: int
+    sorte: int                # Punti su cui è puntata ogni combinazione
+    stake: float              # Euro giocati per combinazione
+    best_counts: List[int]    # Estrazioni per punteggio migliore tra le combinazioni
+    payout_mean: float        # Vincita media per estrazione (euro)
+    payout_std: float         # Deviazione standard della vincita per estrazione
+
+    @property
+    def cost(self) -> float:
+        """Euro giocati a ogni estrazione"""
+        return self.combinations * self.stake
+
+    def hit_probability(self, hits: int) -> float:
+        """Probabilità che almeno una combinazione faccia almeno `hits` punti"""
+        return sum(self.best_counts[hits:]) / self.draws
+
+    def hit_interval(self, hits: int, z: float = 1.96) -> Tuple[float, float]:
+        """Intervallo di confidenza di Wilson (95% di default) della probabilità"""
+        p, n = self.hit_probability(hits), self.draws
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return max(0.0, center - margin), min(1.0, center + margin)
+
+    @property
+    def expected_return(self) -> float:
+        """Vincita attesa per euro giocato"""
+        return self.payout_mean / self.cost
+
+    def return_interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """Intervallo di confidenza (95% di default) della vincita attesa per euro"""
+        margin = z * self.payout_std / math.sqrt(self.draws) / self.cost
+        return self.expected_return - margin, self.expected_return + margin
+
+def random_draws(rng: np.random.Generator, count: int) -> np.ndarray:
+    """
+    Estrazioni casuali di 5 numeri distinti tra 1 e 90.
+
+    Si estraggono 5 numeri con ripetizione e si rifanno solo le righe con
+    doppioni (circa l'11%), finché non ne restano.
+    """
+    draws = rng.integers(1, 91, size=(count, 5), dtype=np.uint8)
+    redo = np.arange(count)
+    while redo.size:
+        ordered = np.sort(draws[redo], axis=1)
+        redo = redo[(ordered[:, 1:] == ordered[:, :-1]).any(axis=1)]
+        draws[redo] = rng.integers(1, 91, size=(len(redo), 5), dtype=np.uint8)
+    return draws
+
+def payout_table(combination_size: int, sorte: int, stake: float) -> np.ndarray:
+    """
+    Vincita di una combinazione per numero di punti.
+
+    Con k numeri puntati sulla sorte s, h punti valgono
+    premio[s] * C(h, s) / C(k, s) per euro giocato.
+    """
+    table = np.zeros(6, dtype=np.float64)
+    for hits in range(sorte, min(combination_size, 5) + 1):
+        table[hits] = PRIZES[sorte] * math.comb(hits, sorte) / math.comb(combination_size, sorte) * stake
+    return table
+
+def simulate_batch(combination_masks: np.ndarray, payouts: np.ndarray, draws: int,
+                   seed: int, chunk_cells: int = 1 << 22) -> Tuple[np.ndarray, float, float]:
+    """
+    Gioca le combinazioni su `draws` estrazioni casuali.
+
+    Args:
+        payouts: Vincita per numero di punti (payout_table)
+
+    Returns:
+        Tuple: estrazioni per punteggio migliore (6,), somma delle vincite e
+               somma dei quadrati delle vincite per estrazione
+    """
+    rng = np.random.default_rng(seed)
+    sorte = int(np.flatnonzero(payouts)[0])
+    chunk = max(1, chunk_cells // len(combination_masks))
+    best_counts = np.zeros(6, dtype=np.int64)
+    total, total_squares = 0.0, 0.0
+    for begin in range(0, draws, chunk):
+        draw_masks = numbers_to_packed(random_draws(rng, min(chunk, draws - begin)))
+        hits = SystemBacktester.hits(combination_masks, draw_masks)
+        best = hits.max(axis=0)
+        best_counts += np.bincount(best, minlength=6)[:6]
+        # Solo le estrazioni in cui almeno una combinazione vince pagano qualcosa
+        per_draw = payouts[hits[:, best >= sorte]].sum(axis=0)
+        total += float(per_draw.sum())
+        total_squares += float(np.dot(per_draw, per_draw))
+    return best_counts, total, total_squares
+
+class SystemSimulator:
+    """
+    Stima Monte Carlo di probabilità di vincita e resa attesa di un sistema.
+
+    Le estrazioni casuali sono generate a lotti vettorizzati e confrontate
+    con le combinazioni tramite maschere di bit e popcount, come nella
+    verifica storica. I lotti sono distribuiti su più processi; ogni lotto
+    ha il proprio seed derivato da quello della simulazione, quindi il
+    risultato non dipende dal numero di processi.
+    """
+
+    def __init__(self, draws: int = 1_000_000, workers: Optional[int] = None,
+                 seed: Optional[int] = None, batch_draws: int = 250_000):
+        """
+        Args:
+            draws: Estrazioni casuali da simulare
+            workers: Processi paralleli (default: numero di core)
+            seed: Seed per risultati riproducibili
+            batch_draws: Estrazioni per lotto assegnato a un processo
+        """
+        if draws < 1:
+            raise ValueError("Il numero di estrazioni deve essere positivo")
+        if workers is not None and workers < 1:
+            raise ValueError("Il numero di processi deve essere positivo")
+        self.draws = draws
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.batch_draws = batch_draws
+
+    @timed("SystemSimulator.run")
+    def run(self, combinations: Iterable[Tuple[int, ...]], sorte: Optional[int] = None,
+            stake: float = 1.0) -> SimulationResult:
+        """
+        Simula il sistema.
+
+        Args:
+            combinations: Combinazioni del sistema
+            sorte: Punti su cui puntare ogni combinazione (default: numeri per combinazione, max 5)
+            stake: Euro per combinazione
+
+        Returns:
+            SimulationResult: Probabilità, vincita attesa e relativi intervalli di confidenza
+        """
+        numbers = np.array(list(combinations), dtype=np.int64)
+        if numbers.size == 0:
+            raise ValueError("Il sistema non contiene combinazioni")
+        if numbers.min() < 1 or numbers.max() > 90:
+            raise ValueError("I numeri delle combinazioni devono essere tra 1 e 90")
+        size = numbers.shape[1]
+        sorte = min(size, 5) if sorte is None else sorte
+        if sorte < 1 or sorte > min(size, 5):
+            raise ValueError(f"La sorte deve essere tra 1 e {min(size, 5)}")
+        if stake <= 0:
+            raise ValueError("La puntata deve essere positiva")
+
+        masks = numbers_to_packed(numbers)
+        payouts = payout_table(size, sorte, stake)
+        batches = [min(self.batch_draws, self.draws - begin)
+                   for begin in range(0, self.draws, self.batch_draws)]
+        seeds = [int(seed) for seed in np.random.SeedSequence(self.seed).generate_state(len(batches))]
+
+        workers = min(self.workers, len(batches))
+        if workers == 1:
+            results = [simulate_batch(masks, payouts, count, seed) for count, seed in zip(batches, seeds)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(simulate_batch, [masks] * len(batches),
+                                            [payouts] * len(batches), batches, seeds))
+
+        best_counts = sum(result[0] for result in results)
+        total = sum(result[1] for result in results)
+        total_squares = sum(result[2] for result in results)
+        mean = total / self.draws
+        variance = max(total_squares / self.draws - mean * mean, 0.0)
+        levels = min(size, 5) + 1
+        return SimulationResult(
+            combinations=len(numbers),
+            combination_size=size,
+            draws=self.draws,
+            sorte=sorte,
+            stake=stake,
+            best_counts=best_counts[:levels].tolist(),
+            payout_mean=mean,
+            payout_std=math.sqrt(variance * self.draws / max(self.draws - 1, 1))
+        )
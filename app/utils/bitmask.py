@@ -0,0 +1,22 @@
+# app/utils/bitmask.py
+import numpy as np
+
+# I numeri 1-90 occupano i bit 0-89 di una maschera da 96 bit (12 byte)
+MASK_BYTES = 12
+
+def numbers_to_packed(numbers: np.ndarray) -> np.ndarray:
+    """Converte combinazioni (n, k) di numeri 1-90 in maschere impacchettate (n, 12) uint8"""
+    numbers = np.asarray(numbers, dtype=np.intp)
+    bits = np.zeros((len(numbers), MASK_BYTES * 8), dtype=np.uint8)
+    bits[np.arange(len(numbers))[:, None], numbers - 1] = 1
+    return np.packbits(bits, axis=1, bitorder='little')
+
+def packed_to_numbers(masks: np.ndarray, combination_size: int) -> np.ndarray:
+    """Converte maschere impacchettate (n, 12) in combinazioni (n, k) ordinate"""
+    bits = np.unpackbits(masks, axis=-1, bitorder='little')
+    _, positions = np.nonzero(bits.reshape(-1, MASK_BYTES * 8))
+    return (positions + 1).astype(np.uint8).reshape(len(masks), combination_size)
+
+def unpack_presence(masks: np.ndarray) -> np.ndarray:
+    """Espande maschere (..., 12) in un array di presenza (..., 90) uint8"""
+    return np.unpackbits(masks, axis=-1, bitorder='little')[..., :90]
@@ -0,0 +1,76 @@
+# app/utils/shared_arrays.py
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Tuple
+import numpy as np
+
+ALIGNMENT = 64  # Ogni array parte da un offset allineato alla linea di cache
+
+@dataclass(frozen=True)
+class SharedArraysHandle:
+    """Riferimento serializzabile a un blocco di SharedArrays: è ciò che si passa ai worker"""
+    name: str
+    layout: Tuple[Tuple[str, str, Tuple[int, ...], int], ...]  # (chiave, dtype, forma, offset)
+
+    def attach(self) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+        """
+        Collega il blocco e restituisce viste NumPy in sola lettura, senza copie.
+
+        Il SharedMemory restituito va tenuto vivo finché si usano le viste.
+        """
+        block = shared_memory.SharedMemory(name=self.name)
+        return block, _views(block, self.layout, writeable=False)
+
+def _views(block: shared_memory.SharedMemory, layout, writeable: bool) -> Dict[str, np.ndarray]:
+    arrays = {}
+    for key, dtype, shape, offset in layout:
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf, offset=offset)
+        array.flags.writeable = writeable
+        arrays[key] = array
+    return arrays
+
+class SharedArrays:
+    """
+    Array NumPy copiati una sola volta in un blocco di memoria condivisa.
+
+    Il processo che crea il blocco ne è il proprietario e lo libera con
+    close(); i worker ricevono solo `handle` (nome e disposizione degli
+    array) e con handle.attach() ottengono viste sugli stessi byte, quindi
+    avviare un worker non copia né serializza i dati.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        layout, size = [], 0
+        for key, array in arrays.items():
+            size = -(-size // ALIGNMENT) * ALIGNMENT
+            layout.append((key, array.dtype.str, tuple(array.shape), size))
+            size += array.nbytes
+
+        self._block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.arrays = _views(self._block, layout, writeable=True)
+        for key, array in arrays.items():
+            self.arrays[key][...] = array
+            self.arrays[key].flags.writeable = False
+        self.handle = SharedArraysHandle(self._block.name, tuple(layout))
+        self.nbytes = size
+        self.closed = False
+
+    def close(self) -> None:
+        """Rilascia e rimuove il blocco (i worker già collegati mantengono la loro mappatura)"""
+        if self.closed:
+            return
+        self.closed = True
+        # Le viste del proprietario devono sparire prima di chiudere il buffer
+        self.arrays = {}
+        try:
+            self._block.close()
+        except BufferError:
+            # Qualcuno usa ancora una vista: la mappatura si chiude quando viene rilasciata
+            pass
+        self._block.unlink()
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
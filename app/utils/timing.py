@@ -0,0 +1,116 @@
+# app/utils/timing.py
+import atexit
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional
+import numpy as np
+
+class TimingRegistry:
+    """
+    Registro in-process dei tempi di esecuzione per fase.
+
+    Quando è disabilitato gli hook costano un solo controllo booleano,
+    quindi possono restare permanentemente nel codice.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._samples: Dict[str, List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+        # File del riepilogo all'uscita: l'handler atexit viene registrato una volta sola
+        self._exit_dump_path: Optional[str] = None
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def record(self, name: str, elapsed: float) -> None:
+        """Registra la durata (in secondi) di un'esecuzione della fase"""
+        with self._lock:
+            self._samples[name].append(elapsed)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Calcola le statistiche per fase.
+
+        Returns:
+            Dict: Per ogni fase count, total, mean, p50, p95, p99 e max (in secondi)
+        """
+        with self._lock:
+            samples = {name: np.array(values) for name, values in self._samples.items()}
+
+        report = {}
+        for name, values in sorted(samples.items()):
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            report[name] = {
+                'count': int(values.size),
+                'total': float(values.sum()),
+                'mean': float(values.mean()),
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+                'max': float(values.max()),
+            }
+        return report
+
+    def dump_json(self, path: str) -> None:
+        """Salva il riepilogo in formato JSON"""
+        with open(path, 'w') as handle:
+            json.dump(self.summary(), handle, indent=2)
+
+    def install_exit_dump(self, path: str) -> None:
+        """
+        Abilita la raccolta e salva il riepilogo su `path` all'uscita del processo.
+
+        Chiamate successive cambiano solo il file: il riepilogo viene scritto una volta.
+        """
+        self.enable()
+        if self._exit_dump_path is None:
+            atexit.register(self._dump_at_exit)
+        self._exit_dump_path = path
+
+    def _dump_at_exit(self) -> None:
+        if self._exit_dump_path:
+            self.dump_json(self._exit_dump_path)
+
+# Registro condiviso da tutti gli hook dell'applicazione
+registry = TimingRegistry()
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Misura il blocco `with` e lo registra sotto il nome della fase"""
+    if not registry.enabled:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.record(name, time.perf_counter() - start)
+
+def timed(name: str) -> Callable:
+    """Decoratore che misura ogni chiamata della funzione decorata"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
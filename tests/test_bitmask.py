@@ -0,0 +1,17 @@
+import numpy as np
+from utils.bitmask import MASK_BYTES, numbers_to_packed, packed_to_numbers, unpack_presence
+
+def test_round_trip():
+    numbers = np.array([[1, 2, 3], [88, 89, 90], [5, 45, 77]], dtype=np.uint8)
+    masks = numbers_to_packed(numbers)
+
+    assert masks.shape == (3, MASK_BYTES)
+    assert np.array_equal(packed_to_numbers(masks, 3), numbers)
+
+def test_unpack_presence_keeps_leading_axes():
+    masks = numbers_to_packed(np.array([[1, 90], [2, 3]])).reshape(1, 2, MASK_BYTES)
+    presence = unpack_presence(masks)
+
+    assert presence.shape == (1, 2, 90)
+    assert np.flatnonzero(presence[0, 0]).tolist() == [0, 89]
+    assert presence.sum() == 4
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from unittest.mock import patch, MagicMock
 from cli import LottoConsole
 from config import Config
@@ -12,6 +13,7 @@ class MockConsole(LottoConsole):
         self.stdout = string_io
         self.config = Config()
         self.service = MagicMock()
+        self.covering_library = None
         
         # Configura il formatter mock con valori di ritorno reali
         self.formatter = MagicMock()
@@ -19,10 +21,20 @@ class MockConsole(LottoConsole):
         self.formatter.format_prediction.return_value = "Test Prediction Output"
         self.formatter.format_statistics.return_value = "Test Statistics Output"
         self.formatter.format_frequency_chart.return_value = "Test Frequency Chart"
-        self.formatter.format_integral_system.side_effect = lambda nums, n: "Test Integral System Output" if 2 <= n <= 4 else self.formatter.format_error("Il numero di numeri deve essere tra 2 e 4")
+        self.formatter.format_integral_system.side_effect = lambda nums, n, filters=None: "Test Integral System Output" if 2 <= n <= 4 else self.formatter.format_error("Il numero di numeri deve essere tra 2 e 4")
         self.formatter.format_reduced_system.side_effect = lambda nums, n: "Test Reduced System Output" if 2 <= n <= 4 else self.formatter.format_error("Il numero di numeri deve essere tra 2 e 4")
         self.formatter.format_guaranteed_system.side_effect = lambda nums, n, win: "Test Guaranteed System Output" if 2 <= win <= 4 and n >= win else self.formatter.format_error("Combinazione non valida")
 
+        # I metodi write_* scrivono sullo stream l'output dei corrispondenti format_*
+        def writer(format_method):
+            return lambda *args, **kwargs: print(format_method(*args, **kwargs), file=string_io)
+        self.formatter.write_prediction.side_effect = writer(self.formatter.format_prediction)
+        self.formatter.write_statistics.side_effect = writer(self.formatter.format_statistics)
+        self.formatter.write_frequency_chart.side_effect = writer(self.formatter.format_frequency_chart)
+        self.formatter.write_integral_system.side_effect = writer(self.formatter.format_integral_system)
+        self.formatter.write_reduced_system.side_effect = writer(self.formatter.format_reduced_system)
+        self.formatter.write_guaranteed_system.side_effect = writer(self.formatter.format_guaranteed_system)
+
     def preloop(self):
         pass
         
@@ -104,9 +116,24 @@ def test_quit_command(mock_cli):
     assert result is True
     assert "Arrivederci" in fake_out.getvalue()
 
+def test_eof_quits_and_closes_service(mock_cli):
+    console, fake_out = mock_cli
+
+    assert console.do_EOF("") is True
+    console.service.close.assert_called_once()
+
+def test_main_closes_service_on_interrupt():
+    from cli import main
+    console = MagicMock()
+    console.cmdloop.side_effect = KeyboardInterrupt
+
+    with patch('cli.LottoConsole', return_value=console), pytest.raises(SystemExit):
+        main()
+    console.service.close.assert_called_once()
+
 def test_stats_command(mock_cli):
     console, fake_out = mock_cli
-    console.service.predict.return_value = ([], ["test data"])
+    console.service.get_history.return_value = ["test data"]
     
     console.do_stats("MI")
     output = fake_out.getvalue()
@@ -116,18 +143,41 @@ def test_stats_command(mock_cli):
 
 def test_stats_invalid_wheel(mock_cli):
     console, fake_out = mock_cli
-    console.service.predict.side_effect = ValueError("Ruota non valida")
+    console.service.get_history.side_effect = ValueError("Ruota non valida")
     
     console.do_stats("XX")
     assert "Errore: Ruota non valida" in fake_out.getvalue()
 
 def test_stats_no_data(mock_cli):
     console, fake_out = mock_cli
-    console.service.predict.return_value = ([], [])
+    console.service.get_history.return_value = []
     
     console.do_stats("MI")
     assert "Errore: Nessun dato storico" in fake_out.getvalue()
 
+def test_stats_window(mock_cli):
+    console, fake_out = mock_cli
+    console.service.get_history.return_value = ["test data"]
+
+    console.do_stats("MI 01/01/2020 31/12/2023")
+    console.service.get_history.assert_called_with("MI", start="20200101", end="20231231")
+    console.formatter.format_statistics.assert_called_with(
+        ["test data"], "MI (01/01/2020 - 31/12/2023)", version=console.service.data_version,
+        window=(('end', '20231231'), ('start', '20200101')))
+
+    console.do_stats("MI last 500")
+    console.service.get_history.assert_called_with("MI", last=500)
+    assert "Test Statistics Output" in fake_out.getvalue()
+
+def test_stats_invalid_window(mock_cli):
+    console, fake_out = mock_cli
+
+    console.do_stats("MI last abc")
+    assert "Errore: Il numero di estrazioni deve essere un intero" in fake_out.getvalue()
+
+    console.do_stats("MI 01/01/2020")
+    assert "Errore: Uso corretto: stats" in fake_out.getvalue()
+
 @pytest.fixture
 def mock_converter():
     """Fixture che fornisce un mock del convertitore"""
@@ -201,4 +251,272 @@ def test_sistema_command_invalid_input(mock_cli):
 
     # Test data invalida
     console.do_sistema("2024-01-01 MI integrale 2")
-    assert "Errore: Formato data non valido" in fake_out.getvalue()
\ No newline at end of file
+    assert "Errore: Formato data non valido" in fake_out.getvalue()
+
+def test_timing_command(mock_cli):
+    """Testa il comando timing"""
+    console, fake_out = mock_cli
+    console.formatter.format_timing.return_value = "Test Timing Output"
+
+    console.do_timing("on")
+    assert "attivata" in fake_out.getvalue()
+
+    console.do_timing("show")
+    assert "Test Timing Output" in fake_out.getvalue()
+
+    console.do_timing("off")
+    assert "disattivata" in fake_out.getvalue()
+
+    console.do_timing("invalido")
+    assert "Errore: Uso corretto: timing" in fake_out.getvalue()
+
+def test_output_command(mock_cli):
+    """Testa il comando output"""
+    console, fake_out = mock_cli
+    console.formatter.mode = 'plain'
+
+    console.do_output("")
+    assert "Modalità di output corrente: plain" in fake_out.getvalue()
+
+    console.do_output("json")
+    console.formatter.set_mode.assert_called_with("json")
+    assert "Modalità di output impostata: json" in fake_out.getvalue()
+
+    console.formatter.set_mode.side_effect = ValueError("Modalità di output 'x' non valida")
+    console.do_output("x")
+    assert "Errore: Modalità di output 'x' non valida" in fake_out.getvalue()
+
+def test_split_options(mock_cli):
+    console, _ = mock_cli
+    args, options = console._split_options(
+        "01/01/2024 MI integrale 2 --numeri 1,2,3 --esporta out.bin --esatto".split())
+
+    assert args == ["01/01/2024", "MI", "integrale", "2"]
+    assert options == {"numeri": ["1,2,3"], "esporta": ["out.bin"], "esatto": []}
+
+def test_sistema_custom_numbers(mock_cli):
+    console, fake_out = mock_cli
+
+    console.do_sistema("01/01/2024 MI integrale 2 --numeri 10,20,30")
+    console.formatter.format_integral_system.assert_called_with([10, 20, 30], 2, filters=None)
+    console.service.predict.assert_not_called()
+
+    console.do_sistema("01/01/2024 MI integrale 2 --numeri 10,95")
+    assert "Errore: I numeri base devono essere tra 1 e 90" in fake_out.getvalue()
+
+def test_sistema_export(mock_cli, tmp_path):
+    console, fake_out = mock_cli
+    output_file = tmp_path / "sistema.csv"
+
+    console.do_sistema(f"01/01/2024 MI integrale 2 --numeri 1,2,3,4 --esporta {output_file}")
+
+    assert "Esportate 6 combinazioni" in fake_out.getvalue()
+    assert output_file.read_text().splitlines()[0] == "1;2"
+
+def test_sistema_storico(mock_cli):
+    from models.history_store import WheelHistory
+    console, fake_out = mock_cli
+    console.service.get_history.return_value = WheelHistory(
+        np.array([[1, 2, 3, 4, 5], [1, 10, 20, 30, 40]], dtype=np.uint8),
+        np.array(['2024-01-01', '2024-01-02'], dtype='datetime64[D]'))
+    console.formatter.format_backtest.side_effect = \
+        lambda label, result: f"Verifica {label} {result.hit_counts}"
+
+    console.do_sistema("01/01/2024 MI integrale 2 --numeri 1,2,3 --storico last 50")
+
+    console.service.get_history.assert_called_once_with("MI", last=50)
+    # (1,2) fa ambo sulla prima e estratto sulla seconda; (1,3) idem; (2,3) ambo e niente
+    assert "Verifica MI (ultime 50) [1, 2, 3]" in fake_out.getvalue()
+
+def test_sistema_filtri(mock_cli, tmp_path):
+    from models.history_store import WheelHistory
+    from systems import SystemFilters
+    console, fake_out = mock_cli
+    console.service.get_history.return_value = WheelHistory(
+        np.array([[1, 2, 30, 40, 50]], dtype=np.uint8),
+        np.array(['2024-01-01'], dtype='datetime64[D]'))
+    output_file = tmp_path / "filtrato.csv"
+
+    console.do_sistema(f"01/01/2024 MI integrale 2 --numeri 1,2,3,4 --filtri pari=1 ambi=20 "
+                       f"--esporta {output_file}")
+
+    console.service.get_history.assert_called_once_with("MI", last=20)
+    # Un pari e un dispari, senza l'ambo 1-2 già uscito
+    assert output_file.read_text().splitlines() == ["1;4", "2;3", "3;4"]
+
+    console.do_sistema("01/01/2024 MI integrale 2 --numeri 1,2,3,4 --filtri somma=5-")
+    console.formatter.format_integral_system.assert_called_with(
+        [1, 2, 3, 4], 2, filters=SystemFilters(sum_min=5))
+
+def test_sistema_filtri_errors(mock_cli):
+    console, fake_out = mock_cli
+
+    console.do_sistema("01/01/2024 MI ridotto 2 --numeri 1,2,3,4 --filtri pari=1")
+    assert "--filtri vale solo per i sistemi integrali" in fake_out.getvalue()
+    console.do_sistema("01/01/2024 MI integrale 2 --numeri 1,2,3,4 --filtri somma=9-3")
+    assert "Intervallo del filtro somma non valido" in fake_out.getvalue()
+    console.do_sistema("01/01/2024 MI integrale 2 --numeri 1,2,3,4 --filtri ambi=0")
+    assert "Il filtro ambi richiede" in fake_out.getvalue()
+    console.formatter.write_integral_system.assert_not_called()
+
+def test_stats_all(mock_cli):
+    console, fake_out = mock_cli
+    console.service.stats_all.return_value = {"MI": "stats"}
+    console.formatter.write_all_statistics.side_effect = \
+        lambda stats, label: print(f"Tabella {label}", file=fake_out)
+
+    console.do_stats("all last 100")
+
+    console.service.stats_all.assert_called_once_with(last=100)
+    assert "Tabella Tutte le ruote (ultime 100)" in fake_out.getvalue()
+    console.service.get_history.assert_not_called()
+
+def test_segue_command(mock_cli):
+    console, fake_out = mock_cli
+    console.service.followers.return_value = ([(6, 2, 0.5)], 4)
+    console.formatter.format_followers.return_value = "Test Followers Output"
+
+    console.do_segue("mi 90")
+    console.service.followers.assert_called_once_with("MI", 90)
+    assert "Test Followers Output" in fake_out.getvalue()
+
+    console.do_segue("MI abc")
+    assert "Errore: Il numero deve essere un intero" in fake_out.getvalue()
+
+    console.do_segue("MI")
+    assert "Errore: Uso corretto: segue" in fake_out.getvalue()
+
+def test_correlazioni_command(mock_cli):
+    console, fake_out = mock_cli
+    console.service.correlations.return_value = []
+    console.formatter.format_correlations.return_value = "Test Correlations Output"
+
+    console.do_correlazioni("")
+    console.service.correlations.assert_called_once_with(10)
+    assert "Test Correlations Output" in fake_out.getvalue()
+
+    console.do_correlazioni("20")
+    console.service.correlations.assert_called_with(20)
+
+    console.do_correlazioni("abc")
+    assert "Errore: Il numero di coppie deve essere un intero" in fake_out.getvalue()
+
+    console.do_correlazioni("1 2")
+    assert "Errore: Uso corretto: correlazioni" in fake_out.getvalue()
+
+def test_tune_command(mock_cli):
+    console, fake_out = mock_cli
+    console.formatter.format_tuning.return_value = "Test Tuning Output"
+
+    console.do_tune("--fold 3 --processi 2")
+    console.service.tune.assert_called_once_with(3, 2)
+    assert "Test Tuning Output" in fake_out.getvalue()
+    assert console.config.TUNING_FILE in fake_out.getvalue()
+
+    console.do_tune("")
+    console.service.tune.assert_called_with(5, None)
+
+    console.do_tune("--fold 0")
+    assert "Errore: L'opzione --fold richiede un intero positivo" in fake_out.getvalue()
+    assert console.service.tune.call_count == 2
+
+def test_ricarica_command(mock_cli):
+    console, fake_out = mock_cli
+    console.service.reload.return_value = 3
+    console.service.data_version = 3
+    console.service.watching = True
+    console.service.last_reload_error = None
+
+    console.do_ricarica("")
+    assert "Dati ricaricati: versione 3" in fake_out.getvalue()
+
+    console.do_ricarica("on")
+    console.service.start_watching.assert_called_once()
+    console.do_ricarica("off")
+    console.service.stop_watching.assert_called_once()
+
+    console.do_ricarica("stato")
+    assert "Versione dei dati: 3" in fake_out.getvalue()
+    assert "Ricaricamento automatico: attivo" in fake_out.getvalue()
+
+    console.do_ricarica("boh")
+    assert "Errore: Uso corretto: ricarica" in fake_out.getvalue()
+
+def test_sistema_migliora(mock_cli, tmp_path):
+    from systems import CoveringLibrary
+    console, fake_out = mock_cli
+    console.covering_library = CoveringLibrary(str(tmp_path / "coperture.json"))
+
+    console.do_sistema("01/01/2024 MI garantito 3/2 --numeri 1,2,3,4,5,6,7 --migliora 1 --processi 1")
+
+    assert "Copertura: 15 -> 7 combinazioni" in fake_out.getvalue()
+    console.formatter.write_guaranteed_system.assert_called_once_with([1, 2, 3, 4, 5, 6, 7], 3, 2)
+
+    console.do_sistema("01/01/2024 MI integrale 2 --numeri 1,2,3 --migliora")
+    assert "Errore: L'opzione --migliora vale solo per i sistemi garantiti" in fake_out.getvalue()
+
+def test_sistema_esatto(mock_cli, tmp_path):
+    from systems import CoveringLibrary
+    console, fake_out = mock_cli
+    console.covering_library = CoveringLibrary(str(tmp_path / "coperture.json"))
+
+    console.do_sistema("01/01/2024 MI garantito 3/2 --numeri 1,2,3,4,5,6,7 --esatto 10")
+
+    assert "Copertura esatta: 7 combinazioni (minimo dimostrato" in fake_out.getvalue()
+    assert console.covering_library.source(7, 3, 2, 2) == 'exact'
+    console.formatter.write_guaranteed_system.assert_called_once_with([1, 2, 3, 4, 5, 6, 7], 3, 2)
+
+def test_sistema_simula(mock_cli):
+    console, fake_out = mock_cli
+    console.formatter.format_simulation.side_effect = \
+        lambda result: f"Simulazione {result.draws} {result.combinations} {result.sorte}"
+
+    console.do_sistema("01/01/2024 MI integrale 2 --numeri 1,2,3 --simula 1000 --processi 1")
+    assert "Simulazione 1000 3 2" in fake_out.getvalue()
+    console.formatter.write_integral_system.assert_not_called()
+
+    # Per i garantiti si gioca la sorte garantita, non la quaterna
+    console.formatter.format_simulation.side_effect = lambda result: f"Sorte {result.sorte}"
+    console.do_sistema("01/01/2024 MI garantito 4/2 --numeri 1,2,3,4,5,6 --simula 1000 --processi 1")
+    assert "Sorte 2" in fake_out.getvalue()
+
+def test_ultimi_command(mock_cli):
+    console, fake_out = mock_cli
+    counts = np.zeros(91, dtype=np.int64)
+    console.service.recent_frequencies.return_value = (counts, 18)
+
+    console.do_ultimi("18 mi")
+    console.service.recent_frequencies.assert_called_once_with("MI", 18)
+    console.formatter.write_frequencies.assert_called_once_with(
+        counts, 18, "MI (ultime 18)", version=console.service.data_version, window=('ultimi', 18))
+
+    console.do_ultimi("0 MI")
+    assert "Errore: Il numero di estrazioni deve essere un intero positivo" in fake_out.getvalue()
+
+    console.do_ultimi("18")
+    assert "Errore: Uso corretto: ultimi" in fake_out.getvalue()
+
+    console.service.recent_frequencies.return_value = (counts, 0)
+    console.do_ultimi("18 BA")
+    assert "Nessun dato storico trovato per la ruota BA" in fake_out.getvalue()
+
+def test_report_command(mock_cli, tmp_path):
+    console, fake_out = mock_cli
+    report = MagicMock(wheels=[MagicMock()] * 11, elapsed=0.25, workers=2)
+    console.service.report.return_value = report
+    html_file, md_file = str(tmp_path / "r.html"), str(tmp_path / "r.md")
+
+    with patch('cli.ReportWriter.write') as write:
+        console.do_report(f"01/01/2024 --esporta {html_file} {md_file} --ultime 500 --processi 2")
+    console.service.report.assert_called_once_with("20240101", last=500, workers=2)
+    assert [call.args[1] for call in write.call_args_list] == [html_file, md_file]
+    assert "Report di 11 ruote scritto in" in fake_out.getvalue()
+    assert "Tempo totale:" in fake_out.getvalue()
+    assert "2 processi" in fake_out.getvalue()
+
+    console.do_report("01/01/2024 --esporta report.pdf")
+    assert "Estensione del report non riconosciuta" in fake_out.getvalue()
+    assert console.service.report.call_count == 1
+
+    console.do_report("")
+    assert "Errore: Uso corretto: report" in fake_out.getvalue()
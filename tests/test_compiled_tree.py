@@ -0,0 +1,118 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from predictors.compiled_tree import CompiledTree
+from predictors.compiled_tree_predictor import CompiledTreePredictor
+from predictors.decision_tree_predictor import DecisionTreePredictor
+from predictors.predictor_factory import PredictorFactory
+
+def lotto_frame(rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = 19_000_101 + rng.integers(0, 1_300_000, rows)
+    X = pd.DataFrame({'data': dates, 'ruota': rng.integers(1, 12, rows)})
+    y = pd.DataFrame(np.sort(rng.choice(np.arange(1, 91), size=(rows, 5)), axis=1),
+                     columns=['n1', 'n2', 'n3', 'n4', 'n5'])
+    return X, y
+
+def trained_tree(**params):
+    X, y = lotto_frame()
+    predictor = DecisionTreePredictor(**params)
+    predictor.train(X, y)
+    return predictor, X
+
+@pytest.mark.parametrize('params', [{}, {'max_depth': 4}, {'min_samples_leaf': 5, 'criterion': 'entropy'}])
+def test_compiled_tree_matches_sklearn(params):
+    predictor, X = trained_tree(**params)
+    tree = CompiledTree.from_classifier(predictor.model)
+    # Date nuove, anche tra due date viste (float32 arrotonda i valori YYYYMMDD)
+    dates = np.arange(18_990_000, 20_400_000, 997)
+    probe = np.column_stack([dates, np.arange(len(dates)) % 11 + 1])
+    probe = np.vstack([X.to_numpy(), probe])
+
+    assert np.array_equal(tree.predict(probe), predictor.model.predict(probe))
+    assert tree.labels.dtype == np.uint8
+
+def test_save_and_load_round_trip(tmp_path):
+    predictor, X = trained_tree(max_depth=6)
+    path = str(tmp_path / "albero.npz")
+    tree = predictor.export(path)
+
+    loaded = CompiledTreePredictor.load(path)
+    assert loaded.tree.node_count == tree.node_count
+    for date, wheel in X.to_numpy()[:20]:
+        assert loaded.predict([str(date), int(wheel)]) == predictor.predict([str(date), int(wheel)])
+
+def test_load_invalid_file(tmp_path):
+    path = tmp_path / "vuoto.npz"
+    np.savez(path, feature=np.zeros(1))
+    with pytest.raises(ValueError):
+        CompiledTree.load(str(path))
+    with pytest.raises(ValueError):
+        CompiledTree.load(str(tmp_path / "mancante.npz"))
+
+def test_untrained_models_raise():
+    with pytest.raises(ValueError):
+        CompiledTreePredictor().predict(['20240101', 5])
+    with pytest.raises(ValueError):
+        DecisionTreePredictor().export("albero.npz")
+
+def test_factory_compiled_tree_exports_on_train(tmp_path):
+    path = str(tmp_path / "albero.npz")
+    predictor = PredictorFactory.create_predictor("compiled_tree", str(tmp_path / "tuning.json"), path)
+    X, y = lotto_frame(rows=100)
+    predictor.train(X, y)
+
+    assert os.path.exists(path)
+    assert len(predictor.predict(['20240101', 5])) == 5
+
+def test_inference_does_not_import_sklearn(tmp_path):
+    predictor, _ = trained_tree(max_depth=5)
+    path = str(tmp_path / "albero.npz")
+    predictor.export(path)
+    expected = predictor.predict(['20240101', 5])
+
+    script = (
+        "import sys\n"
+        "from predictors.compiled_tree_predictor import CompiledTreePredictor\n"
+        f"print(CompiledTreePredictor.load({path!r}).predict(['20240101', 5]))\n"
+        "print('sklearn' in sys.modules)\n"
+    )
+    app_dir = os.path.dirname(os.path.dirname(sys.modules[CompiledTree.__module__].__file__))
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                            env={**os.environ, 'PYTHONPATH': app_dir}, check=True).stdout.split("\n")
+    assert output[0] == str(expected)
+    assert output[1] == "False"
+
+def test_service_loads_exported_tree_without_sklearn(tmp_path):
+    from config import Config
+    from services.lotto_service import LottoService
+
+    csv = tmp_path / "estrazioni.csv"
+    csv.write_text("data;ruota;n1;n2;n3;n4;n5\n01/01/2024;MI;1;2;3;4;5\n02/01/2024;NA;11;12;13;14;15\n")
+    config = dict(CSV_FILE=str(csv), TUNING_FILE=str(tmp_path / "tuning.json"),
+                  COMPILED_TREE_FILE=str(tmp_path / "albero.npz"))
+    trainer = LottoService(Config(**config))
+    trainer.initialize_predictor("compiled_tree")
+    trainer.train_model()
+    expected = trainer.predict('20240101', 'MI')[0]
+
+    script = (
+        "import sys\n"
+        "from config import Config\n"
+        "from services.lotto_service import LottoService\n"
+        f"service = LottoService(Config(**{config!r}))\n"
+        "service.initialize_predictor('compiled_tree')\n"
+        "service.train_model()\n"
+        "print(service.predict('20240101', 'MI')[0])\n"
+        "print(service.reload())\n"
+        "print('sklearn' in sys.modules)\n"
+    )
+    app_dir = os.path.dirname(os.path.dirname(sys.modules[CompiledTree.__module__].__file__))
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                            env={**os.environ, 'PYTHONPATH': app_dir}, check=True).stdout.split("\n")
+    assert output[0] == str(expected)
+    assert output[1] == "2"
+    assert output[2] == "False"
@@ -0,0 +1,45 @@
+import pytest
+from systems import CoverSearch, CoveringLibrary, GuaranteedSystem
+from systems.cover_search import anneal
+from systems.covering_library import greedy_cover, is_covering
+
+def test_anneal_reaches_fano_plane():
+    # Il piano di Fano: 7 terzine bastano per coprire tutti gli ambi di 7 numeri
+    initial = greedy_cover(7, 3, 2, 2)
+    blocks = anneal(7, 3, 2, 2, initial, seconds=1.0, seed=1)
+
+    assert len(blocks) == 7 < len(initial)
+    assert is_covering(blocks, 7, 2, 2)
+
+def test_search_keeps_initial_when_nothing_better():
+    # Per un terno su 4 numeri servono tutte e 4 le terzine: la greedy è già ottima
+    initial = greedy_cover(4, 3, 3, 3)
+    blocks = CoverSearch(seconds=0.2, workers=1, seed=0).improve(4, 3, 3, 3, initial)
+    assert blocks.tolist() == initial.tolist()
+
+def test_search_on_several_processes():
+    initial = greedy_cover(9, 3, 2, 2)
+    blocks = CoverSearch(seconds=0.5, workers=2, seed=3).improve(9, 3, 2, 2, initial)
+
+    assert len(blocks) <= len(initial)
+    assert is_covering(blocks, 9, 2, 2)
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        CoverSearch(seconds=0)
+    with pytest.raises(ValueError):
+        CoverSearch(workers=0)
+
+def test_improve_stores_smaller_cover(tmp_path):
+    library = CoveringLibrary(str(tmp_path / "coperture.json"))
+    system = GuaranteedSystem(library)
+    numbers = [3, 14, 15, 26, 53, 58, 79]
+
+    greedy = system.generate(numbers, 3, 2)
+    improved = system.improve(numbers, 3, 2, seconds=1.0, workers=1, seed=1)
+
+    assert len(improved) == 7 < len(greedy)
+    assert all(set(comb) <= set(numbers) for comb in improved)
+    assert list(library.entries()) == [((7, 3, 2, 2), 7, 'annealing')]
+    # Le richieste successive usano la copertura migliorata
+    assert system.generate(numbers, 3, 2) == improved
@@ -0,0 +1,85 @@
+import json
+import pytest
+import numpy as np
+from systems import CoveringLibrary, GuaranteedSystem
+from systems import guaranteed_system
+from systems.covering_library import greedy_cover, is_covering, main
+
+def test_is_covering():
+    # Le tre coppie di 3 numeri: ogni ambo è coperto
+    assert is_covering(np.array([[0, 1], [0, 2], [1, 2]]), 3, 2, 2)
+    assert not is_covering(np.array([[0, 1], [0, 2]]), 3, 2, 2)
+    # Con 3 estratti su 4 almeno un ambo cade sempre in {0,1} o {2,3}
+    assert is_covering(np.array([[0, 1], [2, 3]]), 4, 2, 3)
+    assert not is_covering(np.empty((0, 2)), 4, 2, 2)
+
+@pytest.mark.parametrize("v,k,t", [(5, 3, 2), (8, 3, 2), (9, 4, 3)])
+def test_greedy_cover_matches_previous_algorithm(v, k, t):
+    numbers = list(range(20, 20 + v))
+    system = GuaranteedSystem()
+    expected = system.optimize_combinations(
+        system.find_minimum_guaranteed_combinations(numbers, k, t), t)
+
+    blocks = greedy_cover(v, k, t, t)
+    assert CoveringLibrary.apply(blocks, numbers) == expected
+    assert is_covering(blocks, v, t, t)
+
+def test_greedy_cover_with_condition():
+    blocks = greedy_cover(8, 3, 2, 3)
+    assert is_covering(blocks, 8, 2, 3)
+    assert len(blocks) < len(greedy_cover(8, 3, 2, 2))
+
+def test_store_only_improves(tmp_path):
+    path = str(tmp_path / "coperture.json")
+    library = CoveringLibrary(path)
+    assert library.lookup(4, 2, 2, 2) is None
+
+    full = np.array([[0, 1], [0, 2], [0, 3], [1, 2], [1, 3], [2, 3]])
+    assert library.store(4, 2, 2, 2, full)
+    assert not library.store(4, 2, 2, 2, np.vstack([full, full[:1]]))
+    assert library.lookup(4, 2, 2, 2).tolist() == full.tolist()
+
+    # Una copertura migliore sostituisce quella salvata
+    better = np.array([[0, 1], [2, 3]])
+    assert library.store(4, 2, 2, 3, better, source='test')
+    assert [entry for entry in library.entries()] == [((4, 2, 2, 2), 6, 'greedy'), ((4, 2, 2, 3), 2, 'test')]
+
+    with pytest.raises(ValueError):
+        library.store(4, 2, 2, 3, np.array([[0, 1]]))
+
+def test_changes_from_other_processes_are_seen(tmp_path):
+    path = tmp_path / "coperture.json"
+    first, second = CoveringLibrary(str(path)), CoveringLibrary(str(path))
+    assert second.lookup(3, 2, 2, 2) is None
+
+    first.store(3, 2, 2, 2, np.array([[0, 1], [0, 2], [1, 2]]))
+    assert second.lookup(3, 2, 2, 2) is not None
+    assert json.loads(path.read_text())['covers']['3-2-2-2']['source'] == 'greedy'
+
+def test_apply_maps_indices_on_sorted_numbers():
+    assert CoveringLibrary.apply(np.array([[0, 2], [1, 2]]), [30, 10, 20]) == [(10, 30), (20, 30)]
+
+def test_generate_uses_library(tmp_path, monkeypatch):
+    library = CoveringLibrary(str(tmp_path / "coperture.json"))
+    system = GuaranteedSystem(library)
+
+    first = system.generate([5, 10, 15, 20, 25], 3, 2)
+    assert library.lookup(5, 3, 2, 2) is not None
+
+    def fail(*args):
+        raise AssertionError("La copertura doveva arrivare dall'archivio")
+    monkeypatch.setattr(guaranteed_system, 'greedy_cover', fail)
+
+    # Stesso schema, numeri base diversi
+    assert system.generate([1, 2, 3, 4, 5], 3, 2) == [tuple(n // 5 for n in comb) for comb in first]
+    with pytest.raises(ValueError):
+        system.generate([1, 2, 3, 4, 5], 3, 2, condition=6)
+
+def test_main_precomputes(tmp_path, capsys):
+    path = str(tmp_path / "coperture.json")
+    main([path, '--fino-a', '5'])
+
+    library = CoveringLibrary(path)
+    keys = [key for key, _, _ in library.entries()]
+    assert (5, 3, 2, 2) in keys and (3, 2, 2, 2) in keys
+    assert "coperture" in capsys.readouterr().out
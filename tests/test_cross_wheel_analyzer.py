@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+import pandas as pd
+from models.history_store import HistoryStore
+from services.cross_wheel_analyzer import CrossWheelAnalyzer
+
+WHEELS = {'BA': 1, 'MI': 5, 'NA': 6}
+
+@pytest.fixture
+def store():
+    rng = np.random.default_rng(7)
+    rows = []
+    dates = pd.date_range('2020-01-01', periods=200, freq='D').strftime('%Y%m%d').astype(int)
+    for day, date in enumerate(dates):
+        for wheel, code in WHEELS.items():
+            if wheel == 'NA' and day % 4 == 0:
+                continue  # NA non estratta in alcune date
+            numbers = rng.choice(np.arange(8, 90), size=5, replace=False)
+            if day % 2 == 0:
+                # 90 su MI esce sempre insieme al 7 su BA
+                numbers[0] = {'BA': 7, 'MI': 90, 'NA': numbers[0]}[wheel]
+            rows.append([date, code, *numbers])
+    df = pd.DataFrame(rows, columns=['data', 'ruota', 'n1', 'n2', 'n3', 'n4', 'n5'])
+    return HistoryStore.from_dataframe(df, WHEELS)
+
+def test_co_occurrence_matches_loop(store):
+    analyzer = CrossWheelAnalyzer(store, chunk_dates=5)
+    counts, margins, shared = analyzer.co_occurrence()
+
+    expected = np.zeros((270, 270), dtype=np.int64)
+    by_date = {}
+    for index, wheel in enumerate(store):
+        history = store[wheel]
+        for numbers, date in zip(history.numbers, history.dates):
+            by_date.setdefault(date, []).extend(index * 90 + int(num) - 1 for num in numbers)
+    for keys in by_date.values():
+        for i in keys:
+            for j in keys:
+                expected[i, j] += 1
+
+    assert np.array_equal(counts, expected)
+    assert shared[0, 1] == 200 and shared[0, 2] == 150
+    assert margins[:90, 0].sum() == 200 * 5
+
+def test_chunking_does_not_change_result(store):
+    small = CrossWheelAnalyzer(store, chunk_dates=3).correlation()
+    large = CrossWheelAnalyzer(store).correlation()
+    assert np.allclose(small, large)
+
+def test_strongest_pairs(store):
+    pairs = CrossWheelAnalyzer(store).strongest_pairs(3)
+
+    assert len(pairs) == 3
+    assert all(pair.wheel_a < pair.wheel_b for pair in pairs)
+    assert pairs[0].correlation >= pairs[1].correlation >= pairs[2].correlation
+    strongest = pairs[0]
+    assert (strongest.wheel_a, strongest.number_a, strongest.wheel_b, strongest.number_b) == ('BA', 7, 'MI', 90)
+    assert strongest.together == 100 and strongest.correlation == pytest.approx(1.0)
+    assert strongest.expected == pytest.approx(50.0)
+    with pytest.raises(ValueError):
+        CrossWheelAnalyzer(store).strongest_pairs(0)
+
+def test_unknown_wheel_rows_are_ignored():
+    df = pd.DataFrame([[20240101, WHEELS['BA'], 7, 10, 11, 12, 13],
+                       [20240101, WHEELS['MI'], 90, 20, 21, 22, 23],
+                       [20240101, 0, 7, 90, 30, 31, 32]],
+                      columns=['data', 'ruota', 'n1', 'n2', 'n3', 'n4', 'n5'])
+    analyzer = CrossWheelAnalyzer(HistoryStore.from_dataframe(df, WHEELS))
+    counts, margins, shared = analyzer.co_occurrence()
+
+    assert counts.sum() == 10 * 10
+    assert shared[0, 1] == 1
+    # 7 su BA e 90 su MI escono insieme; il 30 della riga sconosciuta non compare
+    assert counts[6, 90 + 89] == 1
+    assert counts[:, [29, 90 + 29, 180 + 29]].sum() == 0
+
+def test_empty_store():
+    analyzer = CrossWheelAnalyzer(HistoryStore.empty(WHEELS))
+    assert analyzer.strongest_pairs(5)[0].correlation == 0.0
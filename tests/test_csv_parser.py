@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+from config import Config
+from data.csv_parser import parse_lotto_csv
+from data.data_loader import DataLoader
+
+CSV = (b"data;ruota;n1;n2;n3;n4;n5\n"
+       b"07/01/1939;BA;58;22;47;49;69\n"
+       b"07/01/1939;FI;7;57;81;4;61\n"
+       b"14/01/1939;XX;1;2;3;90;5\n")
+
+def test_parse_lotto_csv():
+    dates, codes, numbers = parse_lotto_csv(CSV, Config().RUOTE)
+
+    assert dates.tolist() == [19390107, 19390107, 19390114]
+    # Le ruote sconosciute hanno codice 0, come nel caricamento con pandas
+    assert codes.tolist() == [1, 3, 0]
+    assert numbers.dtype == np.uint8
+    assert numbers.tolist() == [[58, 22, 47, 49, 69], [7, 57, 81, 4, 61], [1, 2, 3, 90, 5]]
+
+def test_parse_line_endings():
+    expected = parse_lotto_csv(CSV, Config().RUOTE)
+    blank_lines = CSV.replace(b"\n07/01/1939;FI", b"\n\n\r\n07/01/1939;FI")
+    for raw in (CSV.replace(b"\n", b"\r\n"), CSV.rstrip(b"\n"), CSV + b"\n\n", b"\n" + blank_lines):
+        for got, want in zip(parse_lotto_csv(raw, Config().RUOTE), expected):
+            assert got.tolist() == want.tolist()
+
+    dates, codes, numbers = parse_lotto_csv(b"data;ruota;n1;n2;n3;n4;n5\n", Config().RUOTE)
+    assert len(dates) == len(codes) == len(numbers) == 0
+
+@pytest.mark.parametrize("row", [
+    b"07/01/1939;BA;58;22;47;49",        # Campo mancante
+    b"7/01/1939;BA;58;22;47;49;69",       # Data senza zero iniziale
+    b"07/01/1939;BA;58;22;147;49;69",     # Numero di tre cifre
+    b"07/01/1939;BA;58;2x;47;49;69",      # Numero non intero
+    b"07/01/1939;BA;58;22;47;49;0",       # Fuori intervallo
+    b"31/02/2024;BA;58;22;47;49;69",      # Giorno inesistente
+    b"29/02/2023;BA;58;22;47;49;69",      # Non bisestile
+    b"00/01/2024;BA;58;22;47;49;69",      # Giorno zero
+    b"07/13/2024;BA;58;22;47;49;69",      # Mese inesistente
+])
+def test_parse_rejects_bad_rows(row):
+    with pytest.raises(ValueError, match="Formato CSV non valido"):
+        parse_lotto_csv(b"data;ruota;n1;n2;n3;n4;n5\n" + row + b"\n", Config().RUOTE)
+
+def test_parse_accepts_leap_day():
+    dates, _, _ = parse_lotto_csv(b"data;ruota;n1;n2;n3;n4;n5\n29/02/2024;BA;1;2;3;4;5\n"
+                                  b"31/12/2024;BA;1;2;3;4;5\n", Config().RUOTE)
+    assert dates.tolist() == [20240229, 20241231]
+
+def test_parse_rejects_other_header():
+    with pytest.raises(ValueError, match="intestazione"):
+        parse_lotto_csv(b"ruota;data;n1;n2;n3;n4;n5\n", Config().RUOTE)
+
+def test_fast_backend_matches_pandas(tmp_path):
+    config = Config()
+    config.CSV_FILE = str(tmp_path / "estrazioni.csv")
+    # Una riga vuota in mezzo: pandas la salta e così deve fare il parser veloce
+    (tmp_path / "estrazioni.csv").write_bytes(CSV.replace(b"\n07/01/1939;FI", b"\n\n07/01/1939;FI"))
+    loader = DataLoader(config)
+
+    fast = loader.preprocess_data(loader.load_data())
+    config.CSV_BACKEND = 'pandas'
+    slow = loader.preprocess_data(loader.load_data())
+
+    assert fast.columns.tolist() == slow.columns.tolist()
+    assert (fast.dtypes == slow.dtypes).all()
+    assert (fast.to_numpy() == slow.to_numpy()).all()
+    assert len(fast) == 3
+
+    config.CSV_BACKEND = 'altro'
+    with pytest.raises(ValueError):
+        loader.load_data()
@@ -1,8 +1,10 @@
+import pytest
 from typing import List
 import pandas as pd
 from datetime import datetime
 from models.extraction import Extraction
 from config import Config
+from data import data_loader
 
 class DataLoader:
     def __init__(self, config: Config):
@@ -30,4 +32,49 @@ class DataLoader:
             
         # Altrimenti converti da stringa a numero
         df['ruota'] = df['ruota'].apply(lambda x: self.config.RUOTE.get(x, 0))
-        return df
\ No newline at end of file
+        return df
+
+# Test del caricatore reale
+
+def _write_csv(tmp_path, rows):
+    path = tmp_path / "estrazioni.csv"
+    path.write_text("data;ruota;n1;n2;n3;n4;n5\n" + "".join(row + "\n" for row in rows))
+    return str(path)
+
+def test_iter_extractions(tmp_path):
+    path = _write_csv(tmp_path, ["07/01/1939;BA;58;22;47;49;69",
+                                 "07/01/1939;FI;27;57;81;43;61",
+                                 "",
+                                 "14/01/1939;BA;1;2;3;4;5"])
+    loader = data_loader.DataLoader(Config())
+
+    extractions = list(loader.iter_extractions(path))
+    assert extractions[0] == Extraction(datetime(1939, 1, 7), 'BA', [58, 22, 47, 49, 69])
+    assert [e.ruota for e in extractions] == ['BA', 'FI', 'BA']
+    # Le ruote della stessa estrazione condividono l'oggetto data
+    assert extractions[0].data is extractions[1].data
+
+    date, wheel, numbers = extractions[2]
+    assert (date, wheel, numbers) == (datetime(1939, 1, 14), 'BA', (1, 2, 3, 4, 5))
+    assert [e.numeri[0] for e in loader.iter_extractions(path, ruota='BA')] == [58, 1]
+
+def test_iter_extractions_reports_bad_rows(tmp_path):
+    loader = data_loader.DataLoader(Config())
+    with pytest.raises(ValueError, match="Riga 3"):
+        list(loader.iter_extractions(_write_csv(tmp_path, ["07/01/1939;BA;58;22;47;49;69",
+                                                           "07/01/1939;FI;27;x;81;43;61"])))
+
+    bad_header = tmp_path / "intestazione.csv"
+    bad_header.write_text("giorno;ruota\n")
+    with pytest.raises(ValueError, match="Intestazione"):
+        list(loader.iter_extractions(str(bad_header)))
+
+    bad_header.write_text("giorno,ruota\n")
+    with pytest.raises(ValueError, match="giorno,ruota"):
+        list(data_loader.DataLoader(Config(CSV_DELIMITER=',')).iter_extractions(str(bad_header)))
+
+def test_extraction_uses_slots():
+    extraction = Extraction(datetime(2024, 1, 2), 'MI', [1, 2, 3, 4, 5])
+    assert not hasattr(extraction, '__dict__')
+    assert repr(extraction) == "Extraction(02/01/2024, MI, [1, 2, 3, 4, 5])"
+    assert len({extraction, Extraction(datetime(2024, 1, 2), 'MI', (1, 2, 3, 4, 5))}) == 1
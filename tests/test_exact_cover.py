@@ -0,0 +1,66 @@
+import pytest
+from systems import CoveringLibrary, ExactCoverSolver, GuaranteedSystem
+from systems.covering_library import greedy_cover, is_covering
+from systems.exact_cover import schonheim_bound
+
+@pytest.mark.parametrize("v,k,t,condition,minimum", [
+    (7, 3, 2, 2, 7),    # Piano di Fano
+    (8, 3, 2, 2, 11),
+    (9, 3, 2, 2, 12),   # Sistema di Steiner S(2,3,9)
+    (8, 3, 2, 3, 5),
+])
+def test_solver_proves_known_minimum(v, k, t, condition, minimum):
+    result = ExactCoverSolver(time_limit=30).solve(v, k, t, condition, greedy_cover(v, k, t, condition))
+
+    assert result.optimal
+    assert len(result.blocks) == result.lower_bound == minimum
+    assert is_covering(result.blocks, v, t, condition)
+
+def test_solver_without_initial_cover():
+    result = ExactCoverSolver().solve(5, 3, 2, 2)
+    assert result.optimal and len(result.blocks) == 4
+
+def test_schonheim_bound():
+    assert schonheim_bound(7, 3, 2) == 7
+    assert schonheim_bound(10, 3, 2) == 17
+    assert schonheim_bound(9, 4, 3) == 25
+
+def test_time_limit_returns_best_so_far():
+    initial = greedy_cover(11, 3, 2, 2)
+    result = ExactCoverSolver(time_limit=0.2, check_every=64).solve(11, 3, 2, 2, initial)
+
+    assert not result.optimal
+    assert result.lower_bound <= len(result.blocks) <= len(initial)
+    assert is_covering(result.blocks, 11, 2, 2)
+    with pytest.raises(ValueError):
+        ExactCoverSolver(time_limit=0)
+
+def test_time_limit_holds_on_large_systems():
+    initial = greedy_cover(20, 5, 3, 3)
+    result = ExactCoverSolver(time_limit=0.5).solve(20, 5, 3, 3, initial)
+
+    assert not result.optimal
+    assert result.elapsed < 0.5 + 0.25
+    assert is_covering(result.blocks, 20, 3, 3)
+
+def test_solve_exact_rejects_large_systems(tmp_path):
+    system = GuaranteedSystem(CoveringLibrary(str(tmp_path / "coperture.json")))
+    with pytest.raises(ValueError, match="troppo grande"):
+        system.solve_exact(list(range(1, 31)), 5, 3, time_limit=1)
+
+def test_solve_exact_stores_proven_cover(tmp_path):
+    library = CoveringLibrary(str(tmp_path / "coperture.json"))
+    # Una copertura da 7 già nota ma non dimostrata minima
+    fano = ExactCoverSolver().solve(7, 3, 2, 2).blocks
+    library.store(7, 3, 2, 2, fano, source='annealing')
+    system = GuaranteedSystem(library)
+
+    result = system.solve_exact([10, 20, 30, 40, 50, 60, 70], 3, 2)
+    assert result.optimal and len(result.blocks) == 7
+    assert library.source(7, 3, 2, 2) == 'exact'
+
+    # La seconda richiesta non ripete la ricerca
+    assert system.solve_exact([1, 2, 3, 4, 5, 6, 7], 3, 2).nodes == 0
+    assert not library.store(7, 3, 2, 2, fano, source='exact')
+    with pytest.raises(ValueError):
+        system.solve_exact([1, 2, 3, 4, 5, 6, 7], 3, 2, condition=1)
@@ -0,0 +1,51 @@
+import os
+import threading
+import pytest
+from services.file_watcher import FileWatcher
+
+def touch(path, content):
+    path.write_text(content)
+    # Garantisce una data di modifica diversa anche su filesystem poco precisi
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_check_detects_changes(tmp_path):
+    path = tmp_path / "dati.csv"
+    path.write_text("a")
+    calls = []
+    watcher = FileWatcher(str(path), lambda: calls.append(1))
+
+    assert not watcher.check()
+    touch(path, "ab")
+    assert watcher.check()
+    assert not watcher.check()
+    assert calls == [1]
+
+def test_missing_file_is_ignored(tmp_path):
+    path = tmp_path / "dati.csv"
+    calls = []
+    watcher = FileWatcher(str(path), lambda: calls.append(1))
+
+    assert not watcher.check()
+    path.write_text("a")
+    assert watcher.check()
+    path.unlink()
+    assert not watcher.check()
+    assert calls == [1]
+
+def test_background_thread(tmp_path):
+    path = tmp_path / "dati.csv"
+    path.write_text("a")
+    changed = threading.Event()
+    watcher = FileWatcher(str(path), changed.set, interval=0.01)
+
+    watcher.start()
+    assert watcher.running
+    touch(path, "ab")
+    assert changed.wait(5)
+    watcher.stop()
+    assert not watcher.running
+
+def test_invalid_interval(tmp_path):
+    with pytest.raises(ValueError):
+        FileWatcher(str(tmp_path / "dati.csv"), lambda: None, interval=0)
@@ -0,0 +1,141 @@
+import pytest
+import numpy as np
+import pandas as pd
+from collections.abc import Sequence
+from models.history_store import HistoryStore, WheelHistory, yyyymmdd_to_datetime64
+
+@pytest.fixture
+def preprocessed_data(config):
+    return pd.DataFrame({
+        'data': ['20240102', '20240101', '20240101', '20240103'],
+        'ruota': [config.RUOTE['MI'], config.RUOTE['MI'], config.RUOTE['NA'], config.RUOTE['MI']],
+        'n1': [6, 1, 11, 21], 'n2': [7, 2, 12, 22], 'n3': [8, 3, 13, 23],
+        'n4': [9, 4, 14, 24], 'n5': [10, 5, 15, 25]
+    })
+
+@pytest.fixture
+def store(preprocessed_data, config):
+    return HistoryStore.from_dataframe(preprocessed_data, config.RUOTE)
+
+def test_yyyymmdd_to_datetime64():
+    dates = yyyymmdd_to_datetime64(np.array(['20240229', '19390107']))
+    assert list(dates) == [np.datetime64('2024-02-29'), np.datetime64('1939-01-07')]
+
+def test_wheel_view_is_sorted_by_date(store):
+    milano = store['MI']
+
+    assert isinstance(milano, Sequence)
+    assert len(milano) == 3
+    assert milano[0] == [1, 2, 3, 4, 5]
+    assert list(milano) == [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [21, 22, 23, 24, 25]]
+    assert milano.dates[0] == np.datetime64('2024-01-01')
+
+def test_wheel_view_shares_memory(store):
+    assert np.shares_memory(store['MI'].numbers, store.numbers)
+    assert isinstance(store['MI'][1:], WheelHistory)
+    assert len(store['MI'][1:]) == 2
+
+def test_mapping_interface(store, config):
+    assert set(store) == set(config.RUOTE)
+    assert len(store['NA']) == 1
+    assert not store['BA']
+    assert store.get('XX') is None
+
+def test_empty_store(config):
+    store = HistoryStore.empty(config.RUOTE)
+    assert store.total_draws == 0
+    assert list(store['MI']) == []
+
+def test_memory_usage(store):
+    usage = store.memory_usage()
+    assert store.numbers.dtype == np.uint8
+    assert usage['numbers'] == 4 * 5
+    assert usage['total'] == usage['numbers'] + usage['dates']
+    assert usage['draws'] == 4
+
+def test_between_uses_inclusive_bounds(store):
+    milano = store['MI']
+
+    window = milano.between(np.datetime64('2024-01-02'), np.datetime64('2024-01-03'))
+    assert list(window) == [[6, 7, 8, 9, 10], [21, 22, 23, 24, 25]]
+    assert len(milano.between(end=np.datetime64('2024-01-01'))) == 1
+    assert len(milano.between(np.datetime64('2025-01-01'))) == 0
+
+def test_last(store):
+    assert list(store['MI'].last(1)) == [[21, 22, 23, 24, 25]]
+    assert len(store['MI'].last(100)) == 3
+    with pytest.raises(ValueError):
+        store['MI'].last(0)
+
+def test_frequency_matrix(store, config):
+    counts, draws = store.frequency_matrix()
+    wheels = list(store)
+
+    assert counts.shape == (len(config.RUOTE), 91)
+    assert draws[wheels.index('MI')] == 3
+    assert counts[wheels.index('MI'), 1] == 1
+    assert counts[wheels.index('NA'), 15] == 1
+    assert counts.sum() == 4 * 5
+
+def test_frequency_matrix_with_non_ascending_codes(preprocessed_data):
+    # Ruote elencate in ordine diverso da quello dei codici
+    wheels = {'NA': 6, 'MI': 5}
+    store = HistoryStore.from_dataframe(preprocessed_data, wheels)
+    counts, draws = store.frequency_matrix()
+
+    assert list(store) == ['NA', 'MI']
+    assert draws.tolist() == [1, 3]
+    assert counts[0, 11] == 1 and counts[0, 1] == 0
+    assert counts[1, 1] == 1 and counts[1, 11] == 0
+
+def test_unknown_wheel_rows_are_dropped(preprocessed_data, config):
+    # Codice 0: ruota non riconosciuta dal parser
+    data = pd.concat([preprocessed_data, pd.DataFrame({
+        'data': ['20240102'], 'ruota': [0],
+        'n1': [31], 'n2': [32], 'n3': [33], 'n4': [34], 'n5': [35]})], ignore_index=True)
+    store = HistoryStore.from_dataframe(data, config.RUOTE)
+
+    assert store.total_draws == 4
+    assert len(store.wheel_indices()) == len(store.numbers)
+    counts, draws = store.frequency_matrix()
+    assert draws.sum() == 4 and counts[:, 31].sum() == 0
+
+def test_row_mask_matches_wheel_views(store):
+    mask = store.row_mask(start=np.datetime64('2024-01-02'))
+    assert mask.sum() == 2
+
+    mask = store.row_mask(last=1)
+    selected = store.numbers[mask].tolist()
+    assert selected == [store['MI'][-1], store['NA'][-1]]
+
+def test_prefix_counts_per_wheel(store):
+    prefix = store.prefix_counts('MI')
+
+    assert store.prefix_counts('MI') is prefix
+    assert len(prefix) == 3
+    assert prefix.last(2)[[6, 21, 1]].tolist() == [1, 1, 0]
+
+def test_append_extends_history_and_prefix_counts(store, config):
+    prefix = store.prefix_counts('MI')
+    new_rows = pd.DataFrame({
+        'data': [20240104, 20240104], 'ruota': [config.RUOTE['MI'], config.RUOTE['BA']],
+        'n1': [31, 41], 'n2': [32, 42], 'n3': [33, 43], 'n4': [34, 44], 'n5': [35, 45]
+    })
+
+    grown = store.append(new_rows, config.RUOTE)
+
+    assert list(grown['MI'])[-1] == [31, 32, 33, 34, 35]
+    assert len(grown['BA']) == 1 and len(grown['NA']) == 1
+    assert grown.prefix_counts('MI').last(1)[31] == 1
+    # Lo storico di partenza non cambia
+    assert len(store['MI']) == 3 and len(prefix) == 3
+
+def test_append_rejects_older_draws(store, config):
+    old_rows = pd.DataFrame({'data': [20231231], 'ruota': [config.RUOTE['MI']],
+                             'n1': [1], 'n2': [2], 'n3': [3], 'n4': [4], 'n5': [5]})
+    with pytest.raises(ValueError):
+        store.append(old_rows, config.RUOTE)
+
+    unknown = old_rows.assign(data=[20250101], ruota=[0])
+    with pytest.raises(ValueError):
+        store.append(unknown, config.RUOTE)
@@ -0,0 +1,86 @@
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from predictors.hyperparameter_tuner import (HyperparameterTuner, evaluate_fold, hit_score,
+                                             time_series_folds)
+
+GRID = {'max_depth': [None, 2], 'min_samples_leaf': [1, 3]}
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(3)
+    dates = np.repeat(np.arange(20240101, 20240131), 2)
+    X = pd.DataFrame({'data': dates.astype(str), 'ruota': np.tile([5, 6], 30)})
+    numbers = np.array([rng.choice(np.arange(1, 91), 5, replace=False) for _ in range(60)])
+    y = pd.DataFrame(numbers, columns=['n1', 'n2', 'n3', 'n4', 'n5'])
+    return X, y
+
+def test_time_series_folds_never_look_ahead():
+    dates = np.repeat(np.arange(10), 3)
+    splits = time_series_folds(dates, 4)
+
+    assert len(splits) == 4
+    for train, test in splits:
+        assert dates[train].max() < dates[test].min()
+        # Tutte le ruote della stessa data stanno nello stesso blocco
+        assert len(test) % 3 == 0
+    assert len(splits[0][0]) < len(splits[-1][0])
+    with pytest.raises(ValueError):
+        time_series_folds(np.arange(3), 3)
+
+def test_hit_score():
+    predicted = np.array([[1, 2, 3, 4, 5], [1, 1, 1, 1, 1]])
+    actual = np.array([[5, 4, 9, 10, 11], [1, 2, 3, 4, 5]])
+    assert hit_score(predicted, actual) == 1.5
+
+def test_search_ranks_candidates(dataset):
+    X, y = dataset
+    result = HyperparameterTuner(folds=3, workers=1).search(X, y, GRID)
+
+    assert len(result.candidates) == 4
+    assert result.fitted == 12 and result.cached == 0
+    assert result.best_params == result.candidates[0].params
+    assert all(a.mean_score >= b.mean_score for a, b in zip(result.candidates, result.candidates[1:]))
+
+    features = X.astype(np.int64).to_numpy()
+    train, test = time_series_folds(features[:, 0], 3)[0]
+    expected = evaluate_fold(features, y.to_numpy(), train, test, result.best_params)
+    assert result.candidates[0].fold_scores[0] == expected
+
+def test_parallel_matches_serial(dataset):
+    X, y = dataset
+    serial = HyperparameterTuner(folds=3, workers=1).search(X, y, GRID)
+    parallel = HyperparameterTuner(folds=3, workers=2).search(X, y, GRID)
+    assert [c.fold_scores for c in serial.candidates] == [c.fold_scores for c in parallel.candidates]
+
+def test_fold_cache_resumes(dataset, tmp_path):
+    X, y = dataset
+    tuner = HyperparameterTuner(folds=3, workers=1, cache_dir=str(tmp_path))
+    first = tuner.search(X, y, GRID)
+
+    # Simula una ricerca interrotta: un risultato mancante e uno scritto a metà
+    files = sorted(tmp_path.rglob('*.json'))
+    assert len(files) == 12
+    files[0].unlink()
+    files[1].write_text('{"sco')
+
+    second = tuner.search(X, y, GRID)
+    assert second.fitted == 2 and second.cached == 10
+    assert second.best_params == first.best_params
+
+def test_save_and_load_best(dataset, tmp_path):
+    X, y = dataset
+    path = str(tmp_path / 'tuning.json')
+    assert HyperparameterTuner.load_best(path) is None
+
+    result = HyperparameterTuner(folds=2, workers=1).search(X, y, GRID)
+    HyperparameterTuner.save_best(result, path)
+    assert HyperparameterTuner.load_best(path) == result.best_params
+    with open(path) as handle:
+        assert json.load(handle)['decision_tree']['folds'] == 2
+
+    with open(path, 'w') as handle:
+        handle.write('non json')
+    with pytest.raises(ValueError):
+        HyperparameterTuner.load_best(path)
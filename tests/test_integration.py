@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 import numpy as np
+from collections.abc import Sequence
 from config import Config
 from services.lotto_service import LottoService
 
@@ -26,6 +27,6 @@ def test_full_prediction_flow(config, sample_data):
     assert all(0 <= x <= 90 for x in prediction)
 
     # Verifica i dati storici
-    assert isinstance(historical_data, list)
+    assert isinstance(historical_data, Sequence)
     assert len(historical_data) > 0
     assert all(len(extract) == 5 for extract in historical_data)
\ No newline at end of file
@@ -21,4 +21,179 @@ def test_prepare_data(trained_service, sample_data):
 
     assert list(X.columns) == ['data', 'ruota']
     assert list(y.columns) == ['n1', 'n2', 'n3', 'n4', 'n5']
-    assert len(X) == len(sample_data)
\ No newline at end of file
+    assert len(X) == len(sample_data)
+
+def test_get_history_window(trained_service):
+    assert len(trained_service.get_history("MI")) == 1
+    assert len(trained_service.get_history("MI", start="20240102")) == 0
+    assert len(trained_service.get_history("NA", start="20240101", end="20240102")) == 1
+    assert len(trained_service.get_history("NA", last=5)) == 1
+
+def test_get_history_invalid_range(trained_service):
+    with pytest.raises(ValueError):
+        trained_service.get_history("MI", start="20240102", end="20240101")
+    with pytest.raises(ValueError):
+        trained_service.get_history("XX")
+
+def test_stats_all(trained_service):
+    stats = trained_service.stats_all()
+
+    assert list(stats) == list(trained_service.config.RUOTE)
+    assert stats["MI"].total_draws == 1
+    assert stats["MI"].most_common[0] == (1, 1)
+    assert stats["NA"].least_common[0] == (11, 1)
+    assert stats["BA"].total_draws == 0
+
+def test_stats_all_matches_single_wheel(trained_service):
+    windowed = trained_service.stats_all(start="20240102", end="20240102")
+
+    assert windowed["MI"].total_draws == 0
+    assert windowed["NA"].total_numbers == 5
+
+def test_followers_are_cached_per_version(trained_service):
+    followers, occurrences = trained_service.followers("MI", 1)
+    assert followers == [] and occurrences == 0
+
+    first = trained_service.transition_matrix("MI")
+    assert trained_service.transition_matrix("MI") is first
+
+    trained_service.train_model()
+    assert trained_service.transition_matrix("MI") is not first
+
+def test_correlations_are_cached_per_version(trained_service):
+    pairs = trained_service.correlations(3)
+    assert len(pairs) == 3
+    assert all(pair.wheel_a != pair.wheel_b for pair in pairs)
+
+    analyzer = trained_service._cross_wheel[1]
+    trained_service.correlations(5)
+    assert trained_service._cross_wheel[1] is analyzer
+
+    trained_service.train_model()
+    trained_service.correlations(3)
+    assert trained_service._cross_wheel[1] is not analyzer
+
+def test_tune_saves_best_params(trained_service, tmp_path):
+    trained_service.config.TUNING_FILE = str(tmp_path / "tuning.json")
+    trained_service.config.TUNING_CACHE_DIR = str(tmp_path / "cache")
+
+    result = trained_service.tune(folds=1, workers=1, grid={'max_depth': [1, 2]})
+    assert result.fitted == 2
+
+    # La ricerca legge il CSV senza pubblicare una nuova versione
+    assert trained_service.data_version == 1
+
+    trained_service.initialize_predictor("decision_tree")
+    assert trained_service.predictor.params == result.best_params
+
+def test_train_model_trains_the_initialized_predictor(csv_service):
+    service, _ = csv_service
+    service.initialize_predictor("decision_tree")
+    initialized = service.predictor
+
+    service.train_model()
+    assert service.predictor is initialized and initialized.is_trained
+
+    # Le volte successive il predittore pubblicato resta intatto
+    service.train_model()
+    assert service.predictor is not initialized
+
+@pytest.fixture
+def csv_service(tmp_path):
+    from config import Config
+    path = tmp_path / "estrazioni.csv"
+    path.write_text("data;ruota;n1;n2;n3;n4;n5\n01/01/2024;MI;1;2;3;4;5\n")
+    service = LottoService(Config(CSV_FILE=str(path), TUNING_FILE=str(tmp_path / "tuning.json")))
+    service.initialize_predictor("decision_tree")
+    service.train_model()
+    return service, path
+
+def test_reload_swaps_snapshot(csv_service):
+    service, path = csv_service
+    before = service.snapshot
+    assert before.version == 1 and before.history.total_draws == 1
+
+    path.write_text(path.read_text() + "02/01/2024;NA;11;12;13;14;15\n")
+    assert service.reload() == 2
+
+    after = service.snapshot
+    assert after.history.total_draws == 2
+    assert after.predictor is not before.predictor
+    # Chi ha letto lo snapshot precedente continua a vedere dati coerenti
+    assert before.history.total_draws == 1 and before.version == 1
+
+def test_background_reload_keeps_old_version_on_error(csv_service):
+    service, path = csv_service
+    path.write_text("data;ruota\n")
+    service._background_reload()
+
+    assert service.data_version == 1
+    assert service.last_reload_error
+
+def test_watching_reloads_in_background(csv_service):
+    import os
+    import time
+    service, path = csv_service
+    service.start_watching(interval=0.01)
+    try:
+        path.write_text(path.read_text() + "02/01/2024;NA;11;12;13;14;15\n")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        deadline = time.monotonic() + 10
+        while service.data_version == 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert service.data_version == 2
+        assert service.get_history("NA").numbers.tolist() == [[11, 12, 13, 14, 15]]
+    finally:
+        service.stop_watching()
+    assert not service.watching
+
+def test_recent_frequencies_and_append(trained_service):
+    counts, draws = trained_service.recent_frequencies("mi", 18)
+    assert draws == 1
+    assert counts[1:6].tolist() == [1, 1, 1, 1, 1]
+
+    version = trained_service.data_version
+    new_rows = pd.DataFrame({'data': ['03/01/2024'], 'ruota': ['MI'],
+                             'n1': [1], 'n2': [40], 'n3': [50], 'n4': [60], 'n5': [70]})
+    assert trained_service.append_extractions(new_rows) == version + 1
+
+    counts, draws = trained_service.recent_frequencies("MI", 18)
+    assert draws == 2
+    assert counts[1] == 2 and counts[70] == 1
+    assert trained_service.recent_frequencies("MI", 1)[0][2] == 0
+
+    with pytest.raises(ValueError):
+        trained_service.recent_frequencies("XX", 18)
+
+def test_report(trained_service):
+    report = trained_service.report("20240103", workers=1)
+
+    assert report.version == trained_service.data_version
+    assert [section.wheel for section in report.wheels] == list(trained_service.config.RUOTE)
+    milano = report.wheels[list(trained_service.config.RUOTE).index("MI")]
+    assert milano.statistics.total_draws == 1
+    assert len(milano.prediction) == 5
+
+def test_shared_history_lifecycle(trained_service):
+    with trained_service.shared_history() as first:
+        with trained_service.shared_history() as again:
+            assert again == first
+        # Nuova versione mentre la copia è in uso: resta disponibile
+        trained_service.train_model()
+        block, history = first.attach()
+        assert len(history["MI"]) == 1
+        del history
+        block.close()
+
+    # Versione superata e senza utilizzatori: la copia è stata liberata
+    with pytest.raises(FileNotFoundError):
+        first.attach()
+
+    with trained_service.shared_history() as current:
+        pass
+    current.attach()[0].close()
+    trained_service.close()
+    with pytest.raises(FileNotFoundError):
+        current.attach()
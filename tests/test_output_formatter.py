@@ -1,4 +1,6 @@
+import json
 import pytest
+from io import StringIO
 from presentation.output_formatter import OutputFormatter
 from systems import IntegralSystem, ReducedSystem, GuaranteedSystem
 
@@ -42,6 +44,14 @@ def test_format_integral_system(mock_formatter):
     assert "Totale combinazioni: 10" in output
     assert "1 - 2" in output
 
+def test_format_integral_system_filtered(mock_formatter):
+    """Testa il sistema integrale con i filtri"""
+    from systems import SystemFilters
+    output = mock_formatter.format_integral_system([1, 2, 3, 4, 5], 2, SystemFilters(sum_min=8))
+    assert "filtri: somma 8-" in output
+    assert "Totale combinazioni: 2" in output
+    assert "4 - 5" in output
+
 def test_format_reduced_system(mock_formatter):
     """Testa la formattazione del sistema ridotto"""
     output = mock_formatter.format_reduced_system([1, 2, 3, 4, 5], 2)
@@ -114,4 +124,95 @@ def test_format_error(formatter):
     error_msg = "Test error"
     result = formatter.format_error(error_msg)
     assert error_msg in result
-    assert "Errore" in result
\ No newline at end of file
+    assert "Errore" in result
+
+def test_format_timing(formatter):
+    summary = {"DataLoader.load_data": {
+        'count': 2, 'total': 0.5, 'mean': 0.25, 'p50': 0.25, 'p95': 0.3, 'p99': 0.3, 'max': 0.3}}
+
+    result = formatter.format_timing(summary)
+    assert "DataLoader.load_data" in result
+    assert "500" in result
+
+    assert "Nessun tempo registrato" in formatter.format_timing({})
+
+def test_default_mode_for_non_tty_is_plain():
+    formatter = OutputFormatter(stream=StringIO())
+
+    assert formatter.mode == 'plain'
+    assert "\033[" not in formatter.format_statistics([[1, 2, 3, 4, 5]], "MI")
+
+def test_write_system_streams_to_stream():
+    stream = StringIO()
+    formatter = OutputFormatter(mode='plain', stream=stream)
+
+    formatter.write_integral_system([1, 2, 3, 4, 5], 2)
+    output = stream.getvalue()
+    assert "SISTEMA INTEGRALE 2 NUMERI" in output
+    assert "Totale combinazioni: 10" in output
+
+    formatter.write_integral_system([1, 2], 3)
+    assert "Errore:" in stream.getvalue()
+
+def test_write_modes_csv_and_json():
+    stream = StringIO()
+    formatter = OutputFormatter(mode='csv', stream=stream)
+    formatter.write_reduced_system([1, 2, 3, 4, 5], 2)
+    assert stream.getvalue().splitlines()[0] == "1;2"
+
+    stream = StringIO()
+    formatter = OutputFormatter(mode='json', stream=stream)
+    formatter.write_guaranteed_system([1, 2, 3, 4, 5], 3, 2)
+    document = json.loads(stream.getvalue())
+    assert document['punti_garantiti'] == 2
+    assert all(len(comb) == 3 for comb in document['combinazioni'])
+
+def test_set_mode_invalid(formatter):
+    with pytest.raises(ValueError):
+        formatter.set_mode('html')
+
+def test_statistics_cached_per_version_and_mode(monkeypatch):
+    formatter = OutputFormatter(mode='plain', stream=StringIO())
+    history = [[1, 2, 3, 4, 5], [1, 6, 7, 8, 9]]
+    calls = []
+    original = formatter._count_array
+    monkeypatch.setattr(formatter, '_count_array', lambda data: calls.append(1) or original(data))
+
+    first = formatter.format_statistics(history, "MI", version=1, window=())
+    assert formatter.format_statistics(history, "MI", version=1, window=()) == first
+    assert len(calls) == 1
+
+    # Nuova versione del dataset: l'output viene ricalcolato
+    formatter.format_statistics(history + [[10, 11, 12, 13, 14]], "MI", version=2, window=())
+    assert len(calls) == 2
+
+    # Stessa versione, modalità diversa: chiave diversa
+    formatter.set_mode('csv')
+    assert formatter.format_statistics(history, "MI", version=2, window=()) != first
+    assert len(calls) == 3
+
+    # Senza versione non si usa la cache
+    formatter.format_statistics(history, "MI")
+    formatter.format_statistics(history, "MI")
+    assert len(calls) == 5
+
+def test_frequency_chart_cached_matches_uncached():
+    stream = StringIO()
+    formatter = OutputFormatter(mode='plain', stream=stream)
+    history = [[1, 2, 3, 4, 5], [1, 6, 7, 8, 9]]
+
+    formatter.write_frequency_chart(history, "MI", version=1, window=(('last', 2),))
+    formatter.write_frequency_chart(history, "MI", version=1, window=(('last', 2),))
+    uncached = formatter.format_frequency_chart(history, "MI")
+
+    assert stream.getvalue() == (uncached + "\n") * 2
+    assert formatter.render_cache.hits == 1
+
+def test_format_frequencies_matches_history_output():
+    formatter = OutputFormatter(mode='plain', stream=StringIO())
+    history = [[1, 2, 3, 4, 5], [1, 6, 7, 8, 9]]
+    counts = formatter._count_array(history)
+
+    expected = "\n".join([formatter.format_statistics(history, "MI"),
+                          formatter.format_frequency_chart(history, "MI")])
+    assert formatter.format_frequencies(counts, 2, "MI") == expected
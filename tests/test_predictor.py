@@ -20,4 +20,22 @@ def test_decision_tree_predictor_training():
 
     prediction = predictor.predict(['01012024', 1])
     assert len(prediction) == 5
-    assert all(isinstance(x, (int, np.integer)) for x in prediction)
\ No newline at end of file
+    assert all(isinstance(x, (int, np.integer)) for x in prediction)
+
+def test_markov_predictor():
+    from predictors.markov_predictor import MarkovPredictor
+    predictor = MarkovPredictor()
+    X = pd.DataFrame({'data': ['20240101', '20240102', '20240103'], 'ruota': [5, 5, 5]})
+    y = pd.DataFrame({
+        'n1': [1, 6, 1], 'n2': [2, 7, 2], 'n3': [3, 8, 3], 'n4': [4, 9, 4], 'n5': [5, 10, 5]
+    })
+
+    with pytest.raises(ValueError):
+        predictor.predict(['20240104', 5])
+
+    predictor.train(X, y)
+
+    # Dopo 1-5 è sempre uscito 6-10
+    assert predictor.predict(['20240104', 5]) == [6, 7, 8, 9, 10]
+    with pytest.raises(ValueError):
+        predictor.predict(['20240104', 1])
@@ -10,4 +10,19 @@ def test_create_decision_tree_predictor():
 
 def test_invalid_predictor_type():
     with pytest.raises(ValueError):
-        PredictorFactory.create_predictor("invalid_type")
\ No newline at end of file
+        PredictorFactory.create_predictor("invalid_type")
+
+def test_create_markov_predictor():
+    predictor = PredictorFactory.create_predictor("markov")
+    assert isinstance(predictor, PredictorInterface)
+
+def test_decision_tree_uses_tuned_params(tmp_path):
+    path = tmp_path / "tuning.json"
+    path.write_text('{"decision_tree": {"params": {"max_depth": 3, "criterion": "entropy"}}}')
+
+    predictor = PredictorFactory.create_predictor("decision_tree", str(path))
+    assert predictor.model.max_depth == 3
+    assert predictor.model.criterion == "entropy"
+
+    default = PredictorFactory.create_predictor("decision_tree", str(tmp_path / "missing.json"))
+    assert default.model.max_depth is None
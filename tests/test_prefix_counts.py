@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from models.prefix_counts import PrefixCounts
+
+@pytest.fixture
+def numbers():
+    return np.random.default_rng(3).integers(1, 91, size=(500, 5)).astype(np.uint8)
+
+def counts(numbers):
+    return np.bincount(numbers.ravel(), minlength=91)
+
+def test_windows_match_bincount(numbers):
+    prefix = PrefixCounts.from_numbers(numbers)
+
+    assert len(prefix) == 500
+    assert prefix.cumulative.shape == (501, 91)
+    assert np.array_equal(prefix.window(120, 340), counts(numbers[120:340]))
+    for last in (18, 50, 100, 1000):
+        assert np.array_equal(prefix.last(last), counts(numbers[-last:]))
+
+def test_extend_matches_full_build(numbers):
+    prefix = PrefixCounts.from_numbers(numbers[:100])
+    for begin in range(100, 500, 37):
+        prefix = prefix.extend(numbers[begin:begin + 37])
+
+    assert np.array_equal(prefix.cumulative, PrefixCounts.from_numbers(numbers).cumulative)
+
+def test_extend_leaves_previous_instances_intact(numbers):
+    base = PrefixCounts.from_numbers(numbers[:300])
+    grown = base.extend(numbers[300:400])
+    # Secondo ramo dalla stessa base: non deve sovrascrivere le righe di `grown`
+    branch = base.extend(numbers[400:])
+
+    assert len(base) == 300
+    assert np.array_equal(base.last(10), counts(numbers[290:300]))
+    assert np.array_equal(grown.last(100), counts(numbers[300:400]))
+    assert np.array_equal(branch.last(100), counts(numbers[400:]))
+
+def test_extend_in_blocks(monkeypatch, numbers):
+    monkeypatch.setattr(PrefixCounts, 'BLOCK_ROWS', 64)
+    assert np.array_equal(PrefixCounts.from_numbers(numbers).last(500), counts(numbers))
+
+def test_invalid_input(numbers):
+    prefix = PrefixCounts.from_numbers(numbers)
+    with pytest.raises(ValueError):
+        prefix.window(10, 5)
+    with pytest.raises(ValueError):
+        prefix.last(0)
+    with pytest.raises(ValueError):
+        prefix.extend(np.array([[0, 1, 2, 3, 4]]))
+    with pytest.raises(ValueError):
+        prefix.extend(np.array([1, 2, 3]))
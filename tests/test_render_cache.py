@@ -0,0 +1,53 @@
+import pytest
+from presentation.render_cache import RenderCache
+
+def rendering(calls, *chunks):
+    def render():
+        calls.append(chunks)
+        return iter(chunks)
+    return render
+
+def test_hit_reuses_rendered_chunks():
+    cache, calls = RenderCache(), []
+
+    assert cache.get('k', 1, rendering(calls, 'a', 'b')) == ('a', 'b')
+    assert cache.get('k', 1, rendering(calls, 'x')) == ('a', 'b')
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_new_version_drops_older_entries():
+    cache, calls = RenderCache(), []
+    cache.get('k', 1, rendering(calls, 'v1'))
+    cache.get('altro', 1, rendering(calls, 'v1'))
+
+    assert cache.get('k', 2, rendering(calls, 'v2')) == ('v2',)
+    assert len(cache) == 1
+
+def test_older_version_is_rendered_but_not_stored():
+    cache, calls = RenderCache(), []
+    cache.get('k', 2, rendering(calls, 'v2'))
+
+    assert cache.get('k', 1, rendering(calls, 'v1')) == ('v1',)
+    assert cache.get('k', 2, rendering(calls, 'x')) == ('v2',)
+    assert len(calls) == 2
+
+def test_least_recently_used_entry_is_evicted():
+    cache, calls = RenderCache(max_entries=2), []
+    cache.get('a', 1, rendering(calls, 'a'))
+    cache.get('b', 1, rendering(calls, 'b'))
+    cache.get('a', 1, rendering(calls, 'a'))
+    cache.get('c', 1, rendering(calls, 'c'))
+
+    assert len(cache) == 2
+    cache.get('a', 1, rendering(calls, 'a'))
+    cache.get('b', 1, rendering(calls, 'b'))
+    assert calls == [('a',), ('b',), ('c',), ('b',)]
+
+def test_clear_and_invalid_size():
+    cache = RenderCache()
+    cache.get('k', 1, lambda: ['a'])
+    cache.clear()
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        RenderCache(max_entries=0)
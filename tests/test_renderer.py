@@ -0,0 +1,146 @@
+import json
+import pytest
+from io import StringIO
+from models.statistics import CorrelatedPair, WheelStatistics
+from models.tuning import CandidateScore, TuningResult
+from presentation.renderer import (CsvRenderer, JsonRenderer, SystemListing, TextRenderer,
+                                   create_renderer, detect_mode)
+
+@pytest.fixture
+def statistics():
+    return WheelStatistics(wheel="MI", most_common=[(1, 3), (2, 2)],
+                           least_common=[(90, 1)], total_numbers=10, total_draws=2)
+
+@pytest.fixture
+def listing():
+    return SystemListing(kind='integrale', title="SISTEMA INTEGRALE 2 NUMERI",
+                         description="Combinazioni di 2 numeri:", numbers=[3, 1, 2],
+                         combinations=iter([(1, 2), (1, 3), (2, 3)]))
+
+class TtyStream(StringIO):
+    def isatty(self):
+        return True
+
+def test_detect_mode():
+    assert detect_mode(StringIO()) == 'plain'
+    assert detect_mode(TtyStream()) == 'rich'
+    assert detect_mode(object()) == 'plain'
+
+def test_create_renderer_invalid_mode():
+    with pytest.raises(ValueError):
+        create_renderer('html')
+
+def test_plain_renderer_has_no_escape_codes_or_boxes(statistics):
+    output = "\n".join(TextRenderer(color=False).statistics(statistics))
+
+    assert "\033[" not in output
+    assert "╒" not in output
+    assert "01(3), 02(2)" in output
+
+def test_rich_renderer_uses_colors_and_boxes(statistics):
+    output = "\n".join(TextRenderer(color=True).statistics(statistics))
+
+    assert "\033[" in output
+    assert "╒" in output
+
+def test_text_system_is_streamed(listing):
+    lines = list(TextRenderer(color=False).system(listing))
+
+    assert " 1) 1 - 2" in lines
+    assert "Totale combinazioni: 3" in lines
+
+def test_csv_renderer(statistics, listing):
+    renderer = CsvRenderer()
+
+    assert list(renderer.system(listing)) == ["1;2", "1;3", "2;3"]
+    assert list(renderer.prediction("01/01/2024", "mi", [5, 1, 4, 3, 2], None, None)) == [
+        "data;ruota;n1;n2;n3;n4;n5", "01/01/2024;MI;1;2;3;4;5"]
+    assert "MI;piu_frequente;1;3" in list(renderer.statistics(statistics))
+
+    chart = list(renderer.frequency_chart("MI", {1: 3}))
+    assert len(chart) == 91
+    assert chart[1] == "MI;1;3" and chart[2] == "MI;2;0"
+
+def test_json_renderer(statistics, listing):
+    renderer = JsonRenderer()
+
+    system = json.loads("\n".join(renderer.system(listing)))
+    assert system == {'tipo': 'integrale', 'numeri_base': [1, 2, 3],
+                      'combinazioni': [[1, 2], [1, 3], [2, 3]]}
+
+    prediction = json.loads("\n".join(
+        renderer.prediction("01/01/2024", "MI", [1, 2, 3, 4, 5], statistics, {1: 3})))
+    assert prediction['numeri'] == [1, 2, 3, 4, 5]
+    assert prediction['statistiche']['estrazioni_analizzate'] == 2
+    assert prediction['frequenze'] == {'1': 3}
+
+    assert json.loads(renderer.error("boom")) == {'errore': 'boom'}
+
+def test_all_statistics(statistics):
+    table = "\n".join(TextRenderer(color=False).all_statistics("Tutte le ruote", {"MI": statistics}))
+    assert "MI" in table and "01(3), 02(2)" in table
+
+    rows = list(CsvRenderer().all_statistics("Tutte le ruote", {"MI": statistics}))
+    assert rows[0] == "ruota;tipo;numero;frequenza"
+    assert "MI;meno_frequente;90;1" in rows
+
+    document = json.loads("\n".join(JsonRenderer().all_statistics("Tutte le ruote", {"MI": statistics})))
+    assert document["MI"]["estrazioni_analizzate"] == 2
+
+def test_backtest_modes():
+    from systems import BacktestResult
+    result = BacktestResult(combinations=3, draws=2, combination_size=2,
+                            hit_counts=[1, 2, 3], best_per_draw=[0, 0, 2])
+
+    text = "\n".join(TextRenderer(color=False).backtest("MI", result))
+    assert "Verifica storica - MI" in text and "ambo" in text
+    assert "3 combinazioni di 2 numeri su 2 estrazioni" in text
+    assert list(CsvRenderer().backtest("MI", result))[3] == "2;ambo;3;2"
+    document = json.loads("\n".join(JsonRenderer().backtest("MI", result)))
+    assert document['punti'] == {'nessuno': 1, 'estratto': 2, 'ambo': 3}
+    assert document['estrazioni_vincenti'] == {'estratto': 2, 'ambo': 2}
+
+def test_simulation_modes():
+    from systems import SimulationResult
+    result = SimulationResult(combinations=3, combination_size=2, draws=1000, sorte=2, stake=1.0,
+                              best_counts=[600, 350, 50], payout_mean=12.5, payout_std=60.0)
+
+    text = "\n".join(TextRenderer(color=False).simulation(result))
+    assert "Simulazione - 1000 estrazioni" in text and "5.0000%" in text
+    assert "Resa attesa: 4.167 euro per euro giocato" in text
+    assert list(CsvRenderer().simulation(result))[2].startswith("2;ambo;0.05;")
+    document = json.loads("\n".join(JsonRenderer().simulation(result)))
+    assert document['probabilita']['estratto']['stima'] == 0.4
+    assert document['costo'] == 3.0
+
+def test_tuning_modes():
+    candidates = [CandidateScore({'max_depth': 5, 'criterion': 'gini'}, 0.6, [0.5, 0.7]),
+                  CandidateScore({'max_depth': None, 'criterion': 'gini'}, 0.4, [0.4, 0.4])]
+    result = TuningResult(candidates[0].params, 0.6, candidates, folds=2, fitted=3, cached=1)
+
+    text = "\n".join(TextRenderer(color=False).tuning(result))
+    assert "max_depth=5, criterion=gini" in text and "Fold 2" in text
+    assert "3 addestramenti eseguiti, 1 dalla cache" in text
+    rows = list(CsvRenderer().tuning(result))
+    assert rows[0] == "max_depth;criterion;media;fold_1;fold_2"
+    assert rows[2] == ";gini;0.400000;0.400000;0.400000"
+    document = json.loads("\n".join(JsonRenderer().tuning(result)))
+    assert document['migliore'] == {'max_depth': 5, 'criterion': 'gini'}
+    assert document['configurazioni'][1]['parametri']['max_depth'] is None
+
+def test_correlations_modes():
+    pairs = [CorrelatedPair('BA', 7, 'MI', 90, 14, 3.5, 0.61)]
+
+    text = "\n".join(TextRenderer(color=False).correlations(pairs))
+    assert "BA 07 - MI 90" in text and "0.61" in text
+    assert list(CsvRenderer().correlations(pairs))[1] == "BA;7;MI;90;14;3.5000;0.610000"
+    assert json.loads("\n".join(JsonRenderer().correlations(pairs)))[0]['numero_b'] == 90
+
+def test_followers_modes():
+    followers = [(6, 2, 0.5)]
+
+    text = "\n".join(TextRenderer(color=False).followers("MI", 1, 4, followers))
+    assert "Dopo il 01 su MI (4 uscite)" in text and "50.0%" in text
+
+    assert list(CsvRenderer().followers("MI", 1, 4, followers))[1] == "MI;1;6;2;0.5000"
+    assert json.loads("\n".join(JsonRenderer().followers("MI", 1, 4, followers)))['seguono'][0]['volte'] == 2
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.history_store import HistoryStore
+from services.report_builder import ReportBuilder, number_delays, wheel_section
+
+@pytest.fixture
+def history(config):
+    rng = np.random.default_rng(5)
+    rows = 300
+    numbers = np.array([rng.choice(np.arange(1, 91), 5, replace=False) for _ in range(rows)])
+    df = pd.DataFrame(numbers, columns=['n1', 'n2', 'n3', 'n4', 'n5'])
+    df['data'] = 20240101 + np.arange(rows) // 3
+    df['ruota'] = [config.RUOTE['MI'], config.RUOTE['NA'], config.RUOTE['RO']] * (rows // 3)
+    return HistoryStore.from_dataframe(df, config.RUOTE)
+
+def test_number_delays():
+    numbers = np.array([[1, 2, 3, 4, 5], [1, 6, 7, 8, 9], [10, 11, 12, 13, 14]])
+    delays = number_delays(numbers)
+
+    assert delays[1] == 1       # Uscito nella penultima estrazione
+    assert delays[10] == 0      # Uscito nell'ultima
+    assert delays[5] == 2
+    assert delays[90] == 3      # Mai uscito
+
+def test_wheel_section(history):
+    section = wheel_section(history, 'MI', last=50, top=5)
+    numbers = history['MI'].numbers[-50:]
+
+    assert section.statistics.total_draws == 50
+    assert section.counts == np.bincount(numbers.ravel(), minlength=91).tolist()
+    assert len(section.delays) == 5
+    assert section.delays[0][1] == max(number_delays(numbers)[1:])
+    assert section.last_date == str(history['MI'].dates[-1])
+
+    empty = wheel_section(history, 'BA')
+    assert empty.statistics.total_draws == 0 and empty.last_date is None
+
+def test_parallel_build_matches_serial(history):
+    predictions = {'MI': [1, 2, 3, 4, 5]}
+    serial = ReportBuilder(workers=1).build(history, '20240601', 3, predictions, last=60)
+    parallel = ReportBuilder(workers=2, min_draws_per_worker=1).build(history, '20240601', 3, predictions, last=60)
+
+    assert [section.wheel for section in serial.wheels] == list(history)
+    assert serial.wheels == parallel.wheels
+    assert serial.wheels[list(history).index('MI')].prediction == [1, 2, 3, 4, 5]
+    assert serial.window == "Ultime 60 estrazioni" and serial.version == 3
+
+def test_explicit_workers_are_honored(history):
+    # Storico piccolo: senza --processi le sezioni restano in linea
+    assert ReportBuilder().workers_for(history) == 1
+    assert ReportBuilder(workers=4).workers_for(history) == 4
+    assert ReportBuilder(workers=64).workers_for(history) == len(history)
+    assert ReportBuilder(workers=2).build(history, '20240601', 1).workers == 2
+
+def test_invalid_arguments(history):
+    with pytest.raises(ValueError):
+        ReportBuilder(workers=0)
+    with pytest.raises(ValueError):
+        ReportBuilder(workers=1).build(history, '20240601', 1, last=0)
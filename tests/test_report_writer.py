@@ -0,0 +1,41 @@
+import json
+import pytest
+from models.report import Report, WheelReport
+from models.statistics import statistics_from_counts
+from presentation.report_writer import ReportWriter
+import numpy as np
+
+@pytest.fixture
+def report():
+    counts = np.zeros(91, dtype=np.int64)
+    counts[[1, 2, 3, 4, 5]] = [3, 2, 2, 1, 1]
+    section = WheelReport(wheel='MI', statistics=statistics_from_counts('MI', counts, 3),
+                          counts=counts.tolist(), delays=[(90, 3), (89, 3)],
+                          last_date='2024-01-03', prediction=[7, 8, 9, 10, 11])
+    return Report(date='20240104', version=2, window="Tutte le estrazioni",
+                  wheels=[section], elapsed=0.5)
+
+def test_write_all_formats(tmp_path, report):
+    writer = ReportWriter()
+
+    assert writer.write(report, str(tmp_path / "report.json")) == 'json'
+    document = json.loads((tmp_path / "report.json").read_text(encoding='utf-8'))
+    assert document['ruote'][0]['predizione'] == [7, 8, 9, 10, 11]
+    assert document['ruote'][0]['frequenze']['1'] == 3
+    assert document['ruote'][0]['ritardi'][0] == [90, 3]
+
+    writer.write(report, str(tmp_path / "report.md"))
+    markdown = (tmp_path / "report.md").read_text(encoding='utf-8')
+    assert "## MI" in markdown and "| Predizione | 07 08 09 10 11 |" in markdown
+    assert "01 |" + "█" * ReportWriter.CHART_WIDTH + " (3)" in markdown
+
+    writer.write(report, str(tmp_path / "report.html"))
+    page = (tmp_path / "report.html").read_text(encoding='utf-8')
+    assert page.startswith("<!DOCTYPE html>") and "<h2>MI</h2>" in page
+    assert "90(3), 89(3)" in page
+
+def test_invalid_format(tmp_path, report):
+    with pytest.raises(ValueError):
+        ReportWriter().write(report, str(tmp_path / "report.txt"))
+    with pytest.raises(ValueError):
+        ReportWriter().write(report, str(tmp_path / "report.html"), 'pdf')
@@ -0,0 +1,44 @@
+import threading
+import time
+from utils.rwlock import ReadWriteLock
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=5)
+
+    def reader():
+        with lock.read():
+            inside.wait()  # Tutti e tre dentro insieme, altrimenti scade il timeout
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_writer_is_exclusive_and_has_precedence():
+    lock = ReadWriteLock()
+    events = []
+    lock.acquire_read()
+
+    def writer():
+        with lock.write():
+            events.append('scrittore')
+
+    def late_reader():
+        with lock.read():
+            events.append('lettore')
+
+    writer_thread = threading.Thread(target=writer)
+    writer_thread.start()
+    time.sleep(0.05)
+    # Lo scrittore attende il primo lettore; il nuovo lettore attende lo scrittore
+    reader_thread = threading.Thread(target=late_reader)
+    reader_thread.start()
+    time.sleep(0.05)
+    assert events == []
+
+    lock.release_read()
+    writer_thread.join(timeout=5)
+    reader_thread.join(timeout=5)
+    assert events == ['scrittore', 'lettore']
@@ -0,0 +1,93 @@
+import threading
+import pandas as pd
+import pytest
+from config import Config
+from services.lotto_service import LottoService
+from services.service_executor import ServiceExecutor
+
+BASE_ROWS = 20
+
+class GrowingLoader:
+    """Ogni caricamento restituisce un'estrazione in più per ruota"""
+
+    def __init__(self, wheels):
+        self.wheels = list(wheels)
+        self.loads = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.loads += 1
+            rows = BASE_ROWS + self.loads
+        records = []
+        for day in range(rows):
+            for index, wheel in enumerate(self.wheels):
+                base = (day * 7 + index * 3) % 85
+                records.append({'data': pd.Timestamp(2000, 1, 1) + pd.Timedelta(days=day), 'ruota': wheel,
+                                'n1': base + 1, 'n2': base + 2, 'n3': base + 3, 'n4': base + 4, 'n5': base + 5})
+        return pd.DataFrame(records)
+
+@pytest.fixture
+def service():
+    config = Config()
+    service = LottoService(config)
+    service.data_loader.load_data = GrowingLoader(config.RUOTE)
+    service.initialize_predictor("decision_tree")
+    service.train_model()
+    return service
+
+def test_submit_single_requests(service):
+    with ServiceExecutor(service, workers=4) as executor:
+        prediction, history = executor.submit_predict("20240101", "MI").result()
+        statistics = executor.submit_stats_all(last=5).result()
+
+    assert len(prediction) == 5 and len(history) == BASE_ROWS + 1
+    assert statistics['MI'].total_draws == 5
+    with pytest.raises(ValueError):
+        ServiceExecutor(service, workers=0)
+
+def test_concurrent_readers_with_retraining_writer(service):
+    """Molti lettori in parallelo mentre un writer riaddestra: nessun errore e versioni mai mescolate"""
+    wheels = list(service.config.RUOTE)
+    errors = []
+    stop = threading.Event()
+    reloads = []
+
+    def writer():
+        try:
+            while not stop.is_set() and len(reloads) < 15:
+                reloads.append(service.reload())
+        except Exception as e:
+            errors.append(e)
+
+    def reader(executor):
+        try:
+            for _ in range(20):
+                version, results = executor.predict_many([("20240101", wheel) for wheel in wheels])
+                # La versione k ha BASE_ROWS + k estrazioni per ruota
+                assert {len(history) for _, history in results} == {BASE_ROWS + version}
+
+                version, stats = executor.stats_many([{}, {'last': 3}])
+                assert {s.total_draws for s in stats[0].values()} == {BASE_ROWS + version}
+                assert {s.total_draws for s in stats[1].values()} == {3}
+
+                _, history = executor.submit_predict("20240101", "NA").result()
+                assert len(history) - BASE_ROWS in range(1, service.data_version + 1)
+        except Exception as e:
+            errors.append(e)
+
+    with ServiceExecutor(service, workers=8) as executor:
+        writer_thread = threading.Thread(target=writer)
+        readers = [threading.Thread(target=reader, args=(executor,)) for _ in range(6)]
+        writer_thread.start()
+        for thread in readers:
+            thread.start()
+        for thread in readers:
+            thread.join()
+        stop.set()
+        writer_thread.join()
+
+    assert not errors, errors
+    # Il writer non è rimasto bloccato dai lettori
+    assert reloads and reloads == sorted(reloads)
+    assert service.data_version == 1 + len(reloads)
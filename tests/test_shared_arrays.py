@@ -0,0 +1,54 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from models.history_store import HistoryStore, SharedHistory
+from utils.shared_arrays import SharedArrays
+
+def attached_sum(handle):
+    block, arrays = handle.attach()
+    total = int(arrays['values'].sum()), arrays['values'].flags.writeable
+    del arrays
+    block.close()
+    return total
+
+def test_workers_see_the_same_bytes():
+    values = np.arange(1000, dtype=np.int64)
+    with SharedArrays({'values': values, 'flags': np.ones(3, dtype=bool)}) as shared:
+        assert np.array_equal(shared.arrays['values'], values)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(attached_sum, [shared.handle] * 3))
+    assert results == [(int(values.sum()), False)] * 3
+
+def test_attach_in_process_is_zero_copy():
+    with SharedArrays({'values': np.arange(10)}) as shared:
+        block, arrays = shared.handle.attach()
+        assert not arrays['values'].flags.owndata
+        with pytest.raises(ValueError):
+            arrays['values'][0] = 5
+        del arrays
+        block.close()
+
+def test_close_unlinks_the_block():
+    shared = SharedArrays({'values': np.arange(10)})
+    handle = shared.handle
+    shared.close()
+    shared.close()
+
+    assert shared.closed
+    with pytest.raises(FileNotFoundError):
+        handle.attach()
+
+def test_shared_history_round_trip(config):
+    df = pd.DataFrame({'data': [20240101, 20240102, 20240101], 'ruota': [5, 5, 6],
+                       'n1': [1, 6, 11], 'n2': [2, 7, 12], 'n3': [3, 8, 13],
+                       'n4': [4, 9, 14], 'n5': [5, 10, 15]})
+    store = HistoryStore.from_dataframe(df, config.RUOTE)
+
+    with SharedHistory(store) as shared:
+        block, attached = shared.handle.attach()
+        assert list(attached) == list(store)
+        assert list(attached['MI']) == list(store['MI'])
+        assert np.array_equal(attached['NA'].dates, store['NA'].dates)
+        del attached
+        block.close()
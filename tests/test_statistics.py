@@ -0,0 +1,22 @@
+import numpy as np
+from models.statistics import statistics_from_counts
+
+def test_statistics_from_counts():
+    counts = np.zeros(91, dtype=np.int64)
+    counts[[5, 7, 9, 90]] = [3, 3, 1, 2]
+
+    stats = statistics_from_counts("MI", counts, total_draws=2, top=2)
+
+    assert stats.most_common == [(5, 3), (7, 3)]
+    assert stats.least_common == [(9, 1), (90, 2)]
+    assert stats.total_numbers == 9
+    assert stats.total_draws == 2
+
+def test_statistics_ties_list_lowest_number_first():
+    counts = np.zeros(91, dtype=np.int64)
+    counts[[40, 3, 77, 12]] = [2, 2, 1, 1]
+
+    stats = statistics_from_counts("MI", counts, total_draws=2, top=4)
+
+    assert stats.most_common == [(3, 2), (40, 2), (12, 1), (77, 1)]
+    assert stats.least_common == [(12, 1), (77, 1), (3, 2), (40, 2)]
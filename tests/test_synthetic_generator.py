@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+import pandas as pd
+from io import BytesIO
+from config import Config
+from data.data_loader import DataLoader
+from data.synthetic_generator import SyntheticExtractionGenerator
+from services.format_converter import FormatConverter
+
+@pytest.fixture
+def generator(config):
+    return SyntheticExtractionGenerator(config, seed=42, chunk_rows=500)
+
+def test_draw_numbers_are_valid():
+    rng = np.random.default_rng(0)
+    numbers = SyntheticExtractionGenerator.draw_numbers(rng, 10000)
+
+    assert numbers.shape == (10000, 5)
+    assert numbers.min() >= 1 and numbers.max() <= 90
+    ordered = np.sort(numbers, axis=1)
+    assert not (ordered[:, 1:] == ordered[:, :-1]).any()
+
+def test_draw_dates_cadence(generator):
+    dates = generator.draw_dates(2)
+    weekdays = pd.to_datetime(dates).dayofweek
+
+    assert set(weekdays) == {1, 3, 5}
+    assert 300 < len(dates) < 320
+
+def test_same_seed_same_output(config):
+    first, second = BytesIO(), BytesIO()
+    SyntheticExtractionGenerator(config, seed=7).write_csv(first, 1)
+    SyntheticExtractionGenerator(config, seed=7).write_csv(second, 1)
+
+    assert first.getvalue() == second.getvalue()
+
+def test_csv_is_readable_by_data_loader(generator, tmp_path):
+    config = Config()
+    config.CSV_FILE = str(tmp_path / "estrazioni.csv")
+    rows = generator.write_csv(config.CSV_FILE, 3)
+
+    loader = DataLoader(config)
+    df = loader.preprocess_data(loader.load_data())
+
+    assert len(df) == rows
+    assert set(df['ruota']) == set(config.RUOTE.values())
+    assert df['data'].iloc[0] == 19390107
+
+def test_historical_is_readable_by_converter(generator, tmp_path):
+    input_file = tmp_path / "storico.txt"
+    output_file = tmp_path / "convertito.csv"
+    rows = generator.write_historical(str(input_file), 1)
+
+    assert input_file.read_text().splitlines()[0].startswith("1939/01/07\tBA\t")
+
+    FormatConverter(Config()).convert_lotto_format(str(input_file), str(output_file))
+    df = pd.read_csv(output_file, delimiter=';')
+    assert len(df) == rows
+    assert 'RO' in set(df['ruota']) and 'RM' not in set(df['ruota'])
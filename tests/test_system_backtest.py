@@ -0,0 +1,42 @@
+from itertools import combinations
+import pytest
+import numpy as np
+from systems import SystemBacktester
+from utils.bitmask import numbers_to_packed
+
+@pytest.fixture
+def draws():
+    rng = np.random.default_rng(11)
+    return np.array([rng.choice(np.arange(1, 91), 5, replace=False) for _ in range(300)])
+
+def test_hits_matches_sets(draws):
+    system = [tuple(sorted(c)) for c in np.random.default_rng(5).integers(1, 91, (50, 3))]
+    system = [c for c in system if len(set(c)) == 3]
+
+    hits = SystemBacktester.hits(numbers_to_packed(np.array(system)), numbers_to_packed(draws))
+    expected = [[len(set(c) & set(d)) for d in draws.tolist()] for c in system]
+    assert hits.tolist() == expected
+
+def test_run_distribution(draws):
+    system = list(combinations(range(1, 9), 2))
+    expected = np.array([[len(set(c) & set(d)) for d in draws.tolist()] for c in system])
+
+    # Blocchi piccoli: il risultato non dipende dalla suddivisione
+    result = SystemBacktester(chunk_cells=700).run(iter(system), draws)
+
+    assert result.combinations == 28 and result.draws == 300
+    assert result.combination_size == 2
+    assert result.hit_counts == np.bincount(expected.ravel(), minlength=3).tolist()
+    assert result.best_per_draw == np.bincount(expected.max(axis=0), minlength=3).tolist()
+    assert result.winning_draws(1) == int((expected.max(axis=0) >= 1).sum())
+
+def test_exact_draw_scores_cinquina():
+    result = SystemBacktester().run([(1, 2, 3, 4, 5)], np.array([[5, 4, 3, 2, 1], [6, 7, 8, 9, 10]]))
+    assert result.hit_counts == [1, 0, 0, 0, 0, 1]
+    assert result.winning_draws(5) == 1
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        SystemBacktester().run([], np.array([[1, 2, 3, 4, 5]]))
+    with pytest.raises(ValueError):
+        SystemBacktester().run([(0, 1)], np.array([[1, 2, 3, 4, 5]]))
@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+from itertools import combinations
+from systems import IntegralSystem, ReducedSystem, SystemExporter
+from systems.system_export import HEADER, MASK_BYTES
+
+@pytest.fixture
+def exporter():
+    return SystemExporter(chunk_size=7)
+
+@pytest.fixture
+def numbers():
+    return [3, 17, 25, 40, 58, 61, 77, 90]
+
+@pytest.mark.parametrize("export_format", ['csv', 'numeri', 'maschera'])
+def test_roundtrip(exporter, numbers, tmp_path, export_format):
+    expected = list(combinations(numbers, 4))
+    path = tmp_path / f"sistema.{export_format}"
+
+    count = exporter.export(iter(expected), str(path), export_format)
+    result = exporter.read(str(path))
+
+    assert count == len(expected)
+    assert result.dtype == np.uint8
+    assert [tuple(row) for row in result.tolist()] == expected
+
+def test_csv_uses_configured_delimiter(numbers, tmp_path):
+    exporter = SystemExporter(csv_delimiter=',')
+    path = tmp_path / "sistema.csv"
+    exporter.export(combinations(numbers, 3), str(path), 'csv')
+
+    assert path.read_text().splitlines()[0] == "3,17,25"
+    assert exporter.read(str(path)).shape == (56, 3)
+
+@pytest.mark.parametrize("export_format,expected", [
+    ('csv', [[40, 3, 17]]), ('numeri', [[40, 3, 17]]), ('maschera', [[3, 17, 40]])])
+def test_read_keeps_written_order_except_masks(exporter, tmp_path, export_format, expected):
+    path = tmp_path / f"sistema.{export_format}"
+    exporter.export([(40, 3, 17)], str(path), export_format)
+
+    assert exporter.read(str(path)).tolist() == expected
+
+def test_binary_sizes(exporter, numbers, tmp_path):
+    expected = len(list(combinations(numbers, 4)))
+    numbers_file = tmp_path / "numeri.bin"
+    mask_file = tmp_path / "maschera.bin"
+
+    exporter.export(combinations(numbers, 4), str(numbers_file), 'numeri')
+    exporter.export(combinations(numbers, 4), str(mask_file), 'maschera')
+
+    assert numbers_file.stat().st_size == HEADER.size + expected * 4
+    assert mask_file.stat().st_size == HEADER.size + expected * MASK_BYTES
+
+def test_masks_roundtrip():
+    combos = np.array([[1, 2, 89, 90], [10, 20, 30, 40]], dtype=np.uint8)
+    masks = SystemExporter.numbers_to_masks(combos)
+
+    assert masks.shape == (2, MASK_BYTES)
+    assert np.array_equal(SystemExporter.masks_to_numbers(masks, 4), combos)
+
+def test_invalid_inputs(exporter, tmp_path):
+    with pytest.raises(ValueError):
+        exporter.export([(0, 91)], str(tmp_path / "x.bin"), 'numeri')
+    with pytest.raises(ValueError):
+        exporter.export([(1, 2)], str(tmp_path / "x.bin"), 'xml')
+
+    (tmp_path / "bad.bin").write_bytes(b"ORSY")
+    with pytest.raises(ValueError):
+        exporter.read(str(tmp_path / "bad.bin"))
+
+def test_lazy_generators_match_lists(numbers):
+    assert list(IntegralSystem().iter_combinations(numbers, 3)) == \
+        IntegralSystem().generate_combinations(numbers, 3)
+    assert list(ReducedSystem().iter_combinations(numbers, 3)) == \
+        ReducedSystem().generate_combinations(numbers, 3)
+    with pytest.raises(ValueError):
+        IntegralSystem().iter_combinations(numbers, 5)
@@ -0,0 +1,61 @@
+import random
+from itertools import combinations
+import numpy as np
+import pytest
+from systems import IntegralSystem, SystemFilters
+
+def random_filters(rng, base):
+    return SystemFilters(
+        sum_min=rng.choice([None, rng.randint(20, 200)]),
+        sum_max=rng.choice([None, rng.randint(50, 300)]),
+        even_min=rng.choice([None, 0, 1, 2]),
+        even_max=rng.choice([None, 1, 2, 3]),
+        max_per_decade=rng.choice([None, 1, 2]),
+        min_decades=rng.choice([None, 2, 3]),
+        excluded_pairs=frozenset(tuple(sorted(rng.sample(base, 2))) for _ in range(rng.randint(0, 5)))
+    )
+
+def test_enumerate_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(300):
+        base = rng.sample(range(1, 91), rng.randint(4, 13))
+        size = rng.randint(2, 4)
+        filters = random_filters(rng, base)
+        expected = [combo for combo in combinations(sorted(base), size) if filters.accepts(combo)]
+        assert list(filters.enumerate(base, size)) == expected
+
+def test_enumerate_prunes_large_base():
+    # 90 numeri, C(90, 4) = 2.555.190: la ricerca deve visitare solo i rami utili
+    filters = SystemFilters(sum_min=10, sum_max=14)
+    result = list(filters.enumerate(range(1, 91), 4))
+    assert result == [(1, 2, 3, 4), (1, 2, 3, 5), (1, 2, 3, 6), (1, 2, 3, 7), (1, 2, 3, 8),
+                      (1, 2, 4, 5), (1, 2, 4, 6), (1, 2, 4, 7), (1, 2, 5, 6), (1, 3, 4, 5),
+                      (1, 3, 4, 6), (2, 3, 4, 5)]
+
+def test_integral_system_with_filters():
+    system = IntegralSystem()
+    combos = system.generate_combinations([1, 2, 3, 4, 5], 2, filters=SystemFilters(even_min=1, even_max=1))
+    assert combos == [(1, 2), (1, 4), (2, 3), (2, 5), (3, 4), (4, 5)]
+    with pytest.raises(ValueError):
+        system.generate_combinations([1, 2], 3, filters=SystemFilters())
+
+def test_parse():
+    filters = SystemFilters.parse(["somma=100-150", "pari=2", "decina=1", "decine=3"])
+    assert filters == SystemFilters(sum_min=100, sum_max=150, even_min=2, even_max=2,
+                                    max_per_decade=1, min_decades=3)
+    assert SystemFilters.parse(["somma=100-"]).sum_max is None
+    assert SystemFilters.parse(["pari=-1"]) == SystemFilters(even_max=1)
+    assert filters.describe() == "somma 100-150, pari 2, al massimo 1 per decina, almeno 3 decine"
+
+@pytest.mark.parametrize("token", ["colore=rosso", "somma=150-100", "pari=x", "decina="])
+def test_parse_errors(token):
+    with pytest.raises(ValueError):
+        SystemFilters.parse([token])
+
+def test_with_drawn_pairs():
+    draws = np.array([[1, 2, 3, 40, 50], [5, 10, 60, 70, 80]], dtype=np.uint8)
+    filters = SystemFilters(sum_max=100).with_drawn_pairs([1, 2, 3, 5, 10, 11], draws)
+    assert filters.excluded_pairs == {(1, 2), (1, 3), (2, 3), (5, 10)}
+    assert filters.sum_max == 100
+    assert list(filters.enumerate([1, 2, 3, 5, 10, 11], 3)) == \
+        [(1, 5, 11), (1, 10, 11), (2, 5, 11), (2, 10, 11), (3, 5, 11), (3, 10, 11)]
@@ -0,0 +1,53 @@
+import math
+import numpy as np
+import pytest
+from systems import IntegralSystem, SystemSimulator
+from systems.system_simulator import PRIZES, payout_table, random_draws
+
+def test_random_draws_are_valid():
+    draws = random_draws(np.random.default_rng(0), 20000)
+    assert draws.shape == (20000, 5)
+    assert draws.min() >= 1 and draws.max() <= 90
+    assert (np.diff(np.sort(draws, axis=1), axis=1) > 0).all()
+    # Ogni numero esce circa 5/90 delle volte
+    frequencies = np.bincount(draws.ravel(), minlength=91)[1:] / len(draws)
+    assert np.abs(frequencies - 5 / 90).max() < 0.01
+
+def test_payout_table():
+    assert payout_table(2, 2, 1.0).tolist() == [0, 0, PRIZES[2], 0, 0, 0]
+    # Terzina sull'ambo: ogni ambo vale un terzo del premio, il terno ne contiene tre
+    table = payout_table(3, 2, 2.0)
+    assert table[2] == pytest.approx(PRIZES[2] * 2 / 3)
+    assert table[3] == pytest.approx(PRIZES[2] * 2)
+
+def test_single_ambo_matches_exact_probability():
+    result = SystemSimulator(400_000, workers=1, seed=7).run([(7, 30)])
+    exact = math.comb(88, 3) / math.comb(90, 5)
+
+    low, high = result.hit_interval(2)
+    assert low <= exact <= high
+    assert result.cost == 1.0
+    low, high = result.return_interval()
+    assert low <= PRIZES[2] * exact <= high
+
+def test_result_does_not_depend_on_processes():
+    combinations = list(IntegralSystem().iter_combinations([1, 5, 9, 12, 20], 3))
+    single = SystemSimulator(60_000, workers=1, seed=3, batch_draws=20_000).run(combinations)
+    parallel = SystemSimulator(60_000, workers=2, seed=3, batch_draws=20_000).run(combinations)
+
+    assert single == parallel
+    assert sum(single.best_counts) == 60_000
+    assert len(single.best_counts) == 4
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        SystemSimulator(0)
+    with pytest.raises(ValueError):
+        SystemSimulator(10, workers=0)
+    simulator = SystemSimulator(10, workers=1)
+    with pytest.raises(ValueError):
+        simulator.run([])
+    with pytest.raises(ValueError):
+        simulator.run([(1, 91)])
+    with pytest.raises(ValueError):
+        simulator.run([(1, 2)], sorte=3)
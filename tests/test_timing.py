@@ -0,0 +1,85 @@
+import json
+import pytest
+from utils.timing import TimingRegistry, registry, timed, timer
+
+@pytest.fixture
+def clean_registry():
+    registry.reset()
+    registry.enable()
+    yield registry
+    registry.disable()
+    registry.reset()
+
+def test_disabled_registry_records_nothing():
+    registry.reset()
+    registry.disable()
+
+    with timer("fase"):
+        pass
+
+    assert registry.summary() == {}
+
+def test_timer_and_decorator(clean_registry):
+    @timed("funzione")
+    def double(x):
+        return x * 2
+
+    assert double(2) == 4
+    assert double(3) == 6
+    with timer("blocco"):
+        pass
+
+    summary = clean_registry.summary()
+    assert summary["funzione"]["count"] == 2
+    assert summary["blocco"]["count"] == 1
+    assert set(summary["funzione"]) == {'count', 'total', 'mean', 'p50', 'p95', 'p99', 'max'}
+
+def test_decorator_records_on_exception(clean_registry):
+    @timed("errore")
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        fail()
+    assert clean_registry.summary()["errore"]["count"] == 1
+
+def test_percentiles():
+    local = TimingRegistry()
+    for value in range(1, 101):
+        local.record("fase", value / 1000)
+
+    stats = local.summary()["fase"]
+    assert stats['total'] == pytest.approx(5.05)
+    assert stats['p50'] == pytest.approx(0.0505)
+    assert stats['max'] == pytest.approx(0.1)
+
+def test_dump_json(tmp_path):
+    local = TimingRegistry()
+    local.record("fase", 0.5)
+    path = tmp_path / "timing.json"
+
+    local.dump_json(str(path))
+
+    assert json.loads(path.read_text())["fase"]["count"] == 1
+
+def test_install_exit_dump_registers_once(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr("utils.timing.atexit.register", registered.append)
+    local = TimingRegistry()
+    local.install_exit_dump(str(tmp_path / "primo.json"))
+    local.install_exit_dump(str(tmp_path / "timing.json"))
+    local.record("fase", 0.5)
+
+    assert local.enabled and len(registered) == 1
+    registered[0]()
+    assert json.loads((tmp_path / "timing.json").read_text())["fase"]["count"] == 1
+    assert not (tmp_path / "primo.json").exists()
+
+def test_service_phases_are_recorded(clean_registry, trained_service):
+    trained_service.train_model()
+    trained_service.predict("20240101", "MI")
+
+    summary = clean_registry.summary()
+    assert "DataLoader.preprocess_data" in summary
+    assert "Predictor.train" in summary
+    assert "Predictor.predict" in summary
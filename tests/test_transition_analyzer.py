@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+from services.transition_analyzer import TransitionAnalyzer
+
+@pytest.fixture
+def draws():
+    return np.array([
+        [1, 2, 3, 4, 5],
+        [6, 7, 8, 9, 10],
+        [1, 7, 20, 30, 40],
+        [6, 50, 60, 70, 80],
+    ], dtype=np.uint8)
+
+def test_compute_matches_loop(draws):
+    transitions, occurrences = TransitionAnalyzer.compute(draws)
+
+    expected = np.zeros((91, 91), dtype=np.int64)
+    for current, following in zip(draws[:-1], draws[1:]):
+        for i in current:
+            for j in following:
+                expected[i, j] += 1
+
+    assert np.array_equal(transitions, expected)
+    assert occurrences[1] == 2   # 1 esce due volte con un'estrazione successiva
+    assert occurrences[6] == 1   # l'ultima estrazione non ha successiva
+
+def test_followers(draws):
+    transitions, occurrences = TransitionAnalyzer.compute(draws)
+    followers = TransitionAnalyzer.followers(transitions, occurrences, 1, top=3)
+
+    assert followers[0] == (6, 2, 1.0)
+    assert len(followers) == 3
+    with pytest.raises(ValueError):
+        TransitionAnalyzer.followers(transitions, occurrences, 91)
+
+def test_short_history():
+    transitions, occurrences = TransitionAnalyzer.compute(np.array([[1, 2, 3, 4, 5]]))
+    assert transitions.sum() == 0 and occurrences.sum() == 0
+
+def test_cache_per_version(draws, monkeypatch):
+    analyzer = TransitionAnalyzer()
+    calls = []
+    original = TransitionAnalyzer.compute
+    monkeypatch.setattr(TransitionAnalyzer, 'compute',
+                        staticmethod(lambda numbers: calls.append(1) or original(numbers)))
+
+    analyzer.matrix(draws, 'MI', version=1)
+    analyzer.matrix(draws, 'MI', version=1)
+    assert len(calls) == 1
+
+    analyzer.matrix(draws, 'MI', version=2)
+    assert len(calls) == 2